@@ -0,0 +1,168 @@
+"""
+Admission control for the RealDiag API.
+
+Requests are grouped into route classes (cheap reads, symptom search, tree
+evaluation). Each class has a ConcurrencyLimiter per worker: up to `limit`
+requests run at once, up to `queue` more wait in FIFO order for at most
+REALDIAG_ADMISSION_QUEUE_TIMEOUT seconds, and anything beyond that is
+rejected immediately with 503 and ``Retry-After`` instead of piling up until
+gunicorn's timeout kills the worker.
+
+Health, metrics and operator endpoints bypass admission entirely so probes
+and scrapes keep answering while the worker is overloaded.
+
+Limits are set per class as ``concurrency,queue``, e.g.
+``REALDIAG_ADMISSION_SEARCH=4,16``; REALDIAG_ADMISSION=0 disables shedding.
+"""
+
+import asyncio
+import os
+from collections import deque
+from typing import Dict, Optional, Tuple
+from prometheus_client import Counter, Gauge
+
+ADMISSION_ENABLED = os.getenv("REALDIAG_ADMISSION", "1").lower() in ("1", "true", "yes")
+QUEUE_TIMEOUT = float(os.getenv("REALDIAG_ADMISSION_QUEUE_TIMEOUT", "10"))
+RETRY_AFTER = os.getenv("REALDIAG_ADMISSION_RETRY_AFTER", "1")
+
+# (concurrency, queue) per worker
+DEFAULT_LIMITS = {"read": (16, 64), "search": (4, 16), "evaluate": (8, 32), "stream": (32, 0)}
+
+# First matching prefix wins; unlisted paths are "read".
+EXEMPT_PREFIXES = ("/health", "/metrics", "/admin/", "/debug/")
+ROUTE_CLASSES = (
+    ("/search/by-symptoms", "search"),
+    ("/rules/search", "search"),
+    ("/diagnostic/evaluate/", "evaluate"),
+    # Streams hold their slot for the whole connection; keep them out of "read".
+    ("/diagnostics/stream", "stream"),
+)
+
+SHED_REQUESTS = Counter(
+    'realdiag_shed_requests_total', 'Requests rejected by admission control', ['route_class', 'reason'],
+)
+ADMISSION_QUEUE = Gauge(
+    'realdiag_admission_queue_depth', 'Requests waiting for an admission slot', ['route_class'],
+    multiprocess_mode='livesum',
+)
+
+
+class AdmissionRejected(Exception):
+    """Raised when a limiter sheds a request; `reason` is queue_full or queue_timeout."""
+
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class ConcurrencyLimiter:
+    """Per-worker concurrency limit with a bounded FIFO wait queue."""
+
+    def __init__(self, name: str, limit: int, queue: int, queue_timeout: float = QUEUE_TIMEOUT):
+        self.name = name
+        self.limit = limit
+        self.queue = queue
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self._waiters: deque = deque()
+        self._queue_gauge = ADMISSION_QUEUE.labels(name)
+
+    async def acquire(self) -> None:
+        # release() hands slots directly to waiters, so a free slot implies
+        # nobody is queued and the fast path cannot jump the queue.
+        if self.active < self.limit:
+            self.active += 1
+            return
+        if len(self._waiters) >= self.queue:
+            raise AdmissionRejected("queue_full")
+
+        fut = asyncio.get_running_loop().create_future()
+        self._waiters.append(fut)
+        self._queue_gauge.inc()
+        try:
+            await asyncio.wait_for(fut, self.queue_timeout)
+        except asyncio.TimeoutError:
+            raise AdmissionRejected("queue_timeout") from None
+        except BaseException:
+            # Cancelled (client went away) after a slot was already handed over.
+            if fut.done() and not fut.cancelled():
+                self.release()
+            raise
+        finally:
+            self._queue_gauge.dec()
+            try:
+                self._waiters.remove(fut)
+            except ValueError:
+                pass
+
+    def release(self) -> None:
+        while self._waiters:
+            fut = self._waiters.popleft()
+            if not fut.done():
+                fut.set_result(None)  # slot passes to the waiter; active is unchanged
+                return
+        self.active -= 1
+
+
+def _parse_limits(name: str, default: Tuple[int, int]) -> Tuple[int, int]:
+    raw = os.getenv(f"REALDIAG_ADMISSION_{name.upper()}")
+    if not raw:
+        return default
+    limit, _, queue = raw.partition(",")
+    return int(limit), int(queue or 0)
+
+
+def build_limiters() -> Dict[str, ConcurrencyLimiter]:
+    """One limiter per route class, sized from the environment."""
+    return {name: ConcurrencyLimiter(name, *_parse_limits(name, default))
+            for name, default in DEFAULT_LIMITS.items()}
+
+
+def route_class(path: str) -> Optional[str]:
+    """Route class for a request path, or None if it bypasses admission."""
+    if path.startswith(EXEMPT_PREFIXES):
+        return None
+    for prefix, name in ROUTE_CLASSES:
+        if path.startswith(prefix):
+            return name
+    return "read"
+
+
+async def _reject(send, reason: str) -> None:
+    body = b'{"detail":"Server is overloaded, retry later","reason":"' + reason.encode() + b'"}'
+    await send({
+        "type": "http.response.start",
+        "status": 503,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", RETRY_AFTER.encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+class AdmissionMiddleware:
+    """ASGI middleware enforcing per-route-class concurrency limits."""
+
+    def __init__(self, app, limiters: Optional[Dict[str, ConcurrencyLimiter]] = None):
+        self.app = app
+        self.limiters = limiters if limiters is not None else build_limiters()
+
+    async def __call__(self, scope, receive, send):
+        name = route_class(scope["path"]) if scope["type"] == "http" else None
+        limiter = self.limiters.get(name) if name else None
+        if limiter is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            await limiter.acquire()
+        except AdmissionRejected as exc:
+            SHED_REQUESTS.labels(name, exc.reason).inc()
+            await _reject(send, exc.reason)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release()
@@ -0,0 +1,76 @@
+"""
+Gunicorn configuration for the RealDiag API.
+
+Usage: gunicorn -c backend/gunicorn_conf.py backend.main:app
+
+With REALDIAG_PRELOAD=1 (the default) the app and its knowledge base are
+built once in the master process and frozen out of the garbage collector
+before workers fork, so the rules and decision trees stay in copy-on-write
+shared pages instead of being duplicated per worker. Set REALDIAG_PRELOAD=0
+to fall back to per-worker imports (e.g. while iterating on code with
+--reload).
+
+Prometheus metrics are collected in multiprocess mode: each worker writes
+its samples to PROMETHEUS_MULTIPROC_DIR and /metrics aggregates them, so a
+scrape reflects every worker rather than whichever one answered.
+"""
+
+import gc
+import glob
+import os
+import tempfile
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+worker_class = "uvicorn.workers.UvicornWorker"
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+accesslog = "-"
+errorlog = "-"
+
+# Must be set before prometheus_client is imported (i.e. before the app loads).
+# Start from an empty directory so samples from a previous run are not summed in.
+_metrics_dir = os.environ.setdefault(
+    "PROMETHEUS_MULTIPROC_DIR", os.path.join(tempfile.gettempdir(), "realdiag-prometheus"))
+os.makedirs(_metrics_dir, exist_ok=True)
+for _stale in glob.glob(os.path.join(_metrics_dir, "*.db")):
+    os.remove(_stale)
+
+# Each worker publishes its readiness phase here; /health/ready is 200 only
+# once all `workers` are ready, whichever worker answers the probe.
+_ready_dir = os.environ.setdefault(
+    "REALDIAG_READY_DIR", os.path.join(tempfile.gettempdir(), "realdiag-ready"))
+os.environ["REALDIAG_WORKERS"] = str(workers)
+os.makedirs(_ready_dir, exist_ok=True)
+for _stale in glob.glob(os.path.join(_ready_dir, "*")):
+    os.remove(_stale)
+
+preload_app = os.getenv("REALDIAG_PRELOAD", "1").lower() in ("1", "true", "yes")
+
+if preload_app:
+    # Keep the collector off while the master imports and builds the
+    # knowledge base so freed objects don't leave holes in shared pages.
+    gc.disable()
+
+
+def when_ready(server):
+    # Runs once in the master after the preloaded app is imported, before the
+    # first fork (respawned workers fork from the same, already frozen heap).
+    if preload_app:
+        from backend.readiness import WARMUP_ENABLED, warm_before_fork
+        from backend.services.knowledge_base import freeze_for_fork
+        if WARMUP_ENABLED:
+            warm_before_fork()
+        freeze_for_fork()
+        # The preloaded objects are in the permanent generation now; let the
+        # long-running master collect whatever it allocates from here on.
+        gc.enable()
+
+
+def child_exit(server, worker):
+    # Drop the exited worker's live gauges (in-flight requests) from the aggregate.
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
+    try:
+        os.remove(os.path.join(_ready_dir, str(worker.pid)))
+    except OSError:
+        pass
@@ -0,0 +1,89 @@
+"""
+Host network metrics for the RealDiag API's /metrics.
+
+HostNetworkCollector is a custom Prometheus collector for the API host's
+network interfaces: raw byte, packet, error and drop counters for rate() in
+PromQL, plus link speed and the utilization computed over sliding windows,
+so saturation can be alerted on directly. It owns a NIC-only
+NicRateCollector sampled on its own timer every
+REALDIAG_HOST_SAMPLE_INTERVAL seconds (one net_io_counters() call), so a
+scrape never calls psutil and the windows follow that fixed cadence rather
+than whichever scrapes the load balancer routed to this worker. It never
+starts process or disk sampling.
+
+psutil and the diagnostics package are imported on the first scrape, not at
+startup. When they are missing the collector exports nothing. Set
+REALDIAG_HOST_METRICS=0 to turn it off.
+"""
+
+import os
+import threading
+from typing import Optional
+from prometheus_client.registry import REGISTRY
+from config import Config
+
+HOST_METRICS_ENABLED = os.getenv("REALDIAG_HOST_METRICS", "1").lower() in ("1", "true", "yes")
+HOST_NETWORK_INTERVAL = float(os.getenv("REALDIAG_HOST_SAMPLE_INTERVAL") or Config.HOST_SAMPLE_INTERVAL)
+
+
+class HostNetworkCollector:
+    """Per-interface counters, link speed and windowed utilization of this host."""
+
+    def __init__(self, interval: float = HOST_NETWORK_INTERVAL):
+        self.interval = interval
+        self._nic = None
+        self._unavailable = False
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def describe(self):
+        # Nothing to pre-register; avoids sampling when the collector is registered.
+        return []
+
+    def _collector(self):
+        with self._lock:
+            if self._nic is None and not self._unavailable:
+                try:
+                    from diagnostics.nic_rates import NicRateCollector
+                except ImportError:
+                    self._unavailable = True
+                    return None
+                nic = NicRateCollector()
+                nic.sample()
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, args=(nic,), name="host-network", daemon=True)
+                self._thread.start()
+                self._nic = nic
+            return self._nic
+
+    def _run(self, nic):
+        while not self._stop.wait(self.interval):
+            nic.sample()
+
+    def stop(self) -> None:
+        """Stop the sampling thread (called on shutdown); the next scrape restarts it."""
+        with self._lock:
+            self._stop.set()
+            if self._thread is not None:
+                self._thread.join()
+            self._thread = None
+            self._nic = None
+
+    def collect(self):
+        nic = self._collector()
+        if nic is None:
+            return
+        counters, link_stats = nic.latest()
+        rates = nic.rates()
+
+        # Same families as the standalone exporter (main.py --serve-metrics)
+        from diagnostics.exporter import network_families
+
+        yield from network_families(counters, {name: stats.speed for name, stats in link_stats.items()}, rates)
+
+
+HOST_COLLECTOR: Optional[HostNetworkCollector] = None
+if HOST_METRICS_ENABLED:
+    HOST_COLLECTOR = HostNetworkCollector()
+    REGISTRY.register(HOST_COLLECTOR)
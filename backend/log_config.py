@@ -0,0 +1,206 @@
+"""
+Non-blocking logging for the RealDiag API.
+
+configure_logging() replaces the root handlers with a QueueHandler: the
+request thread only resolves the message and enqueues the record, while a
+QueueListener thread does the JSON formatting and the stream write. The
+queue is bounded; when it is full records are dropped (and counted) rather
+than stalling requests behind a slow log sink.
+
+AccessLogMiddleware writes one structured record per request on the
+``realdiag.access`` logger. High-frequency routes such as /health are
+sampled (1 in N, configured by REALDIAG_ACCESS_LOG_SAMPLE) before a record
+is even created; 5xx responses are always logged.
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import sys
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+from prometheus_client import Counter
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("REALDIAG_LOG_FORMAT", "json").lower()
+LOG_QUEUE_SIZE = int(os.getenv("REALDIAG_LOG_QUEUE_SIZE", "10000"))
+ACCESS_LOG_ENABLED = os.getenv("REALDIAG_ACCESS_LOG", "1").lower() in ("1", "true", "yes")
+TEXT_FORMAT = '%(asctime)s %(levelname)s %(message)s'
+
+LOG_RECORDS = Counter('realdiag_log_records_total', 'Log records enqueued', ['level'])
+LOG_DROPPED = Counter('realdiag_log_records_dropped_total', 'Log records dropped because the log queue was full')
+ACCESS_LOG_SAMPLED_OUT = Counter(
+    'realdiag_access_log_sampled_out_total', 'Access log records skipped by sampling', ['route'],
+)
+
+# Attributes every LogRecord has; anything else was passed via extra=.
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+_handler: Optional["NonBlockingQueueHandler"] = None
+_listener: Optional[QueueListener] = None
+
+
+def _parse_sampling(raw: str) -> Dict[str, int]:
+    rates = {}
+    for item in filter(None, (part.strip() for part in raw.split(","))):
+        path, _, every = item.partition("=")
+        rates[path] = max(1, int(every or 1))
+    return rates
+
+
+ACCESS_LOG_SAMPLE = _parse_sampling(os.getenv(
+    "REALDIAG_ACCESS_LOG_SAMPLE", "/health=100,/health/live=100,/health/ready=100,/metrics=10"))
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, msg plus any extra fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        if orjson is not None:
+            return orjson.dumps(entry, default=str).decode()
+        return json.dumps(entry, default=str)
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """QueueHandler that defers formatting to the listener and never blocks."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Only what must happen on the calling thread: freeze the message
+        # (args may be mutated later) and render any traceback while the
+        # frames still exist. Formatting is left to the listener's handler.
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            LOG_DROPPED.inc()
+            return
+        LOG_RECORDS.labels(record.levelname).inc()
+
+
+def _output_handler(stream=None) -> logging.Handler:
+    handler = logging.StreamHandler(stream or sys.stderr)
+    handler.setFormatter(JSONFormatter() if LOG_FORMAT == "json" else logging.Formatter(TEXT_FORMAT))
+    return handler
+
+
+def _start_listener(handlers) -> None:
+    global _listener
+    log_queue = queue.Queue(LOG_QUEUE_SIZE)
+    _handler.queue = log_queue
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+
+def _restart_after_fork() -> None:
+    # The listener thread does not survive fork() and the inherited queue's
+    # lock may have been held by it, so each worker gets a fresh pair.
+    if _listener is not None:
+        _start_listener(_listener.handlers)
+
+
+def configure_logging(level: str = LOG_LEVEL, stream=None) -> None:
+    """Route all logging through a bounded queue drained by a background thread."""
+    global _handler
+    if _handler is not None:
+        return
+    _handler = NonBlockingQueueHandler(queue.Queue(LOG_QUEUE_SIZE))
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(_handler)
+    root.setLevel(level)
+    _start_listener([_output_handler(stream)])
+    os.register_at_fork(after_in_child=_restart_after_fork)
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+access_logger = logging.getLogger("realdiag.access")
+
+
+class AccessLogMiddleware:
+    """ASGI middleware emitting one structured access-log record per request."""
+
+    def __init__(self, app, sample: Optional[Dict[str, int]] = None):
+        self.app = app
+        self.sample = ACCESS_LOG_SAMPLE if sample is None else sample
+        self._seen: Dict[str, int] = {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        size = 0
+
+        async def send_wrapper(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self._log(scope, status, size, time.perf_counter() - start)
+
+    def _log(self, scope, status, size, duration):
+        path = scope["path"]
+        every = self.sample.get(path)
+        if every and status < 500:
+            seen = self._seen.get(path, 0)
+            self._seen[path] = seen + 1
+            if seen % every:
+                ACCESS_LOG_SAMPLED_OUT.labels(path).inc()
+                return
+        if not access_logger.isEnabledFor(logging.INFO):
+            return
+        access_logger.info("%s %s %d", scope["method"], path, status, extra={
+            "method": scope["method"],
+            "path": path,
+            "route": getattr(scope.get("route"), "path", None),
+            "status": status,
+            "duration_ms": round(duration * 1000, 3),
+            "bytes": size,
+            "sample_rate": every or 1,
+        })
@@ -1,40 +1,84 @@
 
+import asyncio
 import os
 import re
+from contextlib import asynccontextmanager
+from functools import lru_cache
 from fastapi import FastAPI, Request
-from prometheus_client import generate_latest, CONTENT_TYPE_LATEST, Counter
 import logging
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import RedirectResponse
+from fastapi.responses import RedirectResponse, Response
 from fastapi.staticfiles import StaticFiles
-from fastapi.templating import Jinja2Templates
 from backend.services.diagnostic_router import router as diagnostic_router
 from backend.services.rules_router import router as rules_router
 from backend.services.reference_router import router as reference_router
 from backend.services.symptom_search import router as symptom_search_router
+from backend.services.admin_router import router as admin_router
+from backend.services.debug_router import router as debug_router
+from backend.services.host_router import router as host_router, stop_sampler
+from backend.services.host_stream import router as host_stream_router
+from backend.services.knowledge_base import KnowledgeBaseWatcher, get_knowledge_base
+from backend.admission import ADMISSION_ENABLED, AdmissionMiddleware
+from backend.host_metrics import HOST_COLLECTOR
+from backend.log_config import ACCESS_LOG_ENABLED, AccessLogMiddleware, configure_logging
+from backend.metrics import MetricsMiddleware, metrics_payload
+from backend.readiness import READINESS, prepare
+from backend.runtime_metrics import LOOP_MONITOR_INTERVAL, install_gc_metrics, monitor_event_loop
+from backend.timing import STAGE_TIMING_ENABLED, ServerTimingMiddleware, TimedJSONResponse
 from config import Config
 
-app = FastAPI(title="RealDiag API")
 
-# Basic structured logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
-logger = logging.getLogger("realdiag")
-
-# Prometheus metrics
-REQUEST_COUNTER = Counter('realdiag_requests_total', 'Total HTTP requests', ['path', 'method', 'status'])
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Runs in each worker after fork: follow knowledge-base reloads published
+    # by sibling workers (and rule file edits when REALDIAG_KB_WATCH=1).
+    watcher = KnowledgeBaseWatcher()
+    watcher.start()
+    install_gc_metrics()
+    loop_monitor = None
+    if LOOP_MONITOR_INTERVAL > 0:
+        loop_monitor = asyncio.create_task(monitor_event_loop(LOOP_MONITOR_INTERVAL))
+    # /health/ready turns 200 once this finishes (REALDIAG_WARMUP=1 adds cache warm-up).
+    warmup = asyncio.create_task(prepare())
+    try:
+        yield
+    finally:
+        READINESS.phase = "stopping"
+        warmup.cancel()
+        if loop_monitor is not None:
+            loop_monitor.cancel()
+        watcher.stop()
+        stop_sampler()
+        if HOST_COLLECTOR is not None:
+            HOST_COLLECTOR.stop()
+
+
+app = FastAPI(title="RealDiag API", lifespan=lifespan, default_response_class=TimedJSONResponse)
+
+# Structured logging through a background queue (LOG_LEVEL, REALDIAG_LOG_FORMAT)
+configure_logging()
 
 # Include routers
 app.include_router(diagnostic_router)
 app.include_router(rules_router)
 app.include_router(reference_router)
 app.include_router(symptom_search_router)
+app.include_router(admin_router)
+app.include_router(host_router)
+app.include_router(host_stream_router)
+app.include_router(debug_router)
 
 
 # Serve static files (assets)
 app.mount("/static", StaticFiles(directory="backend/static"), name="static")
 
-# Jinja2 templates directory
-templates = Jinja2Templates(directory="backend/templates")
+
+@lru_cache(maxsize=None)
+def get_templates():
+    """Jinja2 templates, loaded on the first HTML request rather than at import."""
+    from fastapi.templating import Jinja2Templates
+    return Jinja2Templates(directory="backend/templates")
+
 
 # Compute a safe preview origin regex. If PREVIEW_ORIGIN_REGEX is set in the
 # environment (for example, by Render), include its pattern but also ensure the
@@ -51,6 +95,11 @@ else:
     PREVIEW_ORIGIN_REGEX_COMBINED = r"^https?://(?:localhost(?::\d+)?|.+-3000\.app\.github\.dev|(?:%s))$" % _netlify_part
 
 
+# Per-route-class concurrency limits; overload is shed with 503 + Retry-After.
+# Added first (innermost) so CORS headers and request metrics cover shed responses.
+if ADMISSION_ENABLED:
+    app.add_middleware(AdmissionMiddleware)
+
 # Allow CORS from local frontend during development
 app.add_middleware(
     CORSMiddleware,
@@ -74,11 +123,27 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-stage timings (Server-Timing header) only when REALDIAG_STAGE_TIMING=1;
+# without the middleware stage() is a no-op.
+if STAGE_TIMING_ENABLED:
+    app.add_middleware(ServerTimingMiddleware)
+
+# One structured access-log record per request, sampled for /health and /metrics.
+if ACCESS_LOG_ENABLED:
+    app.add_middleware(AccessLogMiddleware)
+    # Replaces uvicorn's own synchronous, unstructured access log.
+    logging.getLogger("uvicorn.access").disabled = True
+
+# Per-route latency / in-flight / response-size metrics for every request.
+# Added last so it is the outermost middleware and times the whole stack.
+app.add_middleware(MetricsMiddleware)
+
 
 @app.get('/metrics')
 def metrics():
-    """Expose Prometheus metrics."""
-    return generate_latest()
+    """Expose Prometheus metrics (aggregated across workers in multiprocess mode)."""
+    body, content_type = metrics_payload()
+    return Response(body, media_type=content_type)
 
 
 @app.get("/")
@@ -92,18 +157,33 @@ def root(request: Request):
     if "text/html" in accept or "*/*" in accept:
         # Render template with app/version context using the new TemplateResponse signature
         # (request, name, context) to avoid the deprecation warning.
-        return templates.TemplateResponse(request, "index.html", {"request": request, "app": Config.APP_NAME, "version": Config.APP_VERSION})
+        return get_templates().TemplateResponse(request, "index.html", {"request": request, "app": Config.APP_NAME, "version": Config.APP_VERSION})
     # Non-browser clients: redirect to docs
     return RedirectResponse(url="/docs", status_code=301)
 
 
 @app.get("/health")
-def health():
-    REQUEST_COUNTER.labels(path='/health', method='GET', status='200').inc()
-    logger.info('health check')
+async def health():
+    # async so probes are served on the event loop even when the sync-handler
+    # thread pool is saturated.
+    return {"ok": True}
+
+
+@app.get("/health/live")
+async def health_live():
+    """Liveness: the worker's event loop is serving requests."""
     return {"ok": True}
 
 
+@app.get("/health/ready")
+async def health_ready():
+    """Readiness: 200 once every worker has loaded the knowledge base and finished warm-up, else 503."""
+    state = READINESS.to_dict()
+    if not state["ready"]:
+        return TimedJSONResponse(state, status_code=503)
+    return state
+
+
 @app.get("/version")
 def version():
     """Return application name and version."""
@@ -112,6 +192,6 @@ def version():
 
 @app.get("/health/version")
 def health_version():
-    """Return health status plus version metadata."""
-    return {"ok": True, "app": Config.APP_NAME, "version": Config.APP_VERSION}
+    """Return health status plus version metadata, including the active knowledge-base version."""
+    return {"ok": True, "app": Config.APP_NAME, "version": Config.APP_VERSION, "kb_version": get_knowledge_base().version}
 
@@ -0,0 +1,116 @@
+"""
+Prometheus metrics for the RealDiag API.
+
+MetricsMiddleware records every HTTP request. Routes are labelled by their
+template (``/diagnostic/evaluate/{tree_id}``), never by the raw path, so label
+cardinality is bounded by the number of routes.
+
+Under gunicorn every worker has its own registry, so when
+PROMETHEUS_MULTIPROC_DIR is set (see backend/gunicorn_conf.py) metrics are
+written to per-process files in that directory and metrics_payload()
+aggregates all of them on every scrape, whichever worker answers.
+"""
+
+import os
+import time
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess,
+)
+from starlette.routing import Match
+from backend.host_metrics import HOST_COLLECTOR
+
+UNMATCHED_ROUTE = "<unmatched>"
+# Any other method a client sends is counted as "other", keeping label cardinality bounded.
+KNOWN_METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"})
+OTHER_METHOD = "other"
+
+REQUEST_COUNTER = Counter('realdiag_requests_total', 'Total HTTP requests', ['path', 'method', 'status'])
+REQUEST_LATENCY = Histogram(
+    'realdiag_request_duration_seconds', 'HTTP request latency by route template',
+    ['route', 'method'],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    'realdiag_requests_in_progress', 'HTTP requests currently being served', ['route', 'method'],
+    multiprocess_mode='livesum',
+)
+RESPONSE_SIZE = Histogram(
+    'realdiag_response_size_bytes', 'HTTP response body size by route template',
+    ['route', 'method'],
+    buckets=(100, 500, 1_000, 5_000, 10_000, 50_000, 100_000, 500_000, 1_000_000, 5_000_000),
+)
+
+
+def metrics_payload():
+    """Return (body, content type) for a /metrics scrape."""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        if HOST_COLLECTOR is not None:
+            # Host-wide readings, taken by whichever worker answers the scrape.
+            registry.register(HOST_COLLECTOR)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def _flat_routes(routes):
+    for route in routes:
+        if hasattr(route, "effective_route_contexts"):
+            # Newer FastAPI keeps include_router() routers as lazy wrappers.
+            yield from route.effective_route_contexts()
+        else:
+            yield route
+
+
+def route_template(scope) -> str:
+    """Resolve the route template for a request before routing runs."""
+    router = getattr(scope.get("app"), "router", None)
+    if router is None:
+        return UNMATCHED_ROUTE
+    partial = None
+    for route in _flat_routes(router.routes):
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+        if match == Match.PARTIAL and partial is None:
+            partial = route.path  # path matched, method did not (405)
+    return partial or UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency, in-flight and response-size metrics."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        route = route_template(scope)
+        method = scope["method"] if scope["method"] in KNOWN_METHODS else OTHER_METHOD
+        status = 500
+        size = 0
+
+        async def send_wrapper(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        in_progress = REQUESTS_IN_PROGRESS.labels(route, method)
+        in_progress.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            in_progress.dec()
+            # The router records the route it dispatched to; prefer it when present.
+            route = getattr(scope.get("route"), "path", route)
+            REQUEST_LATENCY.labels(route, method).observe(time.perf_counter() - start)
+            RESPONSE_SIZE.labels(route, method).observe(size)
+            REQUEST_COUNTER.labels(path=route, method=method, status=str(status)).inc()
@@ -0,0 +1,103 @@
+"""
+On-demand profiling helpers for the running API.
+
+StackSampler is a statistical profiler: a timer thread snapshots every other
+thread's Python stack with sys._current_frames() at a fixed interval and
+counts identical stacks. The output is the "collapsed stacks" text format
+(``root;caller;callee count``) understood by flamegraph.pl, speedscope and
+similar tools. Nothing is hooked into the interpreter, so the overhead is
+limited to the sampling thread itself and stops when the window ends.
+
+heap_diff() compares two tracemalloc snapshots taken a few seconds apart and
+reports the source lines whose allocations grew the most.
+"""
+
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import Any, Dict, Iterable, List
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name}@{os.path.basename(code.co_filename)}:{code.co_firstlineno}"
+
+
+class StackSampler(threading.Thread):
+    """Sample the stacks of all other threads for a fixed window."""
+
+    def __init__(self, seconds: float, interval: float = 0.005, ignore_threads: Iterable[int] = ()):
+        super().__init__(name="stack-sampler", daemon=True)
+        self.seconds = seconds
+        self.interval = interval
+        self.ignore_threads = set(ignore_threads)
+        self.stacks: Counter = Counter()
+        self.samples = 0
+
+    def run(self) -> None:
+        ignore = self.ignore_threads | {threading.get_ident()}
+        names = {}
+        deadline = time.monotonic() + self.seconds
+        while time.monotonic() < deadline:
+            if len(names) != threading.active_count():
+                names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident in ignore:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                stack.append(names.get(ident, f"thread-{ident}").replace(" ", "_"))
+                self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+            time.sleep(self.interval)
+
+    def collapsed(self) -> str:
+        """Collapsed-stack text, most frequent stacks first."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+def profile(seconds: float, interval: float = 0.005) -> StackSampler:
+    """Run a sampler for `seconds`, ignoring the calling thread, and return it."""
+    sampler = StackSampler(seconds, interval, ignore_threads=[threading.get_ident()])
+    sampler.start()
+    sampler.join()
+    return sampler
+
+
+def heap_diff(seconds: float, top: int = 25, frames: int = 1) -> Dict[str, Any]:
+    """Top allocation growth (by source line) over a `seconds` window."""
+    started_here = not tracemalloc.is_tracing()
+    if started_here:
+        tracemalloc.start(frames)
+    try:
+        ignore = [tracemalloc.Filter(False, tracemalloc.__file__)]
+        before = tracemalloc.take_snapshot().filter_traces(ignore)
+        time.sleep(seconds)
+        after = tracemalloc.take_snapshot().filter_traces(ignore)
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        if started_here:
+            tracemalloc.stop()
+
+    stats: List[Dict[str, Any]] = []
+    for stat in after.compare_to(before, "traceback" if frames > 1 else "lineno")[:top]:
+        stats.append({
+            "traceback": [f"{f.filename}:{f.lineno}" for f in stat.traceback],
+            "size_diff": stat.size_diff,
+            "count_diff": stat.count_diff,
+            "size": stat.size,
+            "count": stat.count,
+        })
+    return {
+        "seconds": seconds,
+        "traced_current": current,
+        "traced_peak": peak,
+        # Allocations made before tracing started are invisible to the diff.
+        "tracing_started_for_request": started_here,
+        "top": stats,
+    }
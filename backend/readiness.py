@@ -0,0 +1,163 @@
+"""
+Readiness state and warm-up for the RealDiag API.
+
+Each worker starts "starting" and only reports ready on /health/ready once
+its knowledge base is built and, when REALDIAG_WARMUP=1, a warm-up pass has
+run a few representative symptom searches, rule searches and tree
+evaluations and filled the reference-payload cache. Until then the
+orchestrator keeps traffic away, so the first real requests after a rollout
+do not pay for cold caches. /health/live only says the process is serving.
+
+A probe reaches whichever worker accepts the connection, so under gunicorn
+(backend/gunicorn_conf.py sets REALDIAG_READY_DIR and REALDIAG_WORKERS) each
+worker publishes its phase to a file there and /health/ready answers 200 only
+once every live worker is ready. With preload, the warm-up runs once in the
+master before fork (warm_before_fork) and the workers inherit warm caches.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from anyio import to_thread
+from backend.services.knowledge_base import KnowledgeBase, get_knowledge_base
+
+logger = logging.getLogger("realdiag.readiness")
+
+WARMUP_ENABLED = os.getenv("REALDIAG_WARMUP", "0").lower() in ("1", "true", "yes")
+READY_DIR = os.getenv("REALDIAG_READY_DIR")
+EXPECTED_WORKERS = int(os.getenv("REALDIAG_WORKERS", "1"))
+
+# Set in the gunicorn master by warm_before_fork(); forked workers inherit it
+_warmed_before_fork = False
+
+WARMUP_SYMPTOMS: List[List[str]] = [
+    ["chest pain"],
+    ["headache", "fever"],
+    ["shortness of breath", "cough"],
+    ["abdominal pain", "vomiting"],
+    ["weakness", "confusion"],
+    ["rash", "joint pain"],
+]
+WARMUP_RULE_QUERIES = ["pain", "fever", "I10"]
+WARMUP_PATIENTS: List[Dict[str, Any]] = [
+    {},
+    {"age": 65, "symptoms": ["chest pain", "shortness of breath"], "onset_hours": 2},
+    {"age": 30, "symptoms": ["headache", "fever"], "exam": ["neck stiffness"], "red_flags": ["worst headache"]},
+]
+
+
+class Readiness:
+    """Per-worker startup phase: starting -> warming -> ready (or failed) -> stopping.
+
+    With a `state_dir`, every phase change is also written to
+    ``<state_dir>/<pid>`` so any worker can tell whether its siblings are ready.
+    """
+
+    def __init__(self, state_dir: Optional[str] = None, expected_workers: int = 1):
+        self.state_dir = Path(state_dir) if state_dir else None
+        self.expected_workers = expected_workers
+        self.warmup_seconds: Optional[float] = None
+        self.error: Optional[str] = None
+        # Not published: a worker with no file yet counts as not ready anyway
+        self._phase = "starting"
+
+    @property
+    def phase(self) -> str:
+        return self._phase
+
+    @phase.setter
+    def phase(self, phase: str) -> None:
+        self._phase = phase
+        if self.state_dir is not None:
+            try:
+                self.state_dir.mkdir(parents=True, exist_ok=True)
+                tmp = self.state_dir / f".{os.getpid()}"
+                tmp.write_text(phase)
+                os.replace(tmp, self.state_dir / str(os.getpid()))
+            except OSError:
+                logger.exception("could not publish readiness phase")
+
+    @property
+    def ready(self) -> bool:
+        return self.phase == "ready"
+
+    def workers_ready(self) -> int:
+        """Live workers on this host that have published "ready"."""
+        if self.state_dir is None:
+            return int(self.ready)
+        count = 0
+        for path in self.state_dir.glob("[0-9]*"):
+            try:
+                os.kill(int(path.name), 0)  # skip workers that died without cleaning up
+                count += path.read_text() == "ready"
+            except (OSError, ValueError):
+                continue
+        return count
+
+    def host_ready(self) -> bool:
+        """This worker and every sibling the master runs are ready."""
+        return self.ready and self.workers_ready() >= self.expected_workers
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"ready": self.host_ready(), "phase": self.phase,
+                "workers_ready": self.workers_ready(), "workers": self.expected_workers,
+                "warmup_seconds": self.warmup_seconds, "error": self.error}
+
+
+READINESS = Readiness(READY_DIR, EXPECTED_WORKERS)
+
+
+def _warm_sync(kb: KnowledgeBase) -> None:
+    from backend.services.reference_router import warm_fragments
+
+    warm_fragments(kb)
+    for query in WARMUP_RULE_QUERIES:
+        kb.rules.search(query)
+    for tree_id in kb.trees.trees:
+        for patient in WARMUP_PATIENTS:
+            kb.trees.evaluate(tree_id, patient)
+
+
+async def _warm_searches() -> None:
+    from backend.services.symptom_search import SymptomSearchRequest, search_by_symptoms
+
+    for symptoms in WARMUP_SYMPTOMS:
+        await search_by_symptoms(SymptomSearchRequest(symptoms=symptoms))
+
+
+def warm_before_fork() -> None:
+    """Run the warm-up once in the gunicorn master so forked workers start warm."""
+    global _warmed_before_fork
+    start = time.perf_counter()
+    kb = get_knowledge_base()
+    _warm_sync(kb)
+    asyncio.run(_warm_searches())
+    _warmed_before_fork = True
+    logger.info("warm-up before fork took %.3fs", time.perf_counter() - start)
+
+
+async def prepare(state: Readiness = READINESS, warmup: bool = WARMUP_ENABLED) -> None:
+    """Build the knowledge base (and optionally warm caches), then mark the worker ready."""
+    start = time.perf_counter()
+    state.phase = "warming"
+    try:
+        # Off the event loop so /health/live keeps answering meanwhile.
+        kb = await to_thread.run_sync(get_knowledge_base)
+    except Exception as exc:
+        logger.exception("knowledge base failed to load; worker stays unready")
+        state.phase, state.error = "failed", str(exc)
+        return
+    if warmup and not _warmed_before_fork:
+        try:
+            await to_thread.run_sync(_warm_sync, kb)
+            await _warm_searches()
+        except Exception:
+            # Caches are an optimisation; a failed warm-up must not block traffic.
+            logger.exception("warm-up failed; continuing cold")
+    state.warmup_seconds = round(time.perf_counter() - start, 3)
+    state.phase = "ready"
+    logger.info("worker ready after %.3fs (warm-up %s)", state.warmup_seconds,
+                "inherited from master" if warmup and _warmed_before_fork else "on" if warmup else "off")
@@ -0,0 +1,26 @@
+"""
+JSON response class for the RealDiag API.
+
+FastJSONResponse renders with orjson when it is installed and falls back to
+Starlette's stdlib-json JSONResponse otherwise, so the API still runs (just
+slower) in environments without the optional dependency. Output is compact
+UTF-8 JSON in both cases.
+"""
+
+from typing import Any
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+ORJSON_AVAILABLE = orjson is not None
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered by orjson when available."""
+
+    if ORJSON_AVAILABLE:
+        def render(self, content: Any) -> bytes:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
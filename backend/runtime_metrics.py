@@ -0,0 +1,121 @@
+"""
+Worker saturation metrics for the RealDiag API.
+
+monitor_event_loop() runs as a background task in each worker's event loop. Every
+interval it sleeps and measures how late it woke up: that delay is time the
+loop spent running something else (typically blocking work inside an
+``async def`` handler), so a growing lag means requests are queueing. On the
+same tick it samples the worker's RSS and the AnyIO thread pool that runs
+sync handlers, and exports the GC pauses timed through gc.callbacks.
+"""
+
+import asyncio
+import gc
+import os
+import time
+from typing import Optional
+from anyio import to_thread
+from prometheus_client import Counter, Gauge, Histogram
+
+LOOP_MONITOR_INTERVAL = float(os.getenv("REALDIAG_LOOP_MONITOR_INTERVAL", "0.5"))
+
+EVENT_LOOP_LAG = Histogram(
+    'realdiag_event_loop_lag_seconds', 'Delay between scheduled and actual event-loop wakeups',
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+WORKER_RSS = Gauge(
+    'realdiag_worker_resident_memory_bytes', 'Resident set size of the worker process',
+    multiprocess_mode='all',
+)
+GC_COLLECTIONS = Counter('realdiag_gc_collections_total', 'Garbage collections', ['generation'])
+GC_PAUSE = Histogram(
+    'realdiag_gc_pause_seconds', 'Garbage collection pause duration', ['generation'],
+    buckets=(0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+THREADPOOL_BUSY = Gauge(
+    'realdiag_threadpool_busy_threads', 'Worker threads currently running sync handlers',
+    multiprocess_mode='livesum',
+)
+THREADPOOL_QUEUE = Gauge(
+    'realdiag_threadpool_queue_depth', 'Sync handlers waiting for a free worker thread',
+    multiprocess_mode='livesum',
+)
+THREADPOOL_SIZE = Gauge(
+    'realdiag_threadpool_size', 'Maximum worker threads for sync handlers',
+    multiprocess_mode='livesum',
+)
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def rss_bytes() -> Optional[int]:
+    """Current resident set size of this process, or None if unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except OSError:
+        pass
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil.Process().memory_info().rss
+
+
+# gc.callbacks can fire while this thread holds prometheus_client's
+# (non-reentrant) lock, so the callback only writes plain numbers here and
+# monitor_event_loop() moves them into the metrics on its next tick.
+_GC_RING = 1024
+_gc_generations = [0] * _GC_RING
+_gc_pauses = [0.0] * _GC_RING
+_gc_state = [0, 0.0]  # collections recorded, start of the running collection
+_gc_exported = [0]
+
+
+def _gc_callback(phase, info):
+    if phase == "start":
+        _gc_state[1] = time.perf_counter()
+    else:
+        recorded = _gc_state[0]
+        _gc_generations[recorded % _GC_RING] = info.get("generation", 0)
+        _gc_pauses[recorded % _GC_RING] = time.perf_counter() - _gc_state[1]
+        _gc_state[0] = recorded + 1
+
+
+def install_gc_metrics() -> None:
+    """Time every garbage collection in this process (idempotent)."""
+    if _gc_callback not in gc.callbacks:
+        gc.callbacks.append(_gc_callback)
+
+
+def export_gc_metrics() -> None:
+    """Move collections recorded by the gc callback into the Prometheus metrics."""
+    recorded = _gc_state[0]
+    # More than _GC_RING collections in one tick: the oldest were overwritten
+    for i in range(max(_gc_exported[0], recorded - _GC_RING), recorded):
+        generation = str(_gc_generations[i % _GC_RING])
+        GC_COLLECTIONS.labels(generation).inc()
+        GC_PAUSE.labels(generation).observe(_gc_pauses[i % _GC_RING])
+    _gc_exported[0] = recorded
+
+
+def sample_threadpool() -> None:
+    """Record AnyIO default thread-pool usage; must run on the event loop."""
+    stats = to_thread.current_default_thread_limiter().statistics()
+    THREADPOOL_BUSY.set(stats.borrowed_tokens)
+    THREADPOOL_QUEUE.set(stats.tasks_waiting)
+    THREADPOOL_SIZE.set(stats.total_tokens)
+
+
+async def monitor_event_loop(interval: float = LOOP_MONITOR_INTERVAL) -> None:
+    """Measure event-loop lag and sample saturation gauges until cancelled."""
+    loop = asyncio.get_running_loop()
+    while True:
+        scheduled = loop.time() + interval
+        await asyncio.sleep(interval)
+        EVENT_LOOP_LAG.observe(max(0.0, loop.time() - scheduled))
+        rss = rss_bytes()
+        if rss is not None:
+            WORKER_RSS.set(rss)
+        sample_threadpool()
+        export_gc_metrics()
@@ -0,0 +1,18 @@
+
+from fastapi import APIRouter, Depends, HTTPException
+from .auth import require_admin
+from .knowledge_base import reload_knowledge_base
+
+router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(require_admin)])
+
+@router.post("/reload")
+def reload_kb():
+    """Rebuild the rules and trees from disk and swap them in without a restart.
+
+    Runs in the threadpool, so the event loop keeps serving requests against
+    the current snapshot while the new one is built and validated.
+    """
+    try:
+        return reload_knowledge_base(publish=True)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=f"Reload rejected, keeping current version: {e}")
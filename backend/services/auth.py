@@ -0,0 +1,19 @@
+
+import hmac
+import os
+from typing import Optional
+from fastapi import Header, HTTPException
+
+
+def require_admin(authorization: Optional[str] = Header(None)) -> None:
+    """Dependency guarding operator endpoints with a bearer token.
+
+    The token comes from REALDIAG_ADMIN_TOKEN; when it is unset the guarded
+    endpoints are disabled entirely.
+    """
+    token = os.getenv("REALDIAG_ADMIN_TOKEN")
+    if not token:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled (REALDIAG_ADMIN_TOKEN not set)")
+    scheme, _, supplied = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(supplied.encode(), token.encode()):
+        raise HTTPException(status_code=401, detail="Invalid admin token", headers={"WWW-Authenticate": "Bearer"})
@@ -0,0 +1,39 @@
+
+import threading
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+from backend.profiling import heap_diff, profile
+from .auth import require_admin
+
+router = APIRouter(prefix="/debug", tags=["debug"], dependencies=[Depends(require_admin)])
+
+# One profiling window per worker at a time; overlapping samplers would skew each other.
+_busy = threading.Lock()
+
+@router.get("/profile", response_class=PlainTextResponse)
+def profile_worker(
+    seconds: float = Query(10.0, gt=0, le=120, description="Sampling window"),
+    interval_ms: float = Query(5.0, ge=1, le=100, description="Sampling interval"),
+):
+    """Sample this worker's stacks for `seconds` and return flamegraph-ready collapsed stacks."""
+    if not _busy.acquire(blocking=False):
+        raise HTTPException(status_code=409, detail="A profile or heap capture is already running in this worker")
+    try:
+        sampler = profile(seconds, interval_ms / 1000)
+    finally:
+        _busy.release()
+    return PlainTextResponse(sampler.collapsed(), headers={"X-Profile-Samples": str(sampler.samples)})
+
+@router.get("/heap")
+def heap(
+    seconds: float = Query(10.0, gt=0, le=300, description="Time between the two snapshots"),
+    top: int = Query(25, ge=1, le=500, description="Number of allocation sites to return"),
+    frames: int = Query(1, ge=1, le=50, description="Traceback depth per allocation"),
+):
+    """Return the top-N allocation sites that grew between two tracemalloc snapshots."""
+    if not _busy.acquire(blocking=False):
+        raise HTTPException(status_code=409, detail="A profile or heap capture is already running in this worker")
+    try:
+        return heap_diff(seconds, top, frames)
+    finally:
+        _busy.release()
@@ -3,6 +3,7 @@ from __future__ import annotations
 from pathlib import Path
 from typing import Any, Dict, List, Tuple
 import yaml
+from backend.stages import stage
 TREES_PATH = Path(__file__).resolve().parents[1] / "trees"
 def _lower_list(xs): return [str(x).lower() for x in xs or []]
 def _match(preds, facts):
@@ -73,6 +74,8 @@ class DecisionTreeEngine:
         return trees
     def list(self): return [{"id":t["id"],"title":t.get("title")} for t in self.trees.values()]
     def evaluate(self, tree_id: str, patient: Dict[str, Any]):
+        with stage("tree_evaluate"): return self._evaluate(tree_id, patient)
+    def _evaluate(self, tree_id: str, patient: Dict[str, Any]):
         t=self.trees.get(tree_id)
         if not t: return {"error": f"tree '{tree_id}' not found"}
         cur=t.get("entry"); path=[]; tests=[]; dx=[]; trace_all=[]; seen=set()
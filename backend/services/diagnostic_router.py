@@ -1,15 +1,14 @@
 
 from fastapi import APIRouter, Body
 from typing import Any, Dict
-from .decision_tree_engine import DecisionTreeEngine
+from .knowledge_base import get_knowledge_base
 
 router = APIRouter(prefix="/diagnostic", tags=["diagnostic"])
-_trees = DecisionTreeEngine()
 
 @router.get("/trees")
 def list_trees():
-    return {"trees": _trees.list()}
+    return {"trees": get_knowledge_base().trees.list()}
 
 @router.post("/evaluate/{tree_id}")
 def evaluate_tree(tree_id: str, patient: Dict[str, Any] = Body(...)):
-    return {"tree_result": _trees.evaluate(tree_id, patient)}
+    return {"tree_result": get_knowledge_base().trees.evaluate(tree_id, patient)}
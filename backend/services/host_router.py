@@ -0,0 +1,187 @@
+"""
+Diagnostics of the API's own host.
+
+/diagnostics/system, /diagnostics/network and /diagnostics/performance return
+the latest snapshot of one HostSampler per host (diagnostics/host_sampler.py),
+refreshed on a background thread every REALDIAG_HOST_SAMPLE_INTERVAL seconds.
+The first worker to get a request takes an exclusive lock in
+REALDIAG_HOST_STATE_DIR and runs the sampler, publishing each snapshot there
+atomically; the other workers only read the published file. Requests never
+sample, so neither polling nor WEB_CONCURRENCY multiplies the psutil work. If
+the sampling worker dies, the kernel drops its lock and the next request that
+finds the snapshot older than REALDIAG_HOST_MAX_AGE takes over.
+
+In the sampling worker a snapshot older than REALDIAG_HOST_MAX_AGE (say,
+after the sampler thread stalled) is refreshed once in the thread pool;
+concurrent callers wait for that single refresh, and the event loop never
+blocks.
+
+The routes expose process names, PIDs, devices and interfaces, so they
+require the admin token unless REALDIAG_HOST_DIAGNOSTICS_PUBLIC=1.
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional
+from anyio import to_thread
+from fastapi import APIRouter, Depends, HTTPException
+from config import Config
+from .auth import require_admin
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, every worker samples
+    fcntl = None
+
+HOST_SAMPLE_INTERVAL = float(os.getenv("REALDIAG_HOST_SAMPLE_INTERVAL") or Config.HOST_SAMPLE_INTERVAL)
+HOST_MAX_AGE = float(os.getenv("REALDIAG_HOST_MAX_AGE", "10"))
+HOST_STATE_DIR = Path(os.getenv("REALDIAG_HOST_STATE_DIR", Path(tempfile.gettempdir()) / "realdiag-host"))
+HOST_DIAGNOSTICS_PUBLIC = os.getenv("REALDIAG_HOST_DIAGNOSTICS_PUBLIC", "0").lower() in ("1", "true", "yes")
+HOST_DEPENDENCIES = [] if HOST_DIAGNOSTICS_PUBLIC else [Depends(require_admin)]
+
+router = APIRouter(prefix="/diagnostics", tags=["diagnostics"], dependencies=HOST_DEPENDENCIES)
+
+_sampler = None
+_lock_file = None
+_start_lock = threading.Lock()
+_refresh_lock = asyncio.Lock()
+_published = (None, None)  # (file stat key, parsed snapshot) of the last read
+
+
+def _publish(snapshot: Dict[str, Any]) -> None:
+    # Same write-then-rename as the knowledge base's published version
+    try:
+        HOST_STATE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = HOST_STATE_DIR / f".snapshot.{os.getpid()}"
+        tmp.write_text(json.dumps(snapshot, separators=(",", ":"), default=str))
+        os.replace(tmp, HOST_STATE_DIR / "snapshot.json")
+    except OSError:
+        pass  # readers keep the previous snapshot and take over once it is stale
+
+
+def _read_published() -> Optional[Dict[str, Any]]:
+    global _published
+    path = HOST_STATE_DIR / "snapshot.json"
+    try:
+        stat = path.stat()
+        key = (stat.st_mtime_ns, stat.st_size)
+        if key != _published[0]:
+            _published = (key, json.loads(path.read_text()))
+    except (OSError, ValueError):
+        pass
+    return _published[1]
+
+
+def _acquire_sampling_lock() -> bool:
+    """Become this host's sampling worker if no other process is (non-blocking)."""
+    global _lock_file
+    if _lock_file is not None or fcntl is None:
+        return True
+    HOST_STATE_DIR.mkdir(parents=True, exist_ok=True)
+    lock_file = open(HOST_STATE_DIR / "sampler.lock", "a")
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return False
+    _lock_file = lock_file
+    return True
+
+
+def _release_sampling_lock() -> None:
+    global _lock_file
+    if _lock_file is not None:
+        _lock_file.close()  # closing drops the flock
+        _lock_file = None
+
+
+def _start_sampler():
+    global _sampler
+    with _start_lock:
+        if _sampler is None:
+            from diagnostics.host_sampler import HostSampler
+
+            _sampler = HostSampler(interval=HOST_SAMPLE_INTERVAL, on_sample=_publish).start()
+    return _sampler
+
+
+def stop_sampler() -> None:
+    """Stop this worker's sampler thread, if it runs one, and hand sampling over (called on shutdown)."""
+    global _sampler, _published
+    with _start_lock:
+        if _sampler is not None:
+            _sampler.stop()
+            _sampler = None
+        _release_sampling_lock()
+        _published = (None, None)
+
+
+async def _published_snapshot(max_age: float) -> Optional[Dict[str, Any]]:
+    # Wait up to one sampling interval for the sampling worker's next snapshot
+    deadline = time.monotonic() + HOST_SAMPLE_INTERVAL + 1
+    while True:
+        snapshot = _read_published()
+        if snapshot is not None and time.time() - snapshot["timestamp"] <= max_age:
+            return snapshot
+        if _acquire_sampling_lock():
+            return None  # the sampling worker is gone; this one takes over
+        if time.monotonic() >= deadline:
+            if snapshot is None:
+                raise HTTPException(status_code=503, detail="Host diagnostics not sampled yet")
+            return snapshot
+        await asyncio.sleep(0.1)
+
+
+async def get_snapshot(max_age: Optional[float] = None) -> Dict[str, Any]:
+    """Latest host snapshot, no older than `max_age` seconds when this worker samples."""
+    max_age = HOST_MAX_AGE if max_age is None else max_age
+    if _sampler is None and not _acquire_sampling_lock():
+        snapshot = await _published_snapshot(max_age)
+        if snapshot is not None:
+            return snapshot
+    sampler = _sampler
+    if sampler is None:
+        try:
+            # The first sample primes CPU, disk, NIC and process counters (~0.5 s).
+            sampler = await to_thread.run_sync(_start_sampler)
+        except ImportError as exc:
+            _release_sampling_lock()
+            raise HTTPException(status_code=503, detail=f"Host diagnostics unavailable: {exc}")
+    if sampler.age() > max_age:
+        async with _refresh_lock:
+            if sampler.age() > max_age:
+                await to_thread.run_sync(sampler.sample)
+    return sampler.snapshot()
+
+
+def _section(snapshot: Dict[str, Any], name: str, omit=()) -> Dict[str, Any]:
+    section = {key: value for key, value in snapshot[name].items() if key not in omit}
+    return {
+        "timestamp": datetime.fromtimestamp(snapshot["timestamp"], timezone.utc).isoformat(),
+        "age_seconds": round(time.time() - snapshot["timestamp"], 3),
+        **section,
+    }
+
+
+@router.get("/system")
+async def host_system():
+    """CPU, memory, root disk, every mounted filesystem and per-device disk I/O of the API host."""
+    return _section(await get_snapshot(), "system")
+
+
+@router.get("/network")
+async def host_network():
+    """Network totals and per-interface rates and saturation of the API host."""
+    return _section(await get_snapshot(), "network", omit=("interface_counters",))
+
+
+@router.get("/performance")
+async def host_performance():
+    """Uptime, CPU times, process count, top processes and load average of the API host."""
+    return _section(await get_snapshot(), "performance")
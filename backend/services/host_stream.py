@@ -0,0 +1,203 @@
+"""
+Server-Sent Events stream of host diagnostics.
+
+GET /diagnostics/stream?interval=2 pushes the API host's readings (CPU,
+memory, filesystems, disk I/O, per-interface network rates, load, top
+processes) every `interval` seconds from the shared HostSampler; an interval
+shorter than REALDIAG_HOST_SAMPLE_INTERVAL polls more often but never samples
+more often, so frames then arrive at the sampler's cadence. The first
+event (``snapshot``) carries every field as a flat ``{"t", "set"}`` object;
+each later ``delta`` event carries only the fields that changed since the
+last event *sent to that client* (``set``) and any that disappeared
+(``del``), so a dashboard applies deltas to the previous state.
+
+Backpressure is per client: the producer keeps only the latest frame in a
+one-slot mailbox. When a client reads slower than frames are produced, the
+intermediate frames are overwritten (and counted) instead of buffered, and the
+next delta is computed against what the client actually received.
+"""
+
+import asyncio
+import os
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
+from prometheus_client import Counter, Gauge
+from backend.services import host_router
+from backend.services.host_router import get_snapshot
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+    import json
+
+STREAM_MIN_INTERVAL = float(os.getenv("REALDIAG_STREAM_MIN_INTERVAL", "1"))
+STREAM_HEARTBEAT = float(os.getenv("REALDIAG_STREAM_HEARTBEAT", "15"))
+
+STREAM_CLIENTS = Gauge(
+    'realdiag_stream_clients', 'Open /diagnostics/stream connections', multiprocess_mode='livesum',
+)
+STREAM_FRAMES = Counter('realdiag_stream_frames_total', 'Frames sent on /diagnostics/stream', ['event'])
+STREAM_DROPPED = Counter(
+    'realdiag_stream_frames_dropped_total', 'Stream frames overwritten before a slow client read them',
+)
+
+# Same admin-token guard as the other host diagnostics routes
+router = APIRouter(prefix="/diagnostics", tags=["diagnostics"], dependencies=host_router.HOST_DEPENDENCIES)
+
+_MISSING = object()
+
+
+def _ok(value: Any) -> bool:
+    # Checks that failed or timed out in the runner come back as {'status', 'error'}
+    return value is not None and not (isinstance(value, dict) and "error" in value
+                                      and value.get("status") in ("ERROR", "TIMEOUT"))
+
+
+def stream_view(snapshot: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten a HostSampler snapshot into the dotted fields sent on the stream."""
+    system, network, performance = snapshot["system"], snapshot["network"], snapshot["performance"]
+    view: Dict[str, Any] = {}
+    if _ok(system.get("cpu")):
+        view["cpu.percent"] = system["cpu"]["cpu_percent"]
+        view["cpu.per_core"] = system["cpu"]["per_cpu_percent"]
+    if _ok(system.get("memory")):
+        view["memory.percent"] = system["memory"]["percent"]
+    if _ok(system.get("mounts")):
+        for mount in system["mounts"]:
+            if "percent" in mount:
+                view[f"disk.{mount['mountpoint']}.percent"] = mount["percent"]
+    if _ok(system.get("disk_io")):
+        for device, io in system["disk_io"].items():
+            for key in ("read_iops", "write_iops", "read_bytes_per_s", "write_bytes_per_s", "await_ms", "busy_percent"):
+                view[f"disk_io.{device}.{key}"] = io[key]
+    if _ok(network.get("interface_rates")):
+        for nic, rates in network["interface_rates"].items():
+            current = next(iter(rates["windows"].values()))
+            for key in ("bytes_sent_per_s", "bytes_recv_per_s", "errors_per_s", "drops_per_s"):
+                view[f"net.{nic}.{key}"] = current[key]
+            view[f"net.{nic}.utilization_percent"] = rates["utilization_percent"]
+    if _ok(performance.get("load_average")):
+        load = performance["load_average"]
+        view["load"] = [load["load_1min"], load["load_5min"], load["load_15min"]]
+    if _ok(performance.get("process_count")):
+        view["processes"] = performance["process_count"]["total_processes"]
+    if _ok(performance.get("top_processes")):
+        view["top"] = [[p["pid"], p["name"], p["cpu_percent"], round(p["memory_percent"], 2)]
+                       for p in performance["top_processes"]]
+    return view
+
+
+def select_fields(view: Dict[str, Any], prefixes: Optional[Tuple[str, ...]]) -> Dict[str, Any]:
+    """Keep only fields whose dotted name starts with one of `prefixes` (all when None)."""
+    if not prefixes:
+        return view
+    return {key: value for key, value in view.items() if key.startswith(prefixes)}
+
+
+def delta(previous: Dict[str, Any], current: Dict[str, Any]) -> Tuple[Dict[str, Any], List[str]]:
+    """Fields that changed or appeared, and fields that disappeared."""
+    changed = {key: value for key, value in current.items() if previous.get(key, _MISSING) != value}
+    removed = [key for key in previous if key not in current]
+    return changed, removed
+
+
+class LatestFrame:
+    """One-slot mailbox: put() overwrites an unread frame instead of queueing it."""
+
+    def __init__(self):
+        self._frame = None
+        self._ready = asyncio.Event()
+        self.dropped = 0
+
+    def put(self, frame) -> None:
+        if self._ready.is_set():
+            self.dropped += 1
+            STREAM_DROPPED.inc()
+        self._frame = frame
+        self._ready.set()
+
+    async def get(self):
+        await self._ready.wait()
+        self._ready.clear()
+        return self._frame
+
+
+def _dumps(data: Dict[str, Any]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(",", ":")).encode()
+
+
+def _event(name: str, seq: int, data: Dict[str, Any]) -> bytes:
+    STREAM_FRAMES.labels(name).inc()
+    return b"event: " + name.encode() + b"\nid: " + str(seq).encode() + b"\ndata: " + _dumps(data) + b"\n\n"
+
+
+async def produce(mailbox: LatestFrame, interval: float, prefixes: Optional[Tuple[str, ...]]) -> None:
+    """Put a new frame in the mailbox whenever the shared snapshot changes, every `interval` seconds."""
+    last = None
+    # Never ask for fresher data than the background sampler produces: a 1 s client
+    # polls the shared snapshot every second but only forces a psutil pass if the
+    # sampler has stalled. A frame is sent only when the snapshot timestamp moves.
+    max_age = max(interval, host_router.HOST_SAMPLE_INTERVAL, host_router.HOST_MAX_AGE)
+    while True:
+        snapshot = await get_snapshot(max_age=max_age)
+        if snapshot["timestamp"] != last:
+            last = snapshot["timestamp"]
+            mailbox.put((last, select_fields(stream_view(snapshot), prefixes)))
+        await asyncio.sleep(interval)
+
+
+async def events(mailbox: LatestFrame, start_producer: Callable[[LatestFrame], Awaitable[None]],
+                 heartbeat: float = STREAM_HEARTBEAT):
+    """Yield SSE frames: one full snapshot, then deltas against what this client has received."""
+    # Started here rather than in the route so it only runs while the response is streaming.
+    producer = asyncio.create_task(start_producer(mailbox))
+    STREAM_CLIENTS.inc()
+    sent: Optional[Dict[str, Any]] = None
+    seq = 0
+    try:
+        while True:
+            try:
+                timestamp, view = await asyncio.wait_for(mailbox.get(), heartbeat)
+            except asyncio.TimeoutError:
+                if producer.done():
+                    return  # sampling failed; end the stream and let the client reconnect
+                # Comment line: keeps proxies from closing an idle connection
+                yield b": keep-alive\n\n"
+                continue
+            if sent is None:
+                name, data = "snapshot", {"t": timestamp, "set": view}
+            else:
+                changed, removed = delta(sent, view)
+                if not changed and not removed:
+                    continue
+                name, data = "delta", {"t": timestamp, "set": changed}
+                if removed:
+                    data["del"] = removed
+            sent = view
+            seq += 1
+            yield _event(name, seq, data)
+    finally:
+        producer.cancel()
+        STREAM_CLIENTS.dec()
+
+
+@router.get("/stream")
+async def host_stream(
+    interval: float = Query(5.0, gt=0, le=300, description="Seconds between samples"),
+    fields: Optional[str] = Query(None, description="Comma-separated field prefixes, e.g. cpu,net.eth0"),
+):
+    """Server-Sent Events stream of the API host's diagnostics: a snapshot, then deltas."""
+    interval = max(interval, STREAM_MIN_INTERVAL)
+    prefixes = tuple(filter(None, (f.strip() for f in fields.split(",")))) if fields else None
+    # Fails with 503 here, before the stream starts, if psutil is missing.
+    await get_snapshot()
+
+    return StreamingResponse(
+        events(LatestFrame(), lambda mailbox: produce(mailbox, interval, prefixes)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
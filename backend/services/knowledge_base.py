@@ -0,0 +1,184 @@
+
+from __future__ import annotations
+import gc
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict
+import yaml
+from .decision_tree_engine import TREES_PATH, DecisionTreeEngine
+from .rules_engine import RULES_PATH, RulesEngine
+
+logger = logging.getLogger("realdiag.kb")
+
+# Shared by all gunicorn workers on a host: a worker that reloads publishes the
+# new version here and the others pick it up on their next poll.
+KB_STATE_DIR = Path(os.getenv("REALDIAG_KB_STATE_DIR", Path(tempfile.gettempdir()) / "realdiag-kb"))
+KB_POLL_SECONDS = float(os.getenv("REALDIAG_KB_POLL_SECONDS", "5"))
+# Also reload when the rule/tree files themselves change on disk.
+KB_WATCH_FILES = os.getenv("REALDIAG_KB_WATCH", "0").lower() in ("1", "true", "yes")
+
+
+class KnowledgeBase:
+    """Read-only snapshot of the clinical rules and decision trees.
+
+    Routers always go through get_knowledge_base() instead of holding their
+    own engines, so one process-wide instance is shared by every route (and,
+    when gunicorn preloads the app, by every forked worker). A snapshot is
+    never mutated; reloading builds a new one and swaps the reference.
+    """
+
+    __slots__ = ("rules", "trees", "version")
+
+    def __init__(self, rules_path: Path | None = None, trees_path: Path | None = None):
+        rules_path = rules_path or RULES_PATH
+        trees_path = trees_path or TREES_PATH
+        self.version = source_version(rules_path, trees_path)
+        self.rules = RulesEngine(rules_path)
+        self.trees = DecisionTreeEngine(trees_path)
+
+    def validate(self) -> None:
+        """Raise ValueError if the snapshot is not fit to serve."""
+        if not self.rules.files:
+            raise ValueError("no rule files loaded")
+        for name, doc in self.rules.files.items():
+            for rule in doc.rules:
+                if not rule.id:
+                    raise ValueError(f"rule without id in {name}")
+        for tree_id, tree in self.trees.trees.items():
+            node_ids = {n.get("id") for n in tree.get("nodes") or []}
+            if tree.get("entry") not in node_ids:
+                raise ValueError(f"tree '{tree_id}' entry node '{tree.get('entry')}' not found")
+
+
+def _source_files(*paths: Path):
+    for path in paths:
+        if path.exists():
+            yield from sorted(path.glob("*.yml"))
+
+
+def source_version(rules_path: Path, trees_path: Path) -> str:
+    """Content hash of every rule and tree file; identifies a KB version."""
+    h = hashlib.sha256()
+    for f in _source_files(rules_path, trees_path):
+        h.update(f"{f.parent.name}/{f.name}\0".encode())
+        h.update(f.read_bytes())
+    return h.hexdigest()[:16]
+
+
+def _source_stamp(rules_path: Path, trees_path: Path):
+    """Cheap change detector (names, sizes, mtimes) used by the file watcher."""
+    return tuple((str(f), f.stat().st_mtime_ns, f.stat().st_size) for f in _source_files(rules_path, trees_path))
+
+
+_kb: KnowledgeBase | None = None
+_kb_lock = threading.Lock()
+_reload_lock = threading.Lock()
+
+
+def get_knowledge_base() -> KnowledgeBase:
+    """Return the current knowledge base snapshot, building it on first use.
+
+    Callers should fetch it once per request and keep using that object, so a
+    concurrent reload never mixes two versions within one request.
+    """
+    global _kb
+    kb = _kb
+    if kb is None:
+        with _kb_lock:
+            if _kb is None:
+                _kb = KnowledgeBase()
+            kb = _kb
+    return kb
+
+
+def reload_knowledge_base(publish: bool = True) -> Dict[str, Any]:
+    """Build and validate a fresh snapshot, then swap it in atomically.
+
+    In-flight requests keep the snapshot they already hold. On validation
+    failure the current snapshot stays active and ValueError is raised.
+    With publish=True the new version is written to KB_STATE_DIR so the
+    other workers on this host reload too.
+    """
+    global _kb
+    with _reload_lock:
+        previous = get_knowledge_base()
+        try:
+            fresh = KnowledgeBase()
+        except yaml.YAMLError as e:
+            raise ValueError(f"invalid YAML: {e}") from e
+        fresh.validate()
+        changed = fresh.version != previous.version
+        if changed:
+            _kb = fresh
+            logger.info("knowledge base reloaded: %s -> %s", previous.version, fresh.version)
+        if publish:
+            _publish_version(fresh.version)
+        return {"version": fresh.version, "previous_version": previous.version, "changed": changed}
+
+
+def _publish_version(version: str) -> None:
+    KB_STATE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = KB_STATE_DIR / f".kb-version.{os.getpid()}"
+    tmp.write_text(version)
+    os.replace(tmp, KB_STATE_DIR / "kb-version")
+
+
+def _published_version() -> str | None:
+    try:
+        return (KB_STATE_DIR / "kb-version").read_text().strip() or None
+    except OSError:
+        return None
+
+
+class KnowledgeBaseWatcher(threading.Thread):
+    """Per-worker poller that follows reloads published by other workers.
+
+    When KB_WATCH_FILES is set it also reloads (and publishes) whenever the
+    rule or tree files change on disk.
+    """
+
+    def __init__(self, interval: float = KB_POLL_SECONDS, watch_files: bool = KB_WATCH_FILES):
+        super().__init__(name="kb-watcher", daemon=True)
+        self.interval = interval
+        self.watch_files = watch_files
+        self._stop_event = threading.Event()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def run(self) -> None:
+        stamp = _source_stamp(RULES_PATH, TREES_PATH) if self.watch_files else None
+        # None, not the current published version: a worker respawned after a
+        # reload is forked from the master's stale snapshot and must catch up.
+        seen = None
+        while not self._stop_event.wait(self.interval):
+            try:
+                if self.watch_files:
+                    current = _source_stamp(RULES_PATH, TREES_PATH)
+                    if current != stamp:
+                        stamp = current
+                        reload_knowledge_base(publish=True)
+                        continue
+                published = _published_version()
+                if published and published != seen:
+                    seen = published
+                    if published != get_knowledge_base().version:
+                        reload_knowledge_base(publish=False)
+            except Exception:
+                logger.exception("knowledge base reload failed; keeping current version")
+
+
+def freeze_for_fork() -> None:
+    """Build the knowledge base and move it out of the GC's reach before fork.
+
+    gc.freeze() parks every live object in the permanent generation, so
+    collections in the forked workers never write to (and un-share) the
+    pages holding the preloaded rules and trees.
+    """
+    get_knowledge_base()
+    gc.collect()
+    gc.freeze()
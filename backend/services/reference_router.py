@@ -1,50 +1,106 @@
-from pathlib import Path
-from typing import Any, Dict, List
+import json
+from typing import Dict, Iterator, List, Optional
 
-import yaml
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import Response, StreamingResponse
+
+from .knowledge_base import get_knowledge_base
 
 router = APIRouter(prefix="/reference", tags=["reference"])
 
-RULES_PATH = Path(__file__).resolve().parents[1] / "rules"
+# Serialized per-family JSON bodies for the active knowledge-base version.
+# Rebuilt lazily after a reload changes the version.
+_fragments: Dict[str, bytes] = {}
+_fragments_version: Optional[str] = None
+
+
+def _family_fragment(family: str, kb=None) -> bytes:
+  """Return the cached JSON body for one rules file (keyed by file stem).
+
+  `kb` pins the snapshot to read from; by default the current one.
+  """
+  global _fragments, _fragments_version
+  current = get_knowledge_base()
+  kb = kb or current
+  if _fragments_version != kb.version and kb is current:
+    _fragments, _fragments_version = {}, kb.version
+  # A snapshot replaced by a reload mid-request is served uncached
+  cache = _fragments if _fragments_version == kb.version else {}
+  fragment = cache.get(family)
+  if fragment is None:
+    doc = kb.rules.files.get(family)
+    if doc is None:
+      raise HTTPException(status_code=404, detail=f"Rules file not found: {family}.yml")
+    rules = [r.to_dict() for r in doc.rules]
+    fragment = json.dumps(
+      {"family": doc.family or family, "count": len(rules), "rules": rules},
+      ensure_ascii=False, separators=(",", ":"),
+    ).encode("utf-8")
+    cache[family] = fragment
+  return fragment
+
+
+def warm_fragments(kb=None) -> None:
+  """Serialize and cache every family's payload (used by the readiness warm-up)."""
+  kb = kb or get_knowledge_base()
+  for family in kb.rules.files:
+    _family_fragment(family, kb)
+
+
+def _stream_families(kb, families: List[str]) -> Iterator[bytes]:
+  yield b'{"families":{'
+  for i, family in enumerate(families):
+    yield (b"," if i else b"") + json.dumps(family).encode() + b":"
+    yield _family_fragment(family, kb)
+  yield b"}}"
 
 
-def _load_rules_file(filename: str) -> Dict[str, Any]:
-  """Load a rules YAML file from backend/rules."""
-  path = RULES_PATH / filename
-  if not path.exists():
-    raise HTTPException(status_code=404, detail=f"Rules file not found: {filename}")
-  with path.open("r", encoding="utf-8") as f:
-    data = yaml.safe_load(f) or {}
-  return data
+def _bulk_response(families: List[str], kb=None) -> StreamingResponse:
+  # Resolve the snapshot and 404 before the headers go out; the body is then
+  # streamed from that one snapshot even if a reload lands mid-response.
+  kb = kb or get_knowledge_base()
+  missing = [f for f in families if f not in kb.rules.files]
+  if missing:
+    raise HTTPException(status_code=404, detail=f"Rules files not found: {', '.join(missing)}")
+  return StreamingResponse(_stream_families(kb, families), media_type="application/json")
+
+
+@router.get("")
+def get_rules_for_families(
+  families: str = Query(..., description="Comma-separated family ids, e.g. neurology,cardiology"),
+):
+  """
+  Bulk endpoint: /reference?families=a,b,c
+  Returns {"families": {id: {family, count, rules}}} for every requested
+  family in one streamed response, built from cached per-family fragments.
+  """
+  requested = list(dict.fromkeys(f.strip() for f in families.split(",") if f.strip()))
+  if not requested:
+    raise HTTPException(status_code=400, detail="At least one family is required")
+  return _bulk_response(requested)
+
+
+@router.get("/_all")
+def get_all_rules():
+  """
+  Bulk endpoint returning every rules file, same shape as /reference?families=.
+  """
+  kb = get_knowledge_base()
+  return _bulk_response(sorted(kb.rules.files), kb)
 
 
 @router.get("/endocrinology")
-def get_endocrinology_rules() -> Dict[str, Any]:
+def get_endocrinology_rules():
   """
   Return the full endocrinology rules document as JSON.
   """
-  data = _load_rules_file("endocrinology.yml")
-  family = data.get("family", "endocrinology")
-  rules: List[Dict[str, Any]] = data.get("rules", [])
-  return {
-    "family": family,
-    "count": len(rules),
-    "rules": rules,
-  }
+  return Response(_family_fragment("endocrinology"), media_type="application/json")
 
 
 @router.get("/{family}")
-def get_rules_by_family(family: str) -> Dict[str, Any]:
+def get_rules_by_family(family: str):
   """
   Generalized endpoint: /reference/{family}
   Looks for {family}.yml in backend/rules.
   """
-  filename = f"{family}.yml"
-  data = _load_rules_file(filename)
-  rules: List[Dict[str, Any]] = data.get("rules", [])
-  return {
-    "family": data.get("family", family),
-    "count": len(rules),
-    "rules": rules,
-  }
+  return Response(_family_fragment(family), media_type="application/json")
@@ -0,0 +1,149 @@
+
+from __future__ import annotations
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterable, Tuple
+import yaml
+
+# Keys every rule carries; anything else lands in Rule.extra.
+RULE_FIELDS = (
+    "id", "label", "presentations", "icd10", "snomed",
+    "clinical_pearls", "management", "sensitivity", "specificity",
+)
+
+
+class CodeTable:
+    """Interning table shared by every rule loaded into one knowledge base.
+
+    Strings go through ``sys.intern`` and sequences are stored once as tuples,
+    so the same ICD-10 list, presentation phrase or key layout repeated across
+    rules (and families) is held in memory a single time.
+    """
+
+    __slots__ = ("_tuples",)
+
+    def __init__(self):
+        self._tuples: Dict[Tuple[Any, ...], Tuple[Any, ...]] = {}
+
+    def value(self, v: Any) -> Any:
+        if isinstance(v, str):
+            return sys.intern(v)
+        if isinstance(v, list):
+            return self.seq(v)
+        if isinstance(v, dict):
+            return {self.value(k): self.value(x) for k, x in v.items()}
+        return v
+
+    def seq(self, xs: Iterable[Any] | None) -> Tuple[Any, ...]:
+        if not xs:
+            return ()
+        t = tuple(self.value(x) for x in xs)
+        try:
+            return self._tuples.setdefault(t, t)
+        except TypeError:
+            # Unhashable members (e.g. dict presentations) cannot be shared.
+            return t
+
+    def __len__(self) -> int:
+        return len(self._tuples)
+
+
+class Rule:
+    """Compact, read-only clinical rule record."""
+
+    __slots__ = RULE_FIELDS + ("keys", "extra")
+
+    def __init__(self, raw: Dict[str, Any], table: CodeTable):
+        self.id = table.value(raw.get("id"))
+        self.label = table.value(raw.get("label"))
+        self.presentations = table.seq(raw.get("presentations"))
+        self.icd10 = table.seq(raw.get("icd10"))
+        self.snomed = table.seq(raw.get("snomed"))
+        self.clinical_pearls = table.seq(raw["clinical_pearls"]) if "clinical_pearls" in raw else None
+        self.management = table.seq(raw["management"]) if "management" in raw else None
+        self.sensitivity = raw.get("sensitivity")
+        self.specificity = raw.get("specificity")
+        # Original key order, so to_dict() round-trips the YAML document.
+        self.keys = table.seq(raw.keys())
+        extra = {k: table.value(v) for k, v in raw.items() if k not in RULE_FIELDS}
+        self.extra = extra or None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Dict-style accessor for callers written against the raw YAML rules."""
+        if key not in self.keys:
+            return default
+        if key in RULE_FIELDS:
+            v = getattr(self, key)
+            return list(v) if isinstance(v, tuple) else v
+        return self.extra[key]
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.keys:
+            raise KeyError(key)
+        return self.get(key)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.keys
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Rebuild the rule as a plain dict (for JSON responses)."""
+        return {k: _plain(self.get(k)) for k in self.keys}
+
+
+class RuleFamily:
+    """One rules file: family metadata plus its compact rules."""
+
+    __slots__ = ("name", "family", "version", "source", "description", "rules", "keys")
+
+    def __init__(self, name: str, doc: Dict[str, Any], table: CodeTable):
+        self.name = table.value(name)
+        self.family = table.value(doc.get("family"))
+        self.version = table.value(doc.get("version"))
+        self.source = table.value(doc.get("source"))
+        self.description = table.value(doc.get("description"))
+        self.rules = tuple(Rule(r, table) for r in doc.get("rules") or [])
+        self.keys = table.seq(doc.keys())
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key not in self.keys:
+            return default
+        return list(self.rules) if key == "rules" else getattr(self, key)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Rebuild the original document shape."""
+        return {
+            k: [r.to_dict() for r in self.rules] if k == "rules" else getattr(self, k)
+            for k in self.keys
+        }
+
+
+def _plain(v: Any) -> Any:
+    if isinstance(v, (tuple, list)):
+        return [_plain(x) for x in v]
+    if isinstance(v, dict):
+        return {k: _plain(x) for k, x in v.items()}
+    return v
+
+
+def load_rule_files(rules_path: Path, table: CodeTable | None = None) -> Dict[str, RuleFamily]:
+    """Load every ``*.yml`` under rules_path into compact records, keyed by file stem."""
+    table = table or CodeTable()
+    files: Dict[str, RuleFamily] = {}
+    if not rules_path.exists():
+        return files
+    for f in sorted(rules_path.glob("*.yml")):
+        doc = yaml.safe_load(f.read_text(encoding="utf-8")) or {}
+        files[f.stem] = RuleFamily(f.stem, doc, table)
+    return files
+
+
+def rule_summary(fam: str, rule: Rule) -> Dict[str, Any]:
+    """Search/lookup result shape shared by RulesEngine methods."""
+    return {
+        "family": fam,
+        "id": rule.id,
+        "label": rule.label,
+        "presentations": list(rule.presentations),
+        "icd10": list(rule.icd10),
+    }
+
@@ -1,25 +1,28 @@
 
 from fastapi import APIRouter, Query
 from typing import Optional
-from .rules_engine import RulesEngine
+from .knowledge_base import get_knowledge_base
+from backend.timing import TimedJSONResponse
 
 router = APIRouter(prefix="/rules", tags=["rules"])
-_rules = RulesEngine()
+
+# Knowledge-base data is already plain JSON types, so these handlers return
+# TimedJSONResponse directly and skip FastAPI's jsonable_encoder pass.
 
 @router.get("/families")
 def list_families():
     """List all available clinical rule families."""
-    return {"families": _rules.list_families()}
+    return TimedJSONResponse({"families": get_knowledge_base().rules.list_families()})
 
 @router.get("/family/{family}")
 def get_family(family: str):
     """Get all rules for a specific family."""
-    return _rules.get_family(family)
+    return TimedJSONResponse(get_knowledge_base().rules.get_family(family))
 
 @router.get("/rule/{rule_id}")
 def get_rule(rule_id: str):
     """Get a specific rule by ID."""
-    return _rules.get_rule(rule_id)
+    return TimedJSONResponse(get_knowledge_base().rules.get_rule(rule_id))
 
 @router.get("/search")
 def search_rules(
@@ -27,4 +30,4 @@ def search_rules(
     family: Optional[str] = Query(None, description="Limit search to specific family")
 ):
     """Search rules by keyword in labels, presentations, or ICD-10 codes."""
-    return {"results": _rules.search(q, family)}
+    return TimedJSONResponse({"results": get_knowledge_base().rules.search(q, family)})
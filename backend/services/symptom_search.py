@@ -8,10 +8,12 @@ It searches across all disease families and ranks results by symptom match score
 
 from fastapi import APIRouter, HTTPException
 from typing import List, Dict, Any, Optional
-from pathlib import Path
-import yaml
 import re
 from pydantic import BaseModel
+from .knowledge_base import get_knowledge_base
+from .rule_store import Rule
+from backend.stages import stage
+from backend.timing import TimedJSONResponse
 
 router = APIRouter()
 
@@ -46,23 +48,10 @@ class SymptomSearchResponse(BaseModel):
 
 
 # Helper functions
-def load_all_families() -> Dict[str, List[Dict[str, Any]]]:
-    """Load all disease family YAML files."""
-    rules_dir = Path(__file__).parent.parent / "rules"
-    families = {}
-    
-    for yaml_file in rules_dir.glob("*.yml"):
-        family_name = yaml_file.stem
-        try:
-            with open(yaml_file, 'r', encoding='utf-8') as f:
-                data = yaml.safe_load(f)
-                if data and 'rules' in data:
-                    families[family_name] = data['rules']
-        except Exception as e:
-            print(f"Error loading {family_name}: {e}")
-            continue
-    
-    return families
+def load_all_families() -> Dict[str, List[Rule]]:
+    """Return every disease family's rules from the shared knowledge base, keyed by file stem."""
+    files = get_knowledge_base().rules.files
+    return {name: list(doc.rules) for name, doc in files.items() if "rules" in doc.keys}
 
 
 def normalize_text(text: str) -> str:
@@ -73,11 +62,15 @@ def normalize_text(text: str) -> str:
     return text.strip()
 
 
-def calculate_match_score(symptom_input: List[str], presentations: List[str], rule: Dict[str, Any] = None) -> tuple:
+def calculate_match_score(symptom_input: List[str], presentations: List[str], rule: Dict[str, Any] = None,
+                          normalized_symptoms: Optional[List[str]] = None) -> tuple:
     """
     Calculate match score between input symptoms and rule presentations.
     Enhanced with clinical likelihood modifiers.
     
+    Pass normalized_symptoms when scoring many rules against the same input
+    so the symptoms are normalized once rather than once per rule.
+    
     Returns:
         (score, matched_presentations)
     """
@@ -88,7 +81,8 @@ def calculate_match_score(symptom_input: List[str], presentations: List[str], ru
     string_presentations = [p for p in presentations if isinstance(p, str)]
     
     # Normalize all inputs
-    normalized_symptoms = [normalize_text(s) for s in symptom_input]
+    if normalized_symptoms is None:
+        normalized_symptoms = [normalize_text(s) for s in symptom_input]
     normalized_presentations = [normalize_text(p) for p in string_presentations]
     
     for presentation_idx, presentation in enumerate(normalized_presentations):
@@ -145,7 +139,8 @@ async def search_by_symptoms(request: SymptomSearchRequest):
         raise HTTPException(status_code=400, detail="At least one symptom is required")
     
     # Load all families
-    all_families = load_all_families()
+    with stage("kb"):
+        all_families = load_all_families()
     
     # Filter by family if specified
     if request.family:
@@ -155,56 +150,65 @@ async def search_by_symptoms(request: SymptomSearchRequest):
     else:
         families_to_search = all_families
     
+    with stage("normalize"):
+        normalized_symptoms = [normalize_text(s) for s in request.symptoms]
+    
     # Search and score all rules
-    results = []
+    scored = []
     
-    for family_name, rules in families_to_search.items():
-        # Apply filters
-        filtered_rules = apply_filters(rules, request.age, request.sex)
-        
-        for rule in filtered_rules:
-            # Get presentations - filter to only strings
-            presentations = rule.get('presentations', [])
-            # Filter out non-string presentations (sometimes YAML has dicts or other types)
-            string_presentations = [p for p in presentations if isinstance(p, str)]
-            
-            if not string_presentations:
-                continue
+    with stage("score"):
+        for family_name, rules in families_to_search.items():
+            # Apply filters
+            filtered_rules = apply_filters(rules, request.age, request.sex)
             
-            # Calculate match score with clinical likelihood
-            score, matched_presentations = calculate_match_score(request.symptoms, string_presentations, rule)
-            
-            # Only include if there's a match
-            if score > 0:
-                # Prepare result with enhanced metadata
-                diagnosis_match = DiagnosisMatch(
-                    rule_id=rule.get('id', ''),
-                    label=rule.get('label', ''),
-                    family=family_name,
-                    match_score=round(score, 2),
-                    matched_presentations=matched_presentations,
-                    all_presentations=string_presentations,  # Use filtered list
-                    icd10=rule.get('icd10', []),
-                    snomed=rule.get('snomed', []),
-                    sensitivity=rule.get('sensitivity'),
-                    specificity=rule.get('specificity'),
-                    clinical_pearls=rule.get('clinical_pearls', []) if 'clinical_pearls' in rule else None,
-                    management=rule.get('management', []) if 'management' in rule else None
-                )
+            for rule in filtered_rules:
+                # Get presentations - filter to only strings
+                presentations = rule.get('presentations', [])
+                # Filter out non-string presentations (sometimes YAML has dicts or other types)
+                string_presentations = [p for p in presentations if isinstance(p, str)]
                 
-                results.append(diagnosis_match)
-    
-    # Sort by score (descending)
-    results.sort(key=lambda x: x.match_score, reverse=True)
-    
-    # Return top 20 results
-    top_results = results[:20]
-    
-    return SymptomSearchResponse(
-        query_symptoms=request.symptoms,
-        total_results=len(top_results),
-        results=top_results
-    )
+                if not string_presentations:
+                    continue
+                
+                # Calculate match score with clinical likelihood
+                score, matched_presentations = calculate_match_score(
+                    request.symptoms, string_presentations, rule, normalized_symptoms=normalized_symptoms)
+                
+                # Only include if there's a match
+                if score > 0:
+                    scored.append((round(score, 2), family_name, rule, matched_presentations, string_presentations))
+        
+        # Sort by score (descending) and keep the top 20
+        scored.sort(key=lambda x: x[0], reverse=True)
+        top_scored = scored[:20]
+    
+    with stage("models"):
+        # Every field comes from the validated knowledge base or from the
+        # scoring above, so skip pydantic and render the rows directly; the
+        # response_model above still documents the shape in OpenAPI.
+        top_results = [
+            {
+                "rule_id": rule.get('id', ''),
+                "label": rule.get('label', ''),
+                "family": family_name,
+                "match_score": score,
+                "matched_presentations": matched_presentations,
+                "all_presentations": string_presentations,  # Use filtered list
+                "icd10": rule.get('icd10', []),
+                "snomed": rule.get('snomed', []),
+                "sensitivity": rule.get('sensitivity'),
+                "specificity": rule.get('specificity'),
+                "clinical_pearls": rule.get('clinical_pearls', []) if 'clinical_pearls' in rule else None,
+                "management": rule.get('management', []) if 'management' in rule else None,
+            }
+            for score, family_name, rule, matched_presentations, string_presentations in top_scored
+        ]
+    
+    return TimedJSONResponse({
+        "query_symptoms": request.symptoms,
+        "total_results": len(top_results),
+        "results": top_results,
+    })
 
 
 @router.get("/search/suggestions")
@@ -221,6 +225,8 @@ async def get_search_suggestions():
         for rule in rules:
             presentations = rule.get('presentations', [])
             for presentation in presentations:
+                if not isinstance(presentation, str):
+                    continue
                 # Extract individual symptoms (simple approach: split by comma)
                 parts = [p.strip() for p in presentation.split(',')]
                 symptoms.update(parts)
@@ -0,0 +1,44 @@
+"""
+Request stage markers for the RealDiag engines.
+
+Code marks the expensive parts of a request with ``with stage("score"):``.
+This module is dependency-free so the rule and decision-tree engines can
+use it from the CLI and tests without importing the web stack; collection
+is switched on per request by ServerTimingMiddleware (backend/timing.py).
+
+Outside an active collection stage() returns a shared no-op context
+manager: one ContextVar lookup per call and nothing else.
+"""
+
+import time
+from contextlib import nullcontext
+from contextvars import ContextVar
+from typing import List, Optional, Tuple
+
+# The (name, seconds) list of the request being collected, if any
+current_stages: ContextVar[Optional[List[Tuple[str, float]]]] = ContextVar("realdiag_stages", default=None)
+_NOOP = nullcontext()
+
+
+class _Stage:
+    __slots__ = ("name", "sink", "start")
+
+    def __init__(self, name, sink):
+        self.name = name
+        self.sink = sink
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.sink.append((self.name, time.perf_counter() - self.start))
+        return False
+
+
+def stage(name: str):
+    """Context manager timing one stage of the current request (no-op when disabled)."""
+    sink = current_stages.get()
+    if sink is None:
+        return _NOOP
+    return _Stage(name, sink)
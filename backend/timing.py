@@ -0,0 +1,71 @@
+"""
+Per-request stage timing for the RealDiag API.
+
+Code marks the expensive parts of a request with ``with stage("score"):``
+(backend/stages.py). When REALDIAG_STAGE_TIMING=1, ServerTimingMiddleware
+collects those durations for each request, reports them in a standard
+``Server-Timing`` response header and feeds the
+``realdiag_stage_duration_seconds`` summary.
+
+When disabled the middleware is not installed, so stage() finds no active
+collector and returns a shared no-op context manager: one ContextVar lookup
+per call and nothing else.
+"""
+
+import os
+import time
+from typing import List, Tuple
+from prometheus_client import Summary
+from backend.responses import FastJSONResponse
+from backend.stages import current_stages, stage
+
+STAGE_TIMING_ENABLED = os.getenv("REALDIAG_STAGE_TIMING", "0").lower() in ("1", "true", "yes")
+
+STAGE_DURATION = Summary('realdiag_stage_duration_seconds', 'Time spent per request stage', ['stage'])
+
+
+class TimedJSONResponse(FastJSONResponse):
+    """Default response class; times JSON encoding as the "render" stage."""
+
+    def render(self, content) -> bytes:
+        with stage("render"):
+            return super().render(content)
+
+
+def _server_timing(stages, total) -> bytes:
+    merged = {}
+    for name, seconds in stages:
+        merged[name] = merged.get(name, 0.0) + seconds
+    parts = [f"{name};dur={seconds * 1000:.2f}" for name, seconds in merged.items()]
+    parts.append(f"total;dur={total * 1000:.2f}")
+    return ", ".join(parts).encode("latin-1")
+
+
+class ServerTimingMiddleware:
+    """ASGI middleware that activates stage collection for each HTTP request."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stages: List[Tuple[str, float]] = []
+        token = current_stages.set(stages)
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", _server_timing(stages, time.perf_counter() - start)))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_stages.reset(token)
+            for name, seconds in stages:
+                STAGE_DURATION.labels(name).observe(seconds)
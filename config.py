@@ -15,17 +15,50 @@ class Config:
     
     # Diagnostic settings
     CHECK_INTERVAL = 5  # seconds
+    CPU_SAMPLE_HISTORY = 60  # CPU samples kept by the background sampler
+    CPU_AVERAGE_WINDOWS = (60, 300)  # seconds
+    TOP_PROCESS_COUNT = 5  # processes listed by the performance collector
+    PROCESS_SAMPLE_WARMUP = 0.5  # seconds between the priming and first real process sample
+    HOST_SAMPLE_INTERVAL = 5  # seconds between background samples in exporter/API mode
+    WATCH_HISTORY = 720  # samples kept per metric in --watch mode (1 hour at 5 s)
     REPORT_DIR = Path("reports")
+    REPORT_SEGMENT_BYTES = 4 * 1024 * 1024  # active report segment is sealed (gzipped) past this size
+    REPORT_SEGMENT_SECONDS = 86400  # ... or once it is this old
+    REPORT_RETENTION_DAYS = 30  # sealed segments older than this are deleted
     LOG_FILE = Path("realdiag.log")
     
     # System thresholds
     CPU_WARNING_THRESHOLD = 80  # percentage
     MEMORY_WARNING_THRESHOLD = 85  # percentage
     DISK_WARNING_THRESHOLD = 90  # percentage
+    DISK_BUSY_WARNING_THRESHOLD = 90  # percentage of time a device has I/O in flight
+    DISK_AWAIT_WARNING_MS = 50  # average time per completed I/O
+    DISK_IO_WINDOW = 10  # seconds over which device rates are computed
+    DISK_IO_HISTORY = 60  # per-device counter samples kept
+    DISK_IO_WARMUP = 0.25  # seconds between the two samples of a one-shot run
+    DISK_IO_IGNORE_PREFIXES = ('loop', 'ram', 'zram')  # pseudo block devices
     
     # Network settings
     DEFAULT_TEST_HOST = "8.8.8.8"
     NETWORK_TIMEOUT = 5  # seconds
+    PROBE_TARGETS = ["8.8.8.8:53", "1.1.1.1:53"]  # host:port, probed concurrently
+    PROBE_ATTEMPTS = 3  # TCP connects per target
+    PROBE_CONCURRENCY = 256  # targets probed at once
+    PROBE_LATENCY_WARNING_MS = 200  # p99 connect latency
+    NIC_RATE_WINDOWS = (10, 60)  # seconds, sliding windows for per-interface rates
+    NIC_RATE_HISTORY = 120  # per-interface counter samples kept
+    NIC_RATE_WARMUP = 0.25  # seconds between the two samples of a one-shot run
+    NIC_UTILIZATION_WARNING = 80  # percentage of link speed
+    NIC_ERROR_RATE_WARNING = 1  # interface errors per second
+    
+    # Concurrent check execution
+    CHECK_TIMEOUT = 10  # seconds, per individual check
+    CHECK_TIMEOUTS = {  # per-check overrides
+        'connectivity': NETWORK_TIMEOUT + 1,
+        'probes': NETWORK_TIMEOUT + 1,  # all attempts share one NETWORK_TIMEOUT deadline
+    }
+    # seconds, per collector in main.py; outlasts its slowest check so a timeout there never hides the rest
+    COLLECTOR_TIMEOUT = max(CHECK_TIMEOUT, *CHECK_TIMEOUTS.values()) + 5
     
     @classmethod
     def ensure_directories(cls):
@@ -0,0 +1,112 @@
+"""
+Background CPU utilization sampler
+"""
+
+import threading
+import time
+from collections import deque
+import psutil
+from config import Config
+
+
+def _busy_and_total(times):
+    """Busy and total CPU seconds from a psutil cpu_times() tuple"""
+    total = sum(times)
+    # On Linux guest time is already counted in user/nice
+    total -= getattr(times, 'guest', 0) + getattr(times, 'guest_nice', 0)
+    idle = times.idle + getattr(times, 'iowait', 0)
+    return total - idle, total
+
+
+def _percent(before, after):
+    busy0, total0 = _busy_and_total(before)
+    busy1, total1 = _busy_and_total(after)
+    if total1 <= total0:
+        return 0.0
+    return round(min(100.0, max(0.0, (busy1 - busy0) / (total1 - total0) * 100)), 1)
+
+
+class CpuSampler:
+    """Samples total and per-core CPU utilization on a background thread.
+
+    Utilization is computed from cpu_times() deltas between consecutive
+    samples, so reading it never blocks and does not share psutil's global
+    cpu_percent() state with other callers. The last `history` samples are
+    kept in a ring buffer for short-window averages.
+    """
+
+    def __init__(self, interval=None, history=None):
+        self.interval = interval or Config.CHECK_INTERVAL
+        self.samples = deque(maxlen=history or Config.CPU_SAMPLE_HISTORY)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._last = None
+
+    def sample(self):
+        """Take one sample relative to the previous call and store it"""
+        total = psutil.cpu_times()
+        per_cpu = psutil.cpu_times(percpu=True)
+        now = time.time()
+        if self._last is not None:
+            last_total, last_per_cpu = self._last
+            entry = (now, _percent(last_total, total),
+                     tuple(_percent(a, b) for a, b in zip(last_per_cpu, per_cpu)))
+            with self._lock:
+                self.samples.append(entry)
+        self._last = (total, per_cpu)
+
+    def start(self, warmup=0.1):
+        """Prime the counters, take a first sample after `warmup` seconds and start the thread"""
+        if self._thread is not None:
+            return self
+        self.prime(warmup)
+        self._thread = threading.Thread(target=self._run, name='cpu-sampler', daemon=True)
+        self._thread.start()
+        return self
+
+    def prime(self, warmup=0.1):
+        """Make sure at least one sample exists, waiting `warmup` seconds if needed"""
+        if self.latest() is None:
+            if self._last is None:
+                self.sample()
+                time.sleep(warmup)
+            self.sample()
+        return self
+
+    def stop(self):
+        """Stop the sampling thread"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def latest(self):
+        """Most recent (timestamp, total percent, per-core percents), or None"""
+        with self._lock:
+            return self.samples[-1] if self.samples else None
+
+    def average(self, seconds):
+        """Mean total utilization over samples from the last `seconds`"""
+        cutoff = time.time() - seconds
+        with self._lock:
+            values = [total for ts, total, _ in self.samples if ts >= cutoff]
+        return round(sum(values) / len(values), 1) if values else None
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def get_cpu_sampler():
+    """Process-wide sampler, started on first use"""
+    global _shared
+    if _shared is None:
+        with _shared_lock:
+            if _shared is None:
+                _shared = CpuSampler().start()
+    return _shared
@@ -0,0 +1,136 @@
+"""
+Per-device disk I/O rates and per-mount usage
+"""
+
+import os
+import threading
+import time
+from collections import deque
+import psutil
+from config import Config
+
+
+def _delta(new, old):
+    # Counters reset when a device is re-attached
+    return new - old if new >= old else new
+
+
+def io_device(device):
+    """Name of the disk_io_counters() entry backing a partition device, e.g. /dev/mapper/root -> dm-0"""
+    return os.path.basename(os.path.realpath(device)) if device.startswith('/dev/') else None
+
+
+def check_mounts(config=None):
+    """Usage of every mounted filesystem from disk_partitions(), in check_disk's shape"""
+    config = config or Config()
+    mounts = []
+    for part in psutil.disk_partitions(all=False):
+        entry = {
+            'mountpoint': part.mountpoint,
+            'device': part.device,
+            'io_device': io_device(part.device),
+            'fstype': part.fstype,
+            'threshold': config.DISK_WARNING_THRESHOLD,
+        }
+        try:
+            usage = psutil.disk_usage(part.mountpoint)
+        except OSError as e:
+            # Unreadable mounts (permissions, stale network filesystems) are reported, not fatal
+            entry.update(status='ERROR', error=str(e))
+        else:
+            entry.update(
+                total=usage.total,
+                used=usage.used,
+                free=usage.free,
+                percent=usage.percent,
+                status='WARNING' if usage.percent > config.DISK_WARNING_THRESHOLD else 'OK',
+            )
+        mounts.append(entry)
+    return mounts
+
+
+class DiskIOCollector:
+    """Per-device IOPS, throughput, average service time and busy percentage.
+
+    Rates are deltas of psutil.disk_io_counters(perdisk=True) between the
+    newest sample and the oldest one within DISK_IO_WINDOW seconds. The
+    average service time (await) is the time spent on reads and writes per
+    completed I/O; busy percentage is the share of wall time the device had
+    I/O in flight (Linux busy_time, None elsewhere).
+    """
+
+    def __init__(self, window=None, history=None):
+        self.config = Config()
+        self.window = window or self.config.DISK_IO_WINDOW
+        self.samples = deque(maxlen=history or self.config.DISK_IO_HISTORY)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.samples)
+
+    def sample(self, now=None):
+        """Record the current per-device counters"""
+        counters = psutil.disk_io_counters(perdisk=True) or {}
+        ignored = self.config.DISK_IO_IGNORE_PREFIXES
+        counters = {name: io for name, io in counters.items() if not name.startswith(ignored)}
+        with self._lock:
+            self.samples.append((time.monotonic() if now is None else now, counters))
+
+    def prime(self, warmup=None):
+        """Make sure at least two samples exist, waiting `warmup` seconds if needed"""
+        if len(self.samples) < 1:
+            self.sample()
+        if len(self.samples) < 2:
+            time.sleep(self.config.DISK_IO_WARMUP if warmup is None else warmup)
+            self.sample()
+        return self
+
+    def rates(self):
+        """{device: {'read_iops', 'write_iops', ..., 'busy_percent', 'status', 'threshold'}}"""
+        with self._lock:
+            samples = list(self.samples)
+        if len(samples) < 2:
+            return {}
+
+        newest_ts, newest = samples[-1]
+        base_ts, base = samples[-2]
+        for ts, counters in reversed(samples[:-1]):
+            if newest_ts - ts > self.window:
+                break
+            base_ts, base = ts, counters
+        elapsed = newest_ts - base_ts
+        if elapsed <= 0:
+            return {}
+
+        result = {}
+        for name, io in newest.items():
+            old = base.get(name)
+            if old is None:
+                continue
+            reads = _delta(io.read_count, old.read_count)
+            writes = _delta(io.write_count, old.write_count)
+            io_time = _delta(io.read_time, old.read_time) + _delta(io.write_time, old.write_time)
+            busy_ms = getattr(io, 'busy_time', None)
+            busy_percent = None
+            if busy_ms is not None:
+                busy_percent = round(min(100.0, _delta(busy_ms, old.busy_time) / (elapsed * 1000) * 100), 1)
+            await_ms = round(io_time / (reads + writes), 2) if reads + writes else 0.0
+
+            status = 'OK'
+            if (busy_percent is not None and busy_percent > self.config.DISK_BUSY_WARNING_THRESHOLD) \
+                    or await_ms > self.config.DISK_AWAIT_WARNING_MS:
+                status = 'WARNING'
+
+            result[name] = {
+                'read_iops': round(reads / elapsed, 1),
+                'write_iops': round(writes / elapsed, 1),
+                'read_bytes_per_s': round(_delta(io.read_bytes, old.read_bytes) / elapsed, 1),
+                'write_bytes_per_s': round(_delta(io.write_bytes, old.write_bytes) / elapsed, 1),
+                'await_ms': await_ms,
+                'busy_percent': busy_percent,
+                'seconds': round(elapsed, 3),
+                'status': status,
+                'threshold': self.config.DISK_BUSY_WARNING_THRESHOLD,
+                'await_threshold_ms': self.config.DISK_AWAIT_WARNING_MS,
+            }
+        return result
@@ -0,0 +1,184 @@
+"""
+Prometheus exporter for the host diagnostics
+"""
+
+import time
+from prometheus_client import CollectorRegistry, start_http_server
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from diagnostics.nic_rates import COUNTER_FIELDS
+
+# (metric suffix, help text, (sent field, received field)) per exported NIC counter
+NETWORK_COUNTERS = (
+    ("bytes", "Bytes transferred per network interface", ("bytes_sent", "bytes_recv")),
+    ("packets", "Packets transferred per network interface", ("packets_sent", "packets_recv")),
+    ("errors", "Interface errors per network interface", ("errout", "errin")),
+    ("drops", "Dropped packets per network interface", ("dropout", "dropin")),
+)
+
+
+def network_families(counters, link_speeds, rates):
+    """Per-interface counters, link speed, windowed utilization and saturation flag.
+
+    counters maps interface -> tuple in COUNTER_FIELDS order, link_speeds maps
+    interface -> Mb/s (0 when unknown) and rates is NicRateCollector.rates().
+    """
+    index = {field: i for i, field in enumerate(COUNTER_FIELDS)}
+    for suffix, documentation, (sent, recv) in NETWORK_COUNTERS:
+        family = CounterMetricFamily(
+            f"realdiag_host_network_{suffix}", documentation, labels=["interface", "direction"])
+        for name, values in counters.items():
+            family.add_metric([name, "sent"], values[index[sent]])
+            family.add_metric([name, "recv"], values[index[recv]])
+        yield family
+
+    speed = GaugeMetricFamily(
+        "realdiag_host_network_link_speed_bytes", "Link speed per network interface in bytes per second",
+        labels=["interface"])
+    for name, mbps in link_speeds.items():
+        if mbps > 0:
+            speed.add_metric([name], mbps * 125_000)
+    yield speed
+
+    utilization = GaugeMetricFamily(
+        "realdiag_host_network_utilization_percent",
+        "Busier direction's throughput as a percentage of link speed", labels=["interface", "window"])
+    saturated = GaugeMetricFamily(
+        "realdiag_host_network_saturated", "1 when utilization is above NIC_UTILIZATION_WARNING",
+        labels=["interface"])
+    for name, nic in rates.items():
+        for window, entry in nic["windows"].items():
+            if entry["utilization_percent"] is not None:
+                utilization.add_metric([name, window], entry["utilization_percent"])
+        saturated.add_metric([name], 1.0 if nic["saturated"] else 0.0)
+    yield utilization
+    yield saturated
+
+
+def _check(section, key):
+    """A check's result, or None if it failed or timed out in the runner"""
+    value = section.get(key)
+    if isinstance(value, dict) and value.get('status') in ('ERROR', 'TIMEOUT') and 'error' in value:
+        return None
+    return value
+
+
+def _gauge(name, documentation, value, labels=None, samples=None):
+    family = GaugeMetricFamily(name, documentation, labels=labels)
+    if samples is not None:
+        for label_values, sample in samples:
+            if sample is not None:
+                family.add_metric(label_values, sample)
+    elif value is not None:
+        family.add_metric([], value)
+    return family
+
+
+class HostCollector:
+    """Prometheus collector that renders the HostSampler's cached snapshot.
+
+    collect() only reads the latest snapshot; it never calls psutil, so a
+    scrape costs the same whether it comes every second or every minute.
+    """
+
+    def __init__(self, sampler):
+        self.sampler = sampler
+
+    def describe(self):
+        return []
+
+    def collect(self):
+        snapshot = self.sampler.snapshot()
+        if snapshot is None:
+            return
+        yield _gauge("realdiag_host_sample_age_seconds", "Seconds since the cached host sample was taken",
+                     time.time() - snapshot['timestamp'])
+        yield _gauge("realdiag_host_sample_duration_seconds", "Time taken by the last background sample",
+                     snapshot['sample_seconds'])
+        yield from self._system(snapshot['system'])
+        yield from self._network(snapshot['network'])
+        yield from self._performance(snapshot['performance'])
+
+    def _system(self, system):
+        cpu = _check(system, 'cpu')
+        if cpu is not None:
+            yield _gauge("realdiag_host_cpu_percent", "Total CPU utilization", cpu['cpu_percent'])
+            yield _gauge("realdiag_host_cpu_core_percent", "Per-core CPU utilization", None, ["cpu"],
+                         [([str(i)], value) for i, value in enumerate(cpu['per_cpu_percent'])])
+            yield _gauge("realdiag_host_cpu_average_percent", "Mean CPU utilization over a window", None,
+                         ["window"], [([window], value) for window, value in cpu['averages'].items()])
+
+        memory = _check(system, 'memory')
+        if memory is not None:
+            yield _gauge("realdiag_host_memory_bytes", "Physical memory by state", None, ["state"],
+                         [([state], memory[state]) for state in ('total', 'available', 'used', 'free')])
+            yield _gauge("realdiag_host_memory_percent", "Physical memory in use", memory['percent'])
+
+        mounts = _check(system, 'mounts')
+        if mounts is not None:
+            usable = [m for m in mounts if 'total' in m]
+            labels = ["mountpoint", "device", "fstype"]
+            key = [(m['mountpoint'], m['device'], m['fstype']) for m in usable]
+            yield _gauge("realdiag_host_filesystem_size_bytes", "Filesystem size", None, labels,
+                         [(list(k), m['total']) for k, m in zip(key, usable)])
+            yield _gauge("realdiag_host_filesystem_free_bytes", "Filesystem free space", None, labels,
+                         [(list(k), m['free']) for k, m in zip(key, usable)])
+            yield _gauge("realdiag_host_filesystem_used_percent", "Filesystem usage", None, labels,
+                         [(list(k), m['percent']) for k, m in zip(key, usable)])
+
+        disk_io = _check(system, 'disk_io')
+        if disk_io is not None:
+            yield _gauge("realdiag_host_disk_iops", "Completed I/Os per second", None, ["device", "op"],
+                         [([name, op], dev[f'{op}_iops']) for name, dev in disk_io.items()
+                          for op in ('read', 'write')])
+            yield _gauge("realdiag_host_disk_throughput_bytes", "Bytes per second", None, ["device", "op"],
+                         [([name, op], dev[f'{op}_bytes_per_s']) for name, dev in disk_io.items()
+                          for op in ('read', 'write')])
+            yield _gauge("realdiag_host_disk_await_seconds", "Average time per completed I/O", None, ["device"],
+                         [([name], dev['await_ms'] / 1000) for name, dev in disk_io.items()])
+            yield _gauge("realdiag_host_disk_busy_percent", "Share of time the device had I/O in flight", None,
+                         ["device"], [([name], dev['busy_percent']) for name, dev in disk_io.items()])
+
+    def _network(self, network):
+        rates = _check(network, 'interface_rates')
+        yield from network_families(network['interface_counters'], network['link_speeds'], rates or {})
+
+    def _performance(self, performance):
+        cpu_times = _check(performance, 'cpu_times')
+        if cpu_times is not None:
+            family = CounterMetricFamily("realdiag_host_cpu_seconds", "CPU time by mode", labels=["mode"])
+            for mode, seconds in cpu_times.items():
+                family.add_metric([mode], seconds)
+            yield family
+
+        uptime = _check(performance, 'uptime')
+        if uptime is not None:
+            yield _gauge("realdiag_host_uptime_seconds", "Seconds since boot", uptime['uptime_seconds'])
+
+        process_count = _check(performance, 'process_count')
+        if process_count is not None:
+            yield _gauge("realdiag_host_processes", "Running processes", process_count['total_processes'])
+
+        load = _check(performance, 'load_average')
+        if load is not None:
+            yield _gauge("realdiag_host_load", "Load average", None, ["period"],
+                         [([period], load[f'load_{period}']) for period in ('1min', '5min', '15min')])
+
+        top = _check(performance, 'top_processes')
+        if top is not None:
+            labels = ["pid", "name"]
+            yield _gauge("realdiag_host_top_process_cpu_percent", "CPU of the busiest processes", None, labels,
+                         [([str(p['pid']), p['name']], p['cpu_percent']) for p in top])
+            yield _gauge("realdiag_host_top_process_memory_percent", "Memory of the busiest processes", None,
+                         labels, [([str(p['pid']), p['name']], p['memory_percent']) for p in top])
+
+
+def serve(port, addr='0.0.0.0', sampler=None):
+    """Start the sampler and serve /metrics on a background thread; returns the sampler"""
+    if sampler is None:
+        from diagnostics.host_sampler import HostSampler
+        sampler = HostSampler()
+    sampler.start()
+    registry = CollectorRegistry()
+    registry.register(HostCollector(sampler))
+    start_http_server(port, addr=addr, registry=registry)
+    return sampler
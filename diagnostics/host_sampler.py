@@ -0,0 +1,125 @@
+"""
+Cached host snapshot refreshed on a background thread
+"""
+
+import threading
+import time
+from config import Config
+from diagnostics.cpu_sampler import CpuSampler
+from diagnostics.disk_io import DiskIOCollector
+from diagnostics.network import NetworkDiagnostics
+from diagnostics.nic_rates import NicRateCollector
+from diagnostics.performance import PerformanceMonitor
+from diagnostics.process_sampler import ProcessSampler
+from diagnostics.runner import run_checks
+from diagnostics.system import SystemDiagnostics
+
+
+class HostSampler:
+    """Runs every cheap collector check each `interval` seconds and caches the result.
+
+    Readers (the Prometheus exporter, the API routes) only ever get the
+    latest snapshot, so a read never waits on a CPU sample or a process walk
+    and the psutil cost stays one sampling pass per interval however often
+    the snapshot is read. The collectors are stateful (CPU times, NIC and
+    disk counters, primed Process objects) and live as long as the sampler,
+    so every rate is a delta between consecutive background samples.
+    External connectivity probes are left to one-shot runs. `on_sample`, if
+    given, is called with every new snapshot (e.g. to publish it).
+    """
+
+    def __init__(self, interval=None, on_sample=None):
+        self.config = Config()
+        self.interval = interval or self.config.HOST_SAMPLE_INTERVAL
+        self.on_sample = on_sample
+        self.cpu_sampler = CpuSampler(interval=self.interval)
+        self.nic_collector = NicRateCollector()
+        self.system = SystemDiagnostics(cpu_sampler=self.cpu_sampler, disk_collector=DiskIOCollector())
+        self.network = NetworkDiagnostics(nic_collector=self.nic_collector)
+        self.performance = PerformanceMonitor(process_sampler=ProcessSampler())
+        self.samples = 0
+        self._snapshot = None
+        self._sample_lock = threading.Lock()
+        self._in_flight = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _checks(self):
+        return {
+            'cpu': self.system.check_cpu,
+            'memory': self.system.check_memory,
+            'disk': self.system.check_disk,
+            'mounts': self.system.check_mounts,
+            'disk_io': self.system.check_disk_io,
+            'network_stats': self.network.get_network_stats,
+            'interface_rates': self.network.get_interface_rates,
+            'uptime': self.performance.get_uptime,
+            'cpu_times': self.performance.get_cpu_times,
+            'process_count': self.performance.get_process_count,
+            'top_processes': self.performance.get_top_processes,
+            'load_average': self.performance.get_load_average,
+        }
+
+    def sample(self):
+        """Run all checks concurrently and publish them as the new snapshot"""
+        # One pass at a time (the background thread and an on-demand refresh share
+        # the collectors), and a check still stuck in an abandoned thread from an
+        # earlier pass is not started again on top of it.
+        with self._sample_lock:
+            return self._sample()
+
+    def _sample(self):
+        started = time.perf_counter()
+        results, durations = run_checks(self._checks(), in_flight=self._in_flight)
+        counters, link_stats = self.nic_collector.latest()
+        snapshot = {
+            'timestamp': time.time(),
+            'system': {key: results[key] for key in ('cpu', 'memory', 'disk', 'mounts', 'disk_io')},
+            'network': {
+                'stats': results['network_stats'],
+                'interface_rates': results['interface_rates'],
+                'interface_counters': counters or {},
+                'link_speeds': {name: stats.speed for name, stats in link_stats.items()},
+            },
+            'performance': {key: results[key] for key in
+                            ('uptime', 'cpu_times', 'process_count', 'top_processes', 'load_average')},
+            'check_durations': durations,
+            'sample_seconds': round(time.perf_counter() - started, 4),
+        }
+        # Replacing the reference is atomic; readers never see a half-built snapshot
+        self._snapshot = snapshot
+        self.samples += 1
+        if self.on_sample is not None:
+            self.on_sample(snapshot)
+        return snapshot
+
+    def start(self):
+        """Take the first sample (so readers never see an empty cache) and start the thread"""
+        if self._thread is not None:
+            return self
+        self.cpu_sampler.start()
+        self.sample()
+        self._thread = threading.Thread(target=self._run, name='host-sampler', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop the sampling threads"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.cpu_sampler.stop()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def snapshot(self):
+        """Latest snapshot, or None before the first sample"""
+        return self._snapshot
+
+    def age(self):
+        """Seconds since the latest snapshot was taken"""
+        snapshot = self._snapshot
+        return None if snapshot is None else max(0.0, time.time() - snapshot['timestamp'])
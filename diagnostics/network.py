@@ -3,16 +3,21 @@ Network diagnostics module
 """
 
 import socket
+import time
 import psutil
 from datetime import datetime
 from config import Config
+from diagnostics.nic_rates import NicRateCollector
+from diagnostics.prober import probe_targets
+from diagnostics.runner import run_checks
 
 
 class NetworkDiagnostics:
     """Network-level diagnostic checks"""
     
-    def __init__(self):
+    def __init__(self, nic_collector=None):
         self.config = Config()
+        self.nic_collector = nic_collector
     
     def check_connectivity(self, host=None):
         """Check network connectivity to a host"""
@@ -20,18 +25,16 @@ class NetworkDiagnostics:
             host = self.config.DEFAULT_TEST_HOST
         
         try:
-            socket.setdefaulttimeout(self.config.NETWORK_TIMEOUT)
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            try:
-                sock.connect((host, 53))
+            # Per-socket timeout; socket.setdefaulttimeout would change it process-wide
+            start = time.perf_counter()
+            with socket.create_connection((host, 53), timeout=self.config.NETWORK_TIMEOUT):
                 return {
                     'host': host,
                     'status': 'Connected',
                     'reachable': True,
+                    'latency_ms': round((time.perf_counter() - start) * 1000, 3),
                     'timestamp': datetime.now().isoformat()
                 }
-            finally:
-                sock.close()
         except socket.error as e:
             return {
                 'host': host,
@@ -41,6 +44,10 @@ class NetworkDiagnostics:
                 'timestamp': datetime.now().isoformat()
             }
     
+    def probe_targets(self, targets=None):
+        """Probe Config.PROBE_TARGETS concurrently: connect latency percentiles, jitter and loss"""
+        return probe_targets(targets)
+    
     def get_network_interfaces(self):
         """Get network interface information"""
         interfaces = psutil.net_if_addrs()
@@ -78,11 +85,22 @@ class NetworkDiagnostics:
             'dropout': net_io.dropout
         }
     
+    def get_interface_rates(self):
+        """Per-interface throughput, packet, error and drop rates with link saturation"""
+        if self.nic_collector is None:
+            self.nic_collector = NicRateCollector()
+        self.nic_collector.sample()
+        return self.nic_collector.prime().rates()
+    
     def run_full_diagnostic(self):
-        """Run all network diagnostics"""
-        return {
-            'connectivity': self.check_connectivity(),
-            'interfaces': self.get_network_interfaces(),
-            'stats': self.get_network_stats(),
-            'timestamp': datetime.now().isoformat()
-        }
+        """Run all network diagnostics concurrently"""
+        results, durations = run_checks({
+            'connectivity': self.check_connectivity,
+            'probes': self.probe_targets,
+            'interfaces': self.get_network_interfaces,
+            'stats': self.get_network_stats,
+            'interface_rates': self.get_interface_rates
+        })
+        results['timestamp'] = datetime.now().isoformat()
+        results['check_durations'] = durations
+        return results
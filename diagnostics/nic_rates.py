@@ -0,0 +1,134 @@
+"""
+Per-interface network rates from counter deltas
+"""
+
+import threading
+import time
+from collections import deque
+import psutil
+from config import Config
+
+# Order of the counters kept per interface in every sample
+COUNTER_FIELDS = ('bytes_sent', 'bytes_recv', 'packets_sent', 'packets_recv',
+                  'errin', 'errout', 'dropin', 'dropout')
+
+
+def _counter_delta(new, old):
+    # Counters reset when an interface is re-created or wraps on 32-bit kernels
+    return new - old if new >= old else new
+
+
+class NicRateCollector:
+    """Per-NIC bytes/s, packets/s, error and drop rates over sliding windows.
+
+    Each sample() stores the raw psutil.net_io_counters(pernic=True) values;
+    rates over a window are the delta between the newest sample and the
+    oldest one inside it, so one collector answers several windows from the
+    same ring of samples. Utilization is the busier direction's bit rate
+    against the link speed reported by net_if_stats (unknown for loopback
+    and most virtual interfaces).
+    """
+
+    def __init__(self, windows=None, history=None):
+        self.config = Config()
+        self.windows = tuple(windows or self.config.NIC_RATE_WINDOWS)
+        self.samples = deque(maxlen=history or self.config.NIC_RATE_HISTORY)
+        self.link_stats = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.samples)
+
+    def sample(self, now=None):
+        """Record the current per-interface counters"""
+        counters = {
+            name: tuple(getattr(nic, field) for field in COUNTER_FIELDS)
+            for name, nic in psutil.net_io_counters(pernic=True).items()
+        }
+        link_stats = psutil.net_if_stats()
+        with self._lock:
+            self.samples.append((time.monotonic() if now is None else now, counters))
+            self.link_stats = link_stats
+
+    def latest(self):
+        """(per-interface counters, net_if_stats) from the newest sample, or (None, {})"""
+        with self._lock:
+            if not self.samples:
+                return None, {}
+            return dict(self.samples[-1][1]), self.link_stats
+
+    def prime(self, warmup=None):
+        """Make sure at least two samples exist, waiting `warmup` seconds if needed"""
+        if len(self.samples) < 1:
+            self.sample()
+        if len(self.samples) < 2:
+            time.sleep(self.config.NIC_RATE_WARMUP if warmup is None else warmup)
+            self.sample()
+        return self
+
+    def _window_rates(self, samples, window):
+        newest_ts, newest = samples[-1]
+        base_ts, base = samples[-2]
+        for ts, counters in reversed(samples[:-1]):
+            if newest_ts - ts > window:
+                break
+            base_ts, base = ts, counters
+        elapsed = newest_ts - base_ts
+        rates = {}
+        for name, values in newest.items():
+            old = base.get(name)
+            if old is None or elapsed <= 0:
+                continue
+            delta = dict(zip(COUNTER_FIELDS, (_counter_delta(n, o) / elapsed for n, o in zip(values, old))))
+            rates[name] = {
+                'bytes_sent_per_s': round(delta['bytes_sent'], 1),
+                'bytes_recv_per_s': round(delta['bytes_recv'], 1),
+                'packets_sent_per_s': round(delta['packets_sent'], 1),
+                'packets_recv_per_s': round(delta['packets_recv'], 1),
+                'errors_per_s': round(delta['errin'] + delta['errout'], 3),
+                'drops_per_s': round(delta['dropin'] + delta['dropout'], 3),
+                'seconds': round(elapsed, 3),
+            }
+        return rates
+
+    def rates(self):
+        """{interface: {'is_up', 'speed_mbps', 'windows': {'10s': {...}}, 'utilization_percent', 'status', ...}}"""
+        with self._lock:
+            samples = list(self.samples)
+            link_stats = self.link_stats
+        if len(samples) < 2:
+            return {}
+
+        by_window = {f'{w}s': self._window_rates(samples, w) for w in self.windows}
+        shortest = by_window[f'{min(self.windows)}s']
+        result = {}
+        for name in shortest:
+            stats = link_stats.get(name)
+            speed_mbps = stats.speed if stats is not None and stats.speed > 0 else None
+            windows = {}
+            for label, rates in by_window.items():
+                if name not in rates:
+                    continue
+                entry = dict(rates[name])
+                if speed_mbps:
+                    busiest = max(entry['bytes_sent_per_s'], entry['bytes_recv_per_s'])
+                    entry['utilization_percent'] = round(busiest * 8 / (speed_mbps * 1_000_000) * 100, 1)
+                else:
+                    entry['utilization_percent'] = None
+                windows[label] = entry
+
+            current = windows[f'{min(self.windows)}s']
+            utilization = current['utilization_percent']
+            saturated = utilization is not None and utilization > self.config.NIC_UTILIZATION_WARNING
+            erroring = current['errors_per_s'] > self.config.NIC_ERROR_RATE_WARNING
+            result[name] = {
+                'is_up': stats.isup if stats is not None else None,
+                'speed_mbps': speed_mbps,
+                'utilization_percent': utilization,
+                'saturated': saturated,
+                'windows': windows,
+                'status': 'WARNING' if saturated or erroring else 'OK',
+                'threshold': self.config.NIC_UTILIZATION_WARNING,
+                'error_rate_threshold': self.config.NIC_ERROR_RATE_WARNING,
+            }
+        return result
@@ -6,14 +6,17 @@ import psutil
 import time
 from datetime import datetime
 from config import Config
+from diagnostics.process_sampler import ProcessSampler
+from diagnostics.runner import run_checks
 
 
 class PerformanceMonitor:
     """Real-time performance monitoring"""
     
-    def __init__(self):
+    def __init__(self, process_sampler=None):
         self.config = Config()
         self.start_time = time.time()
+        self.process_sampler = process_sampler
     
     def get_uptime(self):
         """Get system uptime"""
@@ -44,26 +47,12 @@ class PerformanceMonitor:
             'timestamp': datetime.now().isoformat()
         }
     
-    def get_top_processes(self, limit=5):
-        """Get top processes by CPU usage"""
-        processes = []
-        
-        for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_percent']):
-            try:
-                proc_info = proc.info
-                processes.append({
-                    'pid': proc_info['pid'],
-                    'name': proc_info['name'],
-                    'cpu_percent': proc_info['cpu_percent'],
-                    'memory_percent': proc_info['memory_percent']
-                })
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                pass
-        
-        # Sort by CPU usage
-        processes.sort(key=lambda x: x['cpu_percent'] if x['cpu_percent'] else 0, reverse=True)
-        
-        return processes[:limit]
+    def get_top_processes(self, limit=None):
+        """Get top processes by CPU usage since the previous sample"""
+        if self.process_sampler is None:
+            self.process_sampler = ProcessSampler()
+        # A fresh sampler needs one priming pass, otherwise every process reads 0.0%
+        return self.process_sampler.prime().sample(limit)
     
     def get_load_average(self):
         """Get system load average (Unix-like systems)"""
@@ -84,12 +73,14 @@ class PerformanceMonitor:
             }
     
     def run_full_diagnostic(self):
-        """Run all performance diagnostics"""
-        return {
-            'uptime': self.get_uptime(),
-            'cpu_times': self.get_cpu_times(),
-            'process_count': self.get_process_count(),
-            'top_processes': self.get_top_processes(),
-            'load_average': self.get_load_average(),
-            'timestamp': datetime.now().isoformat()
-        }
+        """Run all performance diagnostics concurrently"""
+        results, durations = run_checks({
+            'uptime': self.get_uptime,
+            'cpu_times': self.get_cpu_times,
+            'process_count': self.get_process_count,
+            'top_processes': self.get_top_processes,
+            'load_average': self.get_load_average
+        })
+        results['timestamp'] = datetime.now().isoformat()
+        results['check_durations'] = durations
+        return results
@@ -0,0 +1,121 @@
+"""
+Concurrent TCP connectivity prober
+"""
+
+import asyncio
+import math
+import time
+from config import Config
+
+
+def parse_target(target):
+    """Split 'host:port' (or '[v6addr]:port') into (host, port)"""
+    host, sep, port = target.rpartition(':')
+    if not sep or not port.isdigit():
+        raise ValueError(f"Invalid probe target {target!r}, expected host:port")
+    return host.strip('[]'), int(port)
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+async def _connect(host, port, timeout):
+    start = time.perf_counter()
+    _, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+    latency = time.perf_counter() - start
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except OSError:
+        pass
+    return latency
+
+
+def summarize(target, latencies, attempts, error=None):
+    """Latency percentiles, jitter and loss for one target"""
+    latencies_ms = [round(latency * 1000, 3) for latency in latencies]
+    ordered = sorted(latencies_ms)
+    received = len(latencies_ms)
+    loss = round((attempts - received) / attempts * 100, 1) if attempts else 0.0
+    # Jitter: mean absolute difference between consecutive round trips (RFC 3550 style)
+    diffs = [abs(b - a) for a, b in zip(latencies_ms, latencies_ms[1:])]
+    p99 = percentile(ordered, 99)
+
+    if not received:
+        status = 'FAIL'
+    elif loss > 0 or p99 > Config.PROBE_LATENCY_WARNING_MS:
+        status = 'WARNING'
+    else:
+        status = 'OK'
+
+    result = {
+        'target': target,
+        'reachable': received > 0,
+        'attempts': attempts,
+        'received': received,
+        'loss_percent': loss,
+        'latency_ms': {
+            'min': ordered[0] if ordered else None,
+            'avg': round(sum(ordered) / received, 3) if received else None,
+            'p50': percentile(ordered, 50),
+            'p90': percentile(ordered, 90),
+            'p99': p99,
+            'max': ordered[-1] if ordered else None,
+        },
+        'jitter_ms': round(sum(diffs) / len(diffs), 3) if diffs else None,
+        'status': status,
+        'threshold_ms': Config.PROBE_LATENCY_WARNING_MS,
+    }
+    if error is not None:
+        result['error'] = error
+    return result
+
+
+async def probe_target(target, attempts, deadline, semaphore):
+    """Connect to one target up to `attempts` times in sequence, all before `deadline`, and summarize"""
+    try:
+        host, port = parse_target(target)
+    except ValueError as e:
+        return summarize(target, [], attempts, error=str(e))
+    loop = asyncio.get_running_loop()
+    latencies, error = [], None
+    async with semaphore:
+        for _ in range(attempts):
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                # Attempts the deadline left no room for count as lost
+                error = error or "Timed out"
+                break
+            try:
+                latencies.append(await _connect(host, port, remaining))
+            except asyncio.TimeoutError:
+                error = "Timed out"
+                break
+            except OSError as e:
+                error = str(e) or e.__class__.__name__
+    return summarize(target, latencies, attempts, error)
+
+
+async def probe_targets_async(targets, attempts=None, timeout=None, concurrency=None):
+    """Probe all targets concurrently; results keep the order of `targets`.
+
+    Every target shares one deadline `timeout` seconds from now, so a
+    blackholed host (or a queue behind the concurrency limit) can't stretch
+    the run past a single NETWORK_TIMEOUT.
+    """
+    attempts = attempts or Config.PROBE_ATTEMPTS
+    timeout = timeout or Config.NETWORK_TIMEOUT
+    deadline = asyncio.get_running_loop().time() + timeout
+    semaphore = asyncio.Semaphore(concurrency or Config.PROBE_CONCURRENCY)
+    return await asyncio.gather(*(probe_target(t, attempts, deadline, semaphore) for t in targets))
+
+
+def probe_targets(targets=None, attempts=None, timeout=None, concurrency=None):
+    """Blocking wrapper around probe_targets_async for the collectors and CLI"""
+    targets = list(Config.PROBE_TARGETS if targets is None else targets)
+    return asyncio.run(probe_targets_async(targets, attempts, timeout, concurrency))
@@ -0,0 +1,100 @@
+"""
+Incremental per-process CPU and memory sampler
+"""
+
+import heapq
+import threading
+import time
+import psutil
+from config import Config
+
+_GONE = (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess)
+
+
+def _cpu(proc):
+    return proc.cpu_percent(None)
+
+
+def _memory(proc):
+    return proc.memory_percent()
+
+
+class ProcessSampler:
+    """Top-N processes by CPU or memory from reused psutil.Process objects.
+
+    psutil.Process.cpu_percent() measures against the previous call on the
+    same object, so the first reading of a fresh object is always 0.0. The
+    sampler keeps one Process per PID across samples: a new PID is primed
+    on the sample that discovers it and reports real utilization from the
+    next one on. Ranking reads only the field being ranked on; the N winners
+    are picked with heapq.nlargest instead of sorting every process, and
+    only they have their name and other fields read (inside oneshot()).
+    """
+
+    def __init__(self):
+        self.config = Config()
+        self._processes = {}
+        self._lock = threading.Lock()
+        self.sampled_at = None
+
+    def __len__(self):
+        return len(self._processes)
+
+    def _refresh(self, read):
+        """[(value, pid)] for every live process, with `read(proc)` giving the value"""
+        pids = psutil.pids()
+        live = set(pids)
+        for pid in [pid for pid in self._processes if pid not in live]:
+            del self._processes[pid]
+
+        rows = []
+        for pid in pids:
+            proc = self._processes.get(pid)
+            try:
+                if proc is None:
+                    proc = psutil.Process(pid)
+                    with proc.oneshot():
+                        proc.cpu_percent(None)  # prime; the first reading is meaningless
+                        value = 0.0 if read is _cpu else read(proc)
+                    self._processes[pid] = proc
+                else:
+                    value = read(proc)
+            except _GONE:
+                self._processes.pop(pid, None)
+                continue
+            rows.append((value, pid))
+        self.sampled_at = time.time()
+        return rows
+
+    def sample(self, limit=None, by='cpu_percent'):
+        """Top `limit` processes by 'cpu_percent' or 'memory_percent' since the previous sample"""
+        limit = limit or self.config.TOP_PROCESS_COUNT
+        read = _cpu if by == 'cpu_percent' else _memory
+        with self._lock:
+            # Rank on the one field (one /proc read per process), then fill in the rest for the winners
+            top = heapq.nlargest(limit, self._refresh(read), key=lambda row: row[0])
+            result = []
+            for value, pid in top:
+                proc = self._processes.get(pid)
+                if proc is None:
+                    continue
+                try:
+                    with proc.oneshot():
+                        entry = {
+                            'pid': pid,
+                            'name': proc.name(),
+                            'cpu_percent': value if read is _cpu else proc.cpu_percent(None),
+                            'memory_percent': value if read is _memory else proc.memory_percent(),
+                        }
+                except _GONE:
+                    continue
+                result.append(entry)
+        return result
+
+    def prime(self, warmup=None):
+        """Take a first sample if none exists yet and wait `warmup` seconds"""
+        if self.sampled_at is None:
+            with self._lock:
+                self._refresh(_cpu)
+            time.sleep(self.config.PROCESS_SAMPLE_WARMUP if warmup is None else warmup)
+        return self
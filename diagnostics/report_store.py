@@ -0,0 +1,179 @@
+"""
+Append-only report store: JSON Lines segments with rollover and retention
+"""
+
+import gzip
+import json
+import os
+import re
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from config import Config
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, single writer assumed
+    fcntl = None
+
+_SEGMENT = re.compile(r'^segment-(\d+)\.jsonl(\.gz)?$')
+_DURATION = re.compile(r'^(\d+(?:\.\d+)?)([smhdw])$')
+_UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400, 'w': 604800}
+
+
+def parse_since(value, now=None):
+    """Epoch seconds for '90s', '30m', '24h', '7d', '2w' ago, or for an ISO date/time"""
+    now = time.time() if now is None else now
+    match = _DURATION.match(value.strip())
+    if match:
+        return now - float(match.group(1)) * _UNITS[match.group(2)]
+    try:
+        return datetime.fromisoformat(value.strip()).timestamp()
+    except ValueError:
+        raise ValueError(f"Invalid time {value!r}: use e.g. 30m, 24h, 7d or 2024-11-03T16:00") from None
+
+
+def metric_value(record, metric):
+    """Value at dotted path `metric` (e.g. system.cpu.cpu_percent) in a record's data, or None"""
+    value = record.get('data')
+    for part in metric.split('.'):
+        if isinstance(value, dict):
+            value = value.get(part)
+        elif isinstance(value, list) and part.isdigit() and int(part) < len(value):
+            value = value[int(part)]
+        else:
+            return None
+    return value
+
+
+def _open_segment(path):
+    if path.name.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8')
+    try:
+        return open(path, 'r', encoding='utf-8')
+    except FileNotFoundError:
+        # Sealed by a concurrent writer between listing and opening
+        return gzip.open(path.with_name(path.name + '.gz'), 'rt', encoding='utf-8')
+
+
+class ReportStore:
+    """Reports appended as JSON lines to time-named segments under one directory.
+
+    The active segment, ``segment-<start ms>.jsonl``, is plain text that each
+    run appends a single line to. Once it is older than REPORT_SEGMENT_SECONDS
+    or larger than REPORT_SEGMENT_BYTES it is sealed. Sealing gzips it into
+    ``segment-<start ms>.jsonl.gz``, which is never modified again, and a new
+    active segment starts. Sealed segments older than REPORT_RETENTION_DAYS are
+    deleted. A segment covers the time from its own start to the next
+    segment's start, so a query opens only the segments that overlap its range.
+    """
+
+    def __init__(self, directory=None, segment_bytes=None, segment_seconds=None, retention_days=None):
+        self.config = Config()
+        self.directory = Path(directory or self.config.REPORT_DIR)
+        self.segment_bytes = segment_bytes or self.config.REPORT_SEGMENT_BYTES
+        self.segment_seconds = segment_seconds or self.config.REPORT_SEGMENT_SECONDS
+        self.retention_days = self.config.REPORT_RETENTION_DAYS if retention_days is None else retention_days
+
+    def segments(self):
+        """[(start epoch seconds, path)] for every segment, oldest first"""
+        found = {}
+        if self.directory.is_dir():
+            for path in self.directory.iterdir():
+                match = _SEGMENT.match(path.name)
+                # If sealing was interrupted after the .gz was written, both exist; the .gz wins
+                if match and (match.group(1) not in found or match.group(2)):
+                    found[match.group(1)] = path
+        return sorted((int(start) / 1000, path) for start, path in found.items())
+
+    @contextmanager
+    def _locked(self):
+        # Serializes concurrent writers (overlapping cron runs) around append/rollover
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.directory / '.lock', 'a') as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def append(self, record_type, data, timestamp=None):
+        """Append one report and return the segment it was written to"""
+        timestamp = time.time() if timestamp is None else timestamp
+        line = json.dumps({'ts': timestamp, 'type': record_type, 'data': data},
+                          separators=(',', ':'), default=str) + '\n'
+        with self._locked():
+            active = self._active_segment(timestamp)
+            # One write() of one line on an O_APPEND descriptor: records never interleave
+            with open(active, 'a', encoding='utf-8') as f:
+                f.write(line)
+            self._enforce_retention(timestamp)
+        return active
+
+    def _active_segment(self, timestamp):
+        segments = self.segments()
+        if segments:
+            start, path = segments[-1]
+            if path.suffix == '.jsonl':
+                if timestamp - start < self.segment_seconds and path.stat().st_size < self.segment_bytes:
+                    return path
+                self._seal(path)
+        return self.directory / f'segment-{int(timestamp * 1000)}.jsonl'
+
+    def _seal(self, path):
+        sealed = path.with_name(path.name + '.gz')
+        tmp = sealed.with_name(sealed.name + '.tmp')
+        with open(path, 'rb') as src, gzip.open(tmp, 'wb') as dst:
+            while True:
+                chunk = src.read(1 << 20)
+                if not chunk:
+                    break
+                dst.write(chunk)
+        os.replace(tmp, sealed)
+        path.unlink()
+
+    def _enforce_retention(self, now):
+        cutoff = now - self.retention_days * 86400
+        segments = self.segments()
+        # A sealed segment ends where the next one starts; drop it once that is past the cutoff
+        for (start, path), (next_start, _) in zip(segments, segments[1:]):
+            if next_start < cutoff and path.name.endswith('.gz'):
+                path.unlink()
+
+    def segments_for(self, since=None, until=None):
+        """Paths of the segments that can hold records in [since, until]"""
+        segments = self.segments()
+        selected = []
+        for i, (start, path) in enumerate(segments):
+            end = segments[i + 1][0] if i + 1 < len(segments) else float('inf')
+            if since is not None and end <= since:
+                continue
+            if until is not None and start > until:
+                break
+            selected.append(path)
+        return selected
+
+    def query(self, since=None, until=None, record_type=None):
+        """Yield records (oldest first) with since <= ts <= until, optionally of one type"""
+        for path in self.segments_for(since, until):
+            try:
+                f = _open_segment(path)
+            except FileNotFoundError:
+                continue  # expired by a concurrent writer
+            with f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # a line cut short by a crash mid-write
+                    ts = record.get('ts', 0)
+                    if since is not None and ts < since:
+                        continue
+                    if until is not None and ts > until:
+                        continue
+                    if record_type is not None and record.get('type') != record_type:
+                        continue
+                    yield record
@@ -0,0 +1,68 @@
+"""
+Concurrent execution of independent diagnostic checks
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from config import Config
+
+
+def _timed(check):
+    start = time.perf_counter()
+    try:
+        result = check()
+    except Exception as e:
+        result = {'status': 'ERROR', 'error': str(e)}
+    return result, time.perf_counter() - start
+
+
+def run_checks(checks, timeouts=None, default_timeout=None, in_flight=None):
+    """Run named checks concurrently, each bounded by its own timeout.
+
+    `checks` maps a name to a zero-argument callable. Returns (results,
+    durations) keyed like `checks`; a check that raises yields
+    {'status': 'ERROR'} and one that overruns its timeout yields
+    {'status': 'TIMEOUT'} without holding up the others.
+
+    A timed-out check keeps running in its thread. Callers that run the same
+    (stateful) checks repeatedly pass the same `in_flight` dict every time:
+    timed-out checks are recorded there, and a check still running from an
+    earlier call is reported as TIMEOUT instead of being started again.
+    """
+    timeouts = Config.CHECK_TIMEOUTS if timeouts is None else timeouts
+    default_timeout = default_timeout or Config.CHECK_TIMEOUT
+    results, durations = {}, {}
+    order = list(checks)
+    if in_flight is not None:
+        for name in [name for name, future in in_flight.items() if future.done()]:
+            del in_flight[name]
+        for name in checks:
+            if name in in_flight:
+                results[name] = {'status': 'TIMEOUT', 'error': 'Still running from a previous run'}
+                durations[name] = 0.0
+        checks = {name: check for name, check in checks.items() if name not in results}
+    if not checks:
+        return {name: results[name] for name in order}, durations
+
+    executor = ThreadPoolExecutor(max_workers=len(checks), thread_name_prefix='diag-check')
+    start = time.perf_counter()
+    futures = {name: executor.submit(_timed, check) for name, check in checks.items()}
+    try:
+        for name, future in futures.items():
+            limit = timeouts.get(name, default_timeout)
+            remaining = max(0.0, limit - (time.perf_counter() - start))
+            try:
+                results[name], elapsed = future.result(timeout=remaining)
+            except FutureTimeout:
+                results[name] = {'status': 'TIMEOUT', 'error': f'Check did not finish within {limit}s'}
+                elapsed = time.perf_counter() - start
+                if in_flight is not None:
+                    in_flight[name] = future
+            durations[name] = round(elapsed, 4)
+    finally:
+        # Don't wait for checks that timed out; their threads finish on their own.
+        # (Cancelled by hand: shutdown(cancel_futures=True) needs Python 3.9.)
+        for future in futures.values():
+            future.cancel()
+        executor.shutdown(wait=False)
+    return {name: results[name] for name in order}, durations
@@ -6,13 +6,18 @@ import platform
 import psutil
 from datetime import datetime
 from config import Config
+from diagnostics.cpu_sampler import get_cpu_sampler
+from diagnostics.disk_io import DiskIOCollector, check_mounts
+from diagnostics.runner import run_checks
 
 
 class SystemDiagnostics:
     """System-level diagnostic checks"""
     
-    def __init__(self):
+    def __init__(self, cpu_sampler=None, disk_collector=None):
         self.config = Config()
+        self.cpu_sampler = cpu_sampler
+        self.disk_collector = disk_collector
     
     def get_system_info(self):
         """Get basic system information"""
@@ -28,8 +33,10 @@ class SystemDiagnostics:
         return info
     
     def check_cpu(self):
-        """Check CPU usage"""
-        cpu_percent = psutil.cpu_percent(interval=1)
+        """Check CPU usage from the latest background sample (does not block)"""
+        sampler = self.cpu_sampler or get_cpu_sampler()
+        # An injected sampler that was never started has nothing to report yet
+        sampled_at, cpu_percent, per_cpu = sampler.latest() or sampler.prime().latest()
         cpu_count = psutil.cpu_count()
         
         status = "OK"
@@ -39,6 +46,9 @@ class SystemDiagnostics:
         return {
             'cpu_percent': cpu_percent,
             'cpu_count': cpu_count,
+            'per_cpu_percent': list(per_cpu),
+            'averages': {f'{w}s': sampler.average(w) for w in self.config.CPU_AVERAGE_WINDOWS},
+            'sampled_at': datetime.fromtimestamp(sampled_at).isoformat(),
             'status': status,
             'threshold': self.config.CPU_WARNING_THRESHOLD
         }
@@ -78,11 +88,26 @@ class SystemDiagnostics:
             'threshold': self.config.DISK_WARNING_THRESHOLD
         }
     
+    def check_mounts(self):
+        """Check usage of every mounted filesystem"""
+        return check_mounts(self.config)
+    
+    def check_disk_io(self):
+        """Check per-device IOPS, throughput, service time and busy percentage"""
+        if self.disk_collector is None:
+            self.disk_collector = DiskIOCollector()
+        self.disk_collector.sample()
+        return self.disk_collector.prime().rates()
+    
     def run_full_diagnostic(self):
-        """Run all system diagnostics"""
-        return {
-            'system_info': self.get_system_info(),
-            'cpu': self.check_cpu(),
-            'memory': self.check_memory(),
-            'disk': self.check_disk()
-        }
+        """Run all system diagnostics concurrently"""
+        results, durations = run_checks({
+            'system_info': self.get_system_info,
+            'cpu': self.check_cpu,
+            'memory': self.check_memory,
+            'disk': self.check_disk,
+            'mounts': self.check_mounts,
+            'disk_io': self.check_disk_io
+        })
+        results['check_durations'] = durations
+        return results
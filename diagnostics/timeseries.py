@@ -0,0 +1,112 @@
+"""
+Fixed-size time series for continuous monitoring
+"""
+
+import math
+import time
+from array import array
+
+
+class RingBuffer:
+    """Fixed-capacity ring of floats backed by array('d').
+
+    Memory is allocated once up front, so a buffer costs the same after a
+    week of appends as after the first. The running sum is updated on every
+    append, which keeps mean() O(1) however long the window.
+    """
+
+    def __init__(self, capacity):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self._data = array('d', bytes(8 * capacity))
+        self._next = 0
+        self.count = 0
+        self._sum = 0.0
+
+    def append(self, value):
+        """Add a value, overwriting the oldest once the buffer is full"""
+        value = float(value)
+        if self.count == self.capacity:
+            self._sum -= self._data[self._next]
+        else:
+            self.count += 1
+        self._data[self._next] = value
+        self._sum += value
+        self._next = (self._next + 1) % self.capacity
+        if self._next == 0:
+            # Re-sum once per wrap so float error cannot accumulate over days
+            self._sum = math.fsum(self._data)
+
+    def __len__(self):
+        return self.count
+
+    def latest(self):
+        """Most recent value, or None if empty"""
+        if not self.count:
+            return None
+        return self._data[self._next - 1]
+
+    def mean(self):
+        """Mean of the values currently held"""
+        return self._sum / self.count if self.count else None
+
+    def values(self):
+        """Values from oldest to newest"""
+        if self.count < self.capacity:
+            return self._data[:self.count].tolist()
+        return (self._data[self._next:] + self._data[:self._next]).tolist()
+
+    def min(self):
+        return min(self.values()) if self.count else None
+
+    def max(self):
+        return max(self.values()) if self.count else None
+
+
+class RateTracker:
+    """Per-second rate of a monotonically increasing counter"""
+
+    def __init__(self):
+        self._last = None
+
+    def update(self, value, now=None):
+        """Return the rate since the previous update (None on the first call)"""
+        now = time.monotonic() if now is None else now
+        last, self._last = self._last, (now, value)
+        if last is None or now <= last[0]:
+            return None
+        # Counters can reset (interface re-created, host rebooted)
+        return max(0.0, (value - last[1]) / (now - last[0]))
+
+
+class TimeSeries:
+    """Named ring buffers sharing one capacity, plus sample timestamps"""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.timestamps = RingBuffer(capacity)
+        self.series = {}
+
+    def record(self, values, timestamp=None):
+        """Append one sample; None and NaN values are skipped"""
+        self.timestamps.append(time.time() if timestamp is None else timestamp)
+        for name, value in values.items():
+            if value is None or (isinstance(value, float) and math.isnan(value)):
+                continue
+            buffer = self.series.get(name)
+            if buffer is None:
+                buffer = self.series[name] = RingBuffer(self.capacity)
+            buffer.append(value)
+
+    def summary(self):
+        """{name: {'current', 'mean', 'min', 'max'}} over the buffered window"""
+        return {
+            name: {
+                'current': buffer.latest(),
+                'mean': buffer.mean(),
+                'min': buffer.min(),
+                'max': buffer.max(),
+            }
+            for name, buffer in self.series.items()
+        }
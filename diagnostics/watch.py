@@ -0,0 +1,67 @@
+"""
+Continuous monitoring: periodic samples from all collectors
+"""
+
+import time
+from config import Config
+from diagnostics.cpu_sampler import CpuSampler
+from diagnostics.network import NetworkDiagnostics
+from diagnostics.performance import PerformanceMonitor
+from diagnostics.system import SystemDiagnostics
+from diagnostics.timeseries import RateTracker, TimeSeries
+
+
+class DiagnosticsWatcher:
+    """Samples the cheap readings of every collector into fixed-size time series.
+
+    Cumulative counters (network bytes, errors) are turned into per-second
+    rates between consecutive samples. Blocking checks such as the
+    connectivity probe and the full process walk are left to one-shot runs.
+    """
+
+    def __init__(self, interval=None, history=None):
+        self.config = Config()
+        self.interval = interval or self.config.CHECK_INTERVAL
+        self.cpu_sampler = CpuSampler(interval=self.interval)
+        self.system = SystemDiagnostics(cpu_sampler=self.cpu_sampler.start())
+        self.network = NetworkDiagnostics()
+        self.performance = PerformanceMonitor()
+        self.series = TimeSeries(history or self.config.WATCH_HISTORY)
+        self.rates = {
+            'net_sent_bps': RateTracker(),
+            'net_recv_bps': RateTracker(),
+            'net_errors_per_s': RateTracker(),
+        }
+        self.samples = 0
+
+    def sample(self):
+        """Take one sample of every metric and append it to the time series"""
+        cpu = self.system.check_cpu()
+        memory = self.system.check_memory()
+        disk = self.system.check_disk()
+        net = self.network.get_network_stats()
+        now = time.monotonic()
+        values = {
+            'cpu_percent': cpu['cpu_percent'],
+            'memory_percent': memory['percent'],
+            'disk_percent': disk['percent'],
+            'net_sent_bps': self.rates['net_sent_bps'].update(net['bytes_sent'], now),
+            'net_recv_bps': self.rates['net_recv_bps'].update(net['bytes_recv'], now),
+            'net_errors_per_s': self.rates['net_errors_per_s'].update(net['errin'] + net['errout'], now),
+            'process_count': self.performance.get_process_count()['total_processes'],
+            'load_1min': self.performance.get_load_average()['load_1min'],
+        }
+        self.series.record(values)
+        self.samples += 1
+        return values
+
+    def run(self, on_sample=None, iterations=None):
+        """Sample every `interval` seconds until interrupted (or `iterations` samples)"""
+        while True:
+            started = time.monotonic()
+            self.sample()
+            if on_sample is not None:
+                on_sample(self)
+            if iterations is not None and self.samples >= iterations:
+                break
+            time.sleep(max(0.0, self.interval - (time.monotonic() - started)))
@@ -31,25 +31,25 @@ export default function PrintableReferencePage() {
       setLoading(true);
       setErr("");
       try {
-        const results = await Promise.all(
-          FAMILIES.map(async (f) => {
-            const res = await fetch(`${apiBase}/reference/${f.id}`);
-            if (!res.ok) throw new Error(`HTTP ${res.status} for ${f.id}`);
-            const data = await res.json();
-            return {
+        const ids = FAMILIES.map((f) => f.id).join(",");
+        const res = await fetch(`${apiBase}/reference?families=${encodeURIComponent(ids)}`);
+        if (!res.ok) throw new Error(`HTTP ${res.status} for ${ids}`);
+        const bulk = await res.json();
+        const results = FAMILIES.map((f) => {
+          const data = (bulk.families && bulk.families[f.id]) || {};
+          return {
+            family: f.label,
+            rules: (data.rules || []).map((r) => ({
               family: f.label,
-              rules: (data.rules || []).map((r) => ({
-                family: f.label,
-                id: r.id,
-                label: r.label || r.id,
-                presentations: r.presentations || [],
-                icd10: r.icd10 || [],
-                snomed: r.snomed || [],
-                citations: r.citations || [],
-              })),
-            };
-          })
-        );
+              id: r.id,
+              label: r.label || r.id,
+              presentations: r.presentations || [],
+              icd10: r.icd10 || [],
+              snomed: r.snomed || [],
+              citations: r.citations || [],
+            })),
+          };
+        });
         if (!cancelled) {
           const byFamily = {};
           for (const block of results) {
@@ -42,17 +42,17 @@ export default function ReferencePage() {
       setErr("");
       setExpandedId(null);
       try {
-        const results = await Promise.all(
-          FAMILIES.map(async (f) => {
-            const res = await fetch(`${apiBase}/reference/${f.id}`);
-            if (!res.ok) throw new Error(`Failed to load ${f.label}`);
-            const data = await res.json();
-            return (data.rules || []).map(rule => ({
-              ...rule,
-              family: f.label,
-              familyId: f.id
-            }));
-          })
+        // One bulk request for every family instead of one request per family.
+        const ids = FAMILIES.map(f => f.id).join(",");
+        const res = await fetch(`${apiBase}/reference?families=${encodeURIComponent(ids)}`);
+        if (!res.ok) throw new Error(`HTTP ${res.status}`);
+        const data = await res.json();
+        const results = FAMILIES.map(f =>
+          ((data.families && data.families[f.id] && data.families[f.id].rules) || []).map(rule => ({
+            ...rule,
+            family: f.label,
+            familyId: f.id
+          }))
         );
         if (!cancelled) {
           setAllRules(results.flat());
@@ -7,6 +7,7 @@ Main entry point for the application
 import argparse
 import json
 import sys
+import time
 from datetime import datetime
 from pathlib import Path
 
@@ -18,7 +19,6 @@ except ImportError:
     COLORS_AVAILABLE = False
 
 from config import Config
-from diagnostics import SystemDiagnostics, NetworkDiagnostics, PerformanceMonitor
 
 
 def print_colored(text, color=None):
@@ -45,48 +45,90 @@ def format_bytes(bytes_value):
     return f"{bytes_value:.2f} PB"
 
 
+def check_ok(diagnostics, key):
+    """Return True if a check produced data; otherwise report why it did not"""
+    data = diagnostics.get(key)
+    if isinstance(data, dict) and data.get('status') in ('ERROR', 'TIMEOUT'):
+        print_colored(f"\n[{key}] {data['status']}: {data.get('error', 'Unknown')}",
+                      Fore.RED if COLORS_AVAILABLE else None)
+        return False
+    return data is not None
+
+
 def display_system_diagnostics(diagnostics):
     """Display system diagnostics in a formatted way"""
     print_header("SYSTEM DIAGNOSTICS")
     
     # System Info
-    info = diagnostics['system_info']
-    print_colored("\n[System Information]", Fore.YELLOW if COLORS_AVAILABLE else None)
-    print(f"  Platform: {info['platform']} {info['platform_release']}")
-    print(f"  Architecture: {info['architecture']}")
-    print(f"  Hostname: {info['hostname']}")
-    print(f"  Processor: {info['processor']}")
+    if check_ok(diagnostics, 'system_info'):
+        info = diagnostics['system_info']
+        print_colored("\n[System Information]", Fore.YELLOW if COLORS_AVAILABLE else None)
+        print(f"  Platform: {info['platform']} {info['platform_release']}")
+        print(f"  Architecture: {info['architecture']}")
+        print(f"  Hostname: {info['hostname']}")
+        print(f"  Processor: {info['processor']}")
     
     # CPU
-    cpu = diagnostics['cpu']
-    print_colored("\n[CPU Status]", Fore.YELLOW if COLORS_AVAILABLE else None)
-    status_color = Fore.GREEN if cpu['status'] == 'OK' else Fore.RED
-    print_colored(f"  Status: {cpu['status']}", status_color if COLORS_AVAILABLE else None)
-    print(f"  Usage: {cpu['cpu_percent']:.1f}%")
-    print(f"  CPU Count: {cpu['cpu_count']}")
-    print(f"  Threshold: {cpu['threshold']}%")
+    if check_ok(diagnostics, 'cpu'):
+        cpu = diagnostics['cpu']
+        print_colored("\n[CPU Status]", Fore.YELLOW if COLORS_AVAILABLE else None)
+        status_color = Fore.GREEN if cpu['status'] == 'OK' else Fore.RED
+        print_colored(f"  Status: {cpu['status']}", status_color if COLORS_AVAILABLE else None)
+        print(f"  Usage: {cpu['cpu_percent']:.1f}%")
+        averages = ", ".join(f"{window}: {value:.1f}%" for window, value in cpu['averages'].items() if value is not None)
+        if averages:
+            print(f"  Averages: {averages}")
+        print(f"  CPU Count: {cpu['cpu_count']}")
+        print(f"  Threshold: {cpu['threshold']}%")
     
     # Memory
-    memory = diagnostics['memory']
-    print_colored("\n[Memory Status]", Fore.YELLOW if COLORS_AVAILABLE else None)
-    status_color = Fore.GREEN if memory['status'] == 'OK' else Fore.RED
-    print_colored(f"  Status: {memory['status']}", status_color if COLORS_AVAILABLE else None)
-    print(f"  Usage: {memory['percent']:.1f}%")
-    print(f"  Total: {format_bytes(memory['total'])}")
-    print(f"  Used: {format_bytes(memory['used'])}")
-    print(f"  Available: {format_bytes(memory['available'])}")
-    print(f"  Threshold: {memory['threshold']}%")
+    if check_ok(diagnostics, 'memory'):
+        memory = diagnostics['memory']
+        print_colored("\n[Memory Status]", Fore.YELLOW if COLORS_AVAILABLE else None)
+        status_color = Fore.GREEN if memory['status'] == 'OK' else Fore.RED
+        print_colored(f"  Status: {memory['status']}", status_color if COLORS_AVAILABLE else None)
+        print(f"  Usage: {memory['percent']:.1f}%")
+        print(f"  Total: {format_bytes(memory['total'])}")
+        print(f"  Used: {format_bytes(memory['used'])}")
+        print(f"  Available: {format_bytes(memory['available'])}")
+        print(f"  Threshold: {memory['threshold']}%")
     
     # Disk
-    disk = diagnostics['disk']
-    print_colored("\n[Disk Status]", Fore.YELLOW if COLORS_AVAILABLE else None)
-    status_color = Fore.GREEN if disk['status'] == 'OK' else Fore.RED
-    print_colored(f"  Status: {disk['status']}", status_color if COLORS_AVAILABLE else None)
-    print(f"  Usage: {disk['percent']:.1f}%")
-    print(f"  Total: {format_bytes(disk['total'])}")
-    print(f"  Used: {format_bytes(disk['used'])}")
-    print(f"  Free: {format_bytes(disk['free'])}")
-    print(f"  Threshold: {disk['threshold']}%")
+    if check_ok(diagnostics, 'disk'):
+        disk = diagnostics['disk']
+        print_colored("\n[Disk Status]", Fore.YELLOW if COLORS_AVAILABLE else None)
+        status_color = Fore.GREEN if disk['status'] == 'OK' else Fore.RED
+        print_colored(f"  Status: {disk['status']}", status_color if COLORS_AVAILABLE else None)
+        print(f"  Usage: {disk['percent']:.1f}%")
+        print(f"  Total: {format_bytes(disk['total'])}")
+        print(f"  Used: {format_bytes(disk['used'])}")
+        print(f"  Free: {format_bytes(disk['free'])}")
+        print(f"  Threshold: {disk['threshold']}%")
+    
+    # All mounted filesystems
+    if check_ok(diagnostics, 'mounts'):
+        print_colored("\n[Mounted Filesystems]", Fore.YELLOW if COLORS_AVAILABLE else None)
+        for mount in diagnostics['mounts']:
+            status_color = Fore.GREEN if mount['status'] == 'OK' else Fore.RED
+            if 'percent' in mount:
+                detail = (f"{mount['percent']:.1f}% of {format_bytes(mount['total'])} "
+                          f"({format_bytes(mount['free'])} free, {mount['fstype']})")
+            else:
+                detail = mount.get('error', 'Unavailable')
+            print_colored(f"  {mount['status']:<8}{mount['mountpoint']:<24} {detail}",
+                          status_color if COLORS_AVAILABLE else None)
+    
+    # Disk I/O
+    if check_ok(diagnostics, 'disk_io'):
+        print_colored("\n[Disk I/O]", Fore.YELLOW if COLORS_AVAILABLE else None)
+        for name, dev in sorted(diagnostics['disk_io'].items()):
+            status_color = Fore.GREEN if dev['status'] == 'OK' else Fore.RED
+            busy = f"{dev['busy_percent']:.1f}% busy" if dev['busy_percent'] is not None else "busy n/a"
+            print_colored(f"  {name}: {dev['read_iops']:g} r/s, {dev['write_iops']:g} w/s, "
+                          f"{format_bytes(dev['read_bytes_per_s'])}/s read, "
+                          f"{format_bytes(dev['write_bytes_per_s'])}/s written, "
+                          f"await {dev['await_ms']:g} ms, {busy} [{dev['status']}]",
+                          status_color if COLORS_AVAILABLE else None)
 
 
 def display_network_diagnostics(diagnostics):
@@ -94,23 +136,53 @@ def display_network_diagnostics(diagnostics):
     print_header("NETWORK DIAGNOSTICS")
     
     # Connectivity
-    conn = diagnostics['connectivity']
-    print_colored("\n[Connectivity]", Fore.YELLOW if COLORS_AVAILABLE else None)
-    status_color = Fore.GREEN if conn['reachable'] else Fore.RED
-    print_colored(f"  Status: {conn['status']}", status_color if COLORS_AVAILABLE else None)
-    print(f"  Test Host: {conn['host']}")
-    if not conn['reachable']:
-        print(f"  Error: {conn.get('error', 'Unknown')}")
+    if check_ok(diagnostics, 'connectivity'):
+        conn = diagnostics['connectivity']
+        print_colored("\n[Connectivity]", Fore.YELLOW if COLORS_AVAILABLE else None)
+        status_color = Fore.GREEN if conn['reachable'] else Fore.RED
+        print_colored(f"  Status: {conn['status']}", status_color if COLORS_AVAILABLE else None)
+        print(f"  Test Host: {conn['host']}")
+        if not conn['reachable']:
+            print(f"  Error: {conn.get('error', 'Unknown')}")
+    
+    # Target probes
+    if check_ok(diagnostics, 'probes'):
+        print_colored("\n[Target Probes]", Fore.YELLOW if COLORS_AVAILABLE else None)
+        for probe in diagnostics['probes']:
+            status_color = Fore.GREEN if probe['status'] == 'OK' else Fore.RED
+            latency = probe['latency_ms']
+            if probe['reachable']:
+                detail = (f"p50 {latency['p50']:.1f} ms, p99 {latency['p99']:.1f} ms, "
+                          f"jitter {probe['jitter_ms'] or 0:.1f} ms, loss {probe['loss_percent']:.0f}%")
+            else:
+                detail = probe.get('error', 'Unreachable')
+            print_colored(f"  {probe['status']:<8}{probe['target']:<24}{detail}",
+                          status_color if COLORS_AVAILABLE else None)
     
     # Network Stats
-    stats = diagnostics['stats']
-    print_colored("\n[Network Statistics]", Fore.YELLOW if COLORS_AVAILABLE else None)
-    print(f"  Bytes Sent: {format_bytes(stats['bytes_sent'])}")
-    print(f"  Bytes Received: {format_bytes(stats['bytes_recv'])}")
-    print(f"  Packets Sent: {stats['packets_sent']}")
-    print(f"  Packets Received: {stats['packets_recv']}")
-    print(f"  Errors In: {stats['errin']}")
-    print(f"  Errors Out: {stats['errout']}")
+    if check_ok(diagnostics, 'stats'):
+        stats = diagnostics['stats']
+        print_colored("\n[Network Statistics]", Fore.YELLOW if COLORS_AVAILABLE else None)
+        print(f"  Bytes Sent: {format_bytes(stats['bytes_sent'])}")
+        print(f"  Bytes Received: {format_bytes(stats['bytes_recv'])}")
+        print(f"  Packets Sent: {stats['packets_sent']}")
+        print(f"  Packets Received: {stats['packets_recv']}")
+        print(f"  Errors In: {stats['errin']}")
+        print(f"  Errors Out: {stats['errout']}")
+    
+    # Per-interface rates
+    if check_ok(diagnostics, 'interface_rates'):
+        print_colored("\n[Interface Rates]", Fore.YELLOW if COLORS_AVAILABLE else None)
+        for name, nic in sorted(diagnostics['interface_rates'].items()):
+            current = next(iter(nic['windows'].values()))
+            status_color = Fore.GREEN if nic['status'] == 'OK' else Fore.RED
+            utilization = (f"{nic['utilization_percent']:.1f}% of {nic['speed_mbps']} Mb/s"
+                           if nic['utilization_percent'] is not None else "link speed unknown")
+            print_colored(f"  {name}: {format_bytes(current['bytes_sent_per_s'])}/s out, "
+                          f"{format_bytes(current['bytes_recv_per_s'])}/s in, "
+                          f"{current['errors_per_s']:g} err/s, {current['drops_per_s']:g} drop/s "
+                          f"({utilization}) [{nic['status']}]",
+                          status_color if COLORS_AVAILABLE else None)
 
 
 def display_performance_diagnostics(diagnostics):
@@ -118,80 +190,174 @@ def display_performance_diagnostics(diagnostics):
     print_header("PERFORMANCE DIAGNOSTICS")
     
     # Uptime
-    uptime = diagnostics['uptime']
-    print_colored("\n[System Uptime]", Fore.YELLOW if COLORS_AVAILABLE else None)
-    print(f"  Boot Time: {uptime['boot_time']}")
-    print(f"  Uptime: {uptime['uptime_days']:.2f} days ({uptime['uptime_hours']:.2f} hours)")
+    if check_ok(diagnostics, 'uptime'):
+        uptime = diagnostics['uptime']
+        print_colored("\n[System Uptime]", Fore.YELLOW if COLORS_AVAILABLE else None)
+        print(f"  Boot Time: {uptime['boot_time']}")
+        print(f"  Uptime: {uptime['uptime_days']:.2f} days ({uptime['uptime_hours']:.2f} hours)")
     
     # Process Count
-    proc_count = diagnostics['process_count']
-    print_colored("\n[Process Information]", Fore.YELLOW if COLORS_AVAILABLE else None)
-    print(f"  Total Processes: {proc_count['total_processes']}")
+    if check_ok(diagnostics, 'process_count'):
+        proc_count = diagnostics['process_count']
+        print_colored("\n[Process Information]", Fore.YELLOW if COLORS_AVAILABLE else None)
+        print(f"  Total Processes: {proc_count['total_processes']}")
     
     # Top Processes
-    print_colored("\n[Top Processes by CPU]", Fore.YELLOW if COLORS_AVAILABLE else None)
-    top_procs = diagnostics['top_processes']
-    for i, proc in enumerate(top_procs, 1):
-        print(f"  {i}. {proc['name']} (PID: {proc['pid']})")
-        print(f"     CPU: {proc['cpu_percent']}%, Memory: {proc['memory_percent']:.2f}%")
+    if check_ok(diagnostics, 'top_processes'):
+        print_colored("\n[Top Processes by CPU]", Fore.YELLOW if COLORS_AVAILABLE else None)
+        top_procs = diagnostics['top_processes']
+        for i, proc in enumerate(top_procs, 1):
+            print(f"  {i}. {proc['name']} (PID: {proc['pid']})")
+            print(f"     CPU: {proc['cpu_percent']}%, Memory: {proc['memory_percent']:.2f}%")
     
     # Load Average
-    load = diagnostics['load_average']
-    if load['load_1min'] is not None:
-        print_colored("\n[Load Average]", Fore.YELLOW if COLORS_AVAILABLE else None)
-        print(f"  1 min: {load['load_1min']:.2f}")
-        print(f"  5 min: {load['load_5min']:.2f}")
-        print(f"  15 min: {load['load_15min']:.2f}")
+    if check_ok(diagnostics, 'load_average'):
+        load = diagnostics['load_average']
+        if load['load_1min'] is not None:
+            print_colored("\n[Load Average]", Fore.YELLOW if COLORS_AVAILABLE else None)
+            print(f"  1 min: {load['load_1min']:.2f}")
+            print(f"  5 min: {load['load_5min']:.2f}")
+            print(f"  15 min: {load['load_15min']:.2f}")
+
+
+WATCH_ROWS = [
+    ('cpu_percent', 'CPU', '%'),
+    ('memory_percent', 'Memory', '%'),
+    ('disk_percent', 'Disk', '%'),
+    ('load_1min', 'Load (1m)', ''),
+    ('process_count', 'Processes', None),
+    ('net_sent_bps', 'Net sent', 'B/s'),
+    ('net_recv_bps', 'Net received', 'B/s'),
+    ('net_errors_per_s', 'Net errors', '/s'),
+]
+
+
+def format_watch_value(value, unit):
+    """Format one watch-mode reading"""
+    if value is None:
+        return "-"
+    if unit == 'B/s':
+        return f"{format_bytes(value)}/s"
+    if unit is None:
+        return f"{value:.0f}"
+    return f"{value:.1f}{unit}"
+
+
+def display_watch(watcher):
+    """Redraw the watch-mode view: current value and window statistics per metric"""
+    if sys.stdout.isatty():
+        print("\033[H\033[2J", end="")
+    window = len(watcher.series.timestamps) * watcher.interval
+    print_header(f"{Config.APP_NAME} WATCH  {datetime.now().strftime('%H:%M:%S')}  "
+                 f"(every {watcher.interval}s, window {window / 60:.1f} min)")
+    summary = watcher.series.summary()
+    print(f"\n  {'Metric':<14}{'Current':>14}{'Average':>14}{'Min':>14}{'Max':>14}")
+    for name, label, unit in WATCH_ROWS:
+        stats = summary.get(name)
+        if stats is None:
+            continue
+        cells = [format_watch_value(stats[k], unit) for k in ('current', 'mean', 'min', 'max')]
+        print(f"  {label:<14}" + "".join(f"{cell:>14}" for cell in cells))
+    print("\n  Press Ctrl+C to stop.")
+
+
+def run_watch(args):
+    """Sample all collectors every interval and keep a refreshing console view"""
+    from diagnostics.watch import DiagnosticsWatcher
+
+    interval = Config.CHECK_INTERVAL if args.interval is None else args.interval
+    watcher = DiagnosticsWatcher(interval=interval, history=args.history)
+    watcher.run(on_sample=None if args.quiet else display_watch)
+
+
+def run_exporter(args):
+    """Serve cached host readings as Prometheus metrics until interrupted"""
+    try:
+        from diagnostics.exporter import serve
+    except ImportError:
+        print_colored("✗ --serve-metrics requires prometheus_client (pip install prometheus_client)",
+                      Fore.RED if COLORS_AVAILABLE else None)
+        return 1
+    from diagnostics.host_sampler import HostSampler
+
+    interval = Config.HOST_SAMPLE_INTERVAL if args.interval is None else args.interval
+    sampler = serve(args.serve_metrics, addr=args.bind, sampler=HostSampler(interval=interval))
+    print_colored(f"Serving host metrics on http://{args.bind}:{args.serve_metrics}/metrics "
+                  f"(sampling every {sampler.interval}s)", Fore.CYAN if COLORS_AVAILABLE else None)
+    try:
+        while True:
+            time.sleep(3600)
+    finally:
+        sampler.stop()
 
 
 def save_report(data, report_type):
-    """Save diagnostic report to file"""
-    Config.ensure_directories()
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = Config.REPORT_DIR / f"{report_type}_report_{timestamp}.json"
-    
-    with open(filename, 'w') as f:
-        json.dump(data, f, indent=2)
-    
-    return filename
+    """Append a diagnostic report to the report store; returns the segment file"""
+    from diagnostics.report_store import ReportStore
+
+    return ReportStore().append(report_type, data)
+
+
+def run_report_query(args):
+    """Print stored reports (or one metric from them) in a time range"""
+    from diagnostics.report_store import ReportStore, metric_value, parse_since
+
+    try:
+        since = parse_since(args.since) if args.since else None
+        until = parse_since(args.until) if args.until else None
+    except ValueError as e:
+        print_colored(f"✗ {e}", Fore.RED if COLORS_AVAILABLE else None)
+        return 1
+
+    count = 0
+    for record in ReportStore(args.dir).query(since, until, args.type):
+        if args.metric is None:
+            print(json.dumps(record, separators=(',', ':')))
+            count += 1
+            continue
+        value = metric_value(record, args.metric)
+        if value is None:
+            continue
+        when = datetime.fromtimestamp(record['ts']).isoformat(timespec='seconds')
+        print(f"{when}  {record['type']:<24}{json.dumps(value) if isinstance(value, (dict, list)) else value}")
+        count += 1
+    if count == 0 and not args.quiet:
+        print_colored("No reports in range", Fore.YELLOW if COLORS_AVAILABLE else None)
+    return 0
 
 
 def run_diagnostics(args):
-    """Run the requested diagnostics"""
-    results = {}
-    
+    """Run the requested diagnostics concurrently and display them in order"""
+    # Imported here so --help/--version don't pay for psutil and the collectors.
+    from diagnostics import SystemDiagnostics, NetworkDiagnostics, PerformanceMonitor
+    from diagnostics.runner import run_checks
+
+    collectors = {}
     if args.system or args.all:
-        print_colored("\nRunning system diagnostics...", Fore.CYAN if COLORS_AVAILABLE else None)
-        sys_diag = SystemDiagnostics()
-        system_results = sys_diag.run_full_diagnostic()
-        results['system'] = system_results
-        
-        if not args.quiet:
-            display_system_diagnostics(system_results)
-    
+        collectors['system'] = (SystemDiagnostics, display_system_diagnostics)
     if args.network or args.all:
-        print_colored("\nRunning network diagnostics...", Fore.CYAN if COLORS_AVAILABLE else None)
-        net_diag = NetworkDiagnostics()
-        network_results = net_diag.run_full_diagnostic()
-        results['network'] = network_results
-        
-        if not args.quiet:
-            display_network_diagnostics(network_results)
-    
+        collectors['network'] = (NetworkDiagnostics, display_network_diagnostics)
     if args.performance or args.all:
-        print_colored("\nRunning performance diagnostics...", Fore.CYAN if COLORS_AVAILABLE else None)
-        perf_mon = PerformanceMonitor()
-        performance_results = perf_mon.run_full_diagnostic()
-        results['performance'] = performance_results
-        
-        if not args.quiet:
-            display_performance_diagnostics(performance_results)
+        collectors['performance'] = (PerformanceMonitor, display_performance_diagnostics)
+    
+    print_colored(f"\nRunning {', '.join(collectors)} diagnostics...", Fore.CYAN if COLORS_AVAILABLE else None)
+    results, durations = run_checks(
+        {name: cls().run_full_diagnostic for name, (cls, _) in collectors.items()},
+        timeouts={}, default_timeout=Config.COLLECTOR_TIMEOUT
+    )
+    
+    if not args.quiet:
+        for name, (_, display) in collectors.items():
+            if check_ok(results, name):
+                display(results[name])
+        timings = ", ".join(f"{name} {seconds:.2f}s" for name, seconds in durations.items())
+        print_colored(f"\nCollector durations: {timings}", Fore.CYAN if COLORS_AVAILABLE else None)
     
     # Save report if requested
     if args.save and results:
-        report_type = "full" if args.all else "_".join([k for k in results.keys()])
-        filename = save_report(results, report_type)
-        print_colored(f"\n✓ Report saved to: {filename}", Fore.GREEN if COLORS_AVAILABLE else None)
+        report_type = "full" if args.all else "_".join(collectors)
+        filename = save_report({**results, 'durations': durations}, report_type)
+        print_colored(f"\n✓ Report appended to: {filename}", Fore.GREEN if COLORS_AVAILABLE else None)
     
     return results
 
@@ -215,14 +381,57 @@ def main():
                        help='Run performance diagnostics')
     parser.add_argument('-a', '--all', action='store_true',
                        help='Run all diagnostics')
+    parser.add_argument('-w', '--watch', action='store_true',
+                       help='Monitor continuously with a refreshing view')
+    parser.add_argument('--interval', type=float, default=None,
+                       help=f'Seconds between samples (default: {Config.CHECK_INTERVAL} in watch mode, '
+                            f'{Config.HOST_SAMPLE_INTERVAL} in exporter mode)')
+    parser.add_argument('--history', type=int, default=Config.WATCH_HISTORY,
+                       help=f'Samples kept per metric in watch mode (default: {Config.WATCH_HISTORY})')
+    parser.add_argument('--serve-metrics', type=int, metavar='PORT',
+                       help='Serve host metrics for Prometheus on PORT (sampled every --interval seconds)')
+    parser.add_argument('--bind', default='0.0.0.0',
+                       help='Address for --serve-metrics (default: 0.0.0.0)')
     
     # Output options
     parser.add_argument('--save', action='store_true',
-                       help='Save diagnostic report to file')
+                       help='Append the diagnostic report to the report store')
     parser.add_argument('-q', '--quiet', action='store_true',
                        help='Suppress console output')
     
+    # Stored reports: main.py report query --since 24h --metric system.cpu.cpu_percent
+    commands = parser.add_subparsers(dest='command', metavar='{report}')
+    report = commands.add_parser('report', help='Query saved reports')
+    report_commands = report.add_subparsers(dest='report_command', metavar='{query}', required=True)
+    query = report_commands.add_parser('query', help='Print saved reports in a time range')
+    query.add_argument('--since', help='Start of the range: 30m, 24h, 7d or an ISO date/time')
+    query.add_argument('--until', help='End of the range (same formats as --since)')
+    query.add_argument('--metric', help='Dotted path to print, e.g. system.cpu.cpu_percent')
+    query.add_argument('--type', help='Only reports of this type, e.g. full or system_network')
+    query.add_argument('--dir', default=None, help=f'Report directory (default: {Config.REPORT_DIR})')
+    
     args = parser.parse_args()
+    if args.interval is not None and not args.interval > 0:  # also rejects nan
+        parser.error('--interval must be greater than 0')
+    if args.history < 2:
+        parser.error('--history must be at least 2')
+    
+    if args.command == 'report':
+        return run_report_query(args)
+    
+    if args.serve_metrics is not None:
+        try:
+            return run_exporter(args)
+        except KeyboardInterrupt:
+            print_colored("\n✓ Exporter stopped", Fore.GREEN if COLORS_AVAILABLE else None)
+        return 0
+    
+    if args.watch:
+        try:
+            run_watch(args)
+        except KeyboardInterrupt:
+            print_colored("\n✓ Watch stopped", Fore.GREEN if COLORS_AVAILABLE else None)
+        return 0
     
     # If no specific diagnostic is selected, show help
     if not (args.system or args.network or args.performance or args.all):
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""Compare response serialization latency before and after the fast JSON path.
+
+Two paths are timed against the real knowledge base:
+
+- search: the previous /search/by-symptoms path (validated pydantic models,
+  then FastAPI's response-model validation and JSON dump) vs. the current one
+  (plain dicts rendered by FastJSONResponse). model_construct() is not an
+  improvement here: with pydantic 2 it runs in Python and is slower than
+  validation, which runs in pydantic-core.
+- render: jsonable_encoder + Starlette's stdlib JSONResponse (FastAPI's
+  default for dict returns) vs. FastJSONResponse returned directly, as the
+  rules endpoints now do.
+
+Usage: python3 scripts/bench_json_response.py --iterations 2000
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+
+from backend.responses import ORJSON_AVAILABLE, FastJSONResponse  # noqa: E402
+from backend.services.knowledge_base import get_knowledge_base  # noqa: E402
+from backend.services.symptom_search import (  # noqa: E402
+    DiagnosisMatch, SymptomSearchRequest, SymptomSearchResponse, search_by_symptoms,
+)
+
+
+def percentiles(samples):
+    ordered = sorted(samples)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    return statistics.median(ordered) * 1e6, p99 * 1e6
+
+
+def timed(fn, iterations):
+    for _ in range(min(50, iterations)):
+        fn()
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return percentiles(samples)
+
+
+def search_paths(symptoms):
+    response = asyncio.run(search_by_symptoms(SymptomSearchRequest(symptoms=symptoms)))
+    rows = json.loads(response.body)["results"]
+    adapter = TypeAdapter(SymptomSearchResponse)
+
+    def validated():
+        resp = SymptomSearchResponse(query_symptoms=symptoms, total_results=len(rows),
+                                     results=[DiagnosisMatch(**row) for row in rows])
+        adapter.dump_json(adapter.validate_python(resp))
+
+    def plain():
+        FastJSONResponse({"query_symptoms": symptoms, "total_results": len(rows),
+                          "results": [dict(row) for row in rows]})
+
+    return validated, plain
+
+
+def render_paths(payload):
+    def stdlib():
+        JSONResponse(jsonable_encoder(payload))
+
+    def fast():
+        FastJSONResponse(payload)
+
+    return stdlib, fast
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--symptoms", nargs="+", default=["chest pain", "shortness of breath", "fever"])
+    args = parser.parse_args()
+
+    if not ORJSON_AVAILABLE:
+        print("orjson is not installed: FastJSONResponse falls back to stdlib json", file=sys.stderr)
+
+    rules = get_knowledge_base().rules
+    largest = max(rules.files, key=lambda name: len(rules.files[name].rules))
+    cases = [("search " + "+".join(args.symptoms), *search_paths(args.symptoms))]
+    cases.append((f"render family {largest}", *render_paths(rules.files[largest].to_dict())))
+    cases.append(("render rules search", *render_paths(rules.search("pain"))))
+
+    print(f"{'case':<45} {'before p50':>11} {'p99':>9} {'after p50':>11} {'p99':>9}  (µs)")
+    for name, before, after in cases:
+        b50, b99 = timed(before, args.iterations)
+        a50, a99 = timed(after, args.iterations)
+        print(f"{name:<45} {b50:>11.1f} {b99:>9.1f} {a50:>11.1f} {a99:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
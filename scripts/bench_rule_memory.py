@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Measure per-rule memory of raw YAML dicts vs. the compact rule store.
+
+Synthetic rules reuse ICD-10 codes, presentation phrases and family names the
+way the real rule files do. Every string is rebuilt per rule so the raw
+baseline matches what yaml.safe_load produces (no accidental sharing).
+
+Usage: python3 scripts/bench_rule_memory.py --sizes 1000 10000 100000
+"""
+import argparse
+import gc
+import random
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from backend.services.rule_store import CodeTable, RuleFamily  # noqa: E402
+
+FAMILIES = ["cardiology", "neurology", "pulmonology", "endocrinology", "surgery",
+            "pediatrics", "geriatrics", "toxicology", "nephrology", "urology"]
+
+
+def _fresh(s):
+    # Force a new str object, as a YAML parser would.
+    return "".join(list(s))
+
+
+def synthetic_docs(n_rules, seed=1):
+    rnd = random.Random(seed)
+    codes = [f"{chr(65 + i % 26)}{i % 100:02d}.{i % 10}" for i in range(600)]
+    phrases = [f"presentation phrase {i} with common clinical wording" for i in range(2500)]
+    pearls = [f"clinical pearl {i}: check vitals and reassess" for i in range(400)]
+    per_family = max(1, n_rules // len(FAMILIES))
+    docs, made = [], 0
+    for fam in FAMILIES:
+        rules = []
+        for _ in range(per_family):
+            if made >= n_rules:
+                break
+            rule = {
+                "id": _fresh(f"{fam[:4].upper()}-{made}"),
+                "label": _fresh(f"Condition {made % 3000}"),
+                "presentations": [_fresh(p) for p in rnd.sample(phrases, rnd.randint(3, 8))],
+                "icd10": [_fresh(c) for c in rnd.sample(codes[:120], rnd.randint(1, 3))],
+                "snomed": [_fresh(str(100000 + made % 5000))],
+            }
+            if made % 7 == 0:
+                rule["clinical_pearls"] = [_fresh(p) for p in rnd.sample(pearls, 3)]
+            rules.append(rule)
+            made += 1
+        docs.append({"family": _fresh(fam), "version": _fresh("0.1.0"), "rules": rules})
+    return docs
+
+
+def measure(n_rules, compact):
+    gc.collect()
+    tracemalloc.start()
+    docs = synthetic_docs(n_rules)
+    held = docs
+    if compact:
+        table = CodeTable()
+        held = [RuleFamily(d["family"], d, table) for d in docs]
+        del docs
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del held
+    return current
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    args = parser.parse_args()
+
+    print(f"{'rules':>8} {'raw B/rule':>12} {'compact B/rule':>15} {'saving':>8}")
+    for n in args.sizes:
+        raw = measure(n, compact=False)
+        small = measure(n, compact=True)
+        print(f"{n:>8} {raw / n:>12.0f} {small / n:>15.0f} {1 - small / raw:>8.1%}")
+
+
+if __name__ == "__main__":
+    main()
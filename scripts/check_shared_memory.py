@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""Report how much of each gunicorn worker's memory is shared with the master.
+
+Reads /proc/<pid>/smaps_rollup (Linux) for the master and all its children.
+Run it against a preloaded deployment while scaling WEB_CONCURRENCY up: the
+private (unshared) memory per worker should stay flat, and the proportional
+set size (PSS) total should grow far slower than workers x RSS.
+
+Usage: python3 scripts/check_shared_memory.py --pid <gunicorn master pid> [--max-private-mb 40]
+"""
+import argparse
+import sys
+from pathlib import Path
+
+FIELDS = ("Rss", "Pss", "Shared_Clean", "Shared_Dirty", "Private_Clean", "Private_Dirty")
+
+
+def smaps_rollup(pid):
+    values = {}
+    for line in Path(f"/proc/{pid}/smaps_rollup").read_text().splitlines():
+        key, _, rest = line.partition(":")
+        if key in FIELDS:
+            values[key] = int(rest.split()[0])  # kB
+    return values
+
+
+def children(pid):
+    kids = []
+    for task in Path(f"/proc/{pid}/task").iterdir():
+        text = (task / "children").read_text().split()
+        kids.extend(int(k) for k in text)
+    return kids
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check copy-on-write sharing of gunicorn workers")
+    parser.add_argument("--pid", type=int, required=True, help="gunicorn master PID")
+    parser.add_argument("--max-private-mb", type=float, default=None,
+                        help="exit non-zero if any worker's private memory exceeds this")
+    args = parser.parse_args()
+
+    rows = [("master", args.pid, smaps_rollup(args.pid))]
+    rows += [("worker", pid, smaps_rollup(pid)) for pid in children(args.pid)]
+
+    print(f"{'role':<7} {'pid':>7} {'rss MB':>8} {'pss MB':>8} {'shared MB':>10} {'private MB':>11}")
+    worst = 0.0
+    for role, pid, m in rows:
+        shared = (m["Shared_Clean"] + m["Shared_Dirty"]) / 1024
+        private = (m["Private_Clean"] + m["Private_Dirty"]) / 1024
+        if role == "worker":
+            worst = max(worst, private)
+        print(f"{role:<7} {pid:>7} {m['Rss'] / 1024:>8.1f} {m['Pss'] / 1024:>8.1f} {shared:>10.1f} {private:>11.1f}")
+    total_pss = sum(m["Pss"] for _, _, m in rows) / 1024
+    print(f"\nworkers: {len(rows) - 1}  total PSS: {total_pss:.1f} MB  worst private: {worst:.1f} MB")
+
+    if args.max_private_mb is not None and worst > args.max_private_mb:
+        print(f"FAIL: worker private memory {worst:.1f} MB > {args.max_private_mb} MB")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+"""
+Tests for admission control and load shedding
+"""
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from backend.admission import AdmissionMiddleware, AdmissionRejected, ConcurrencyLimiter, route_class
+
+
+def test_route_classes():
+    assert route_class("/search/by-symptoms") == "search"
+    assert route_class("/rules/search") == "search"
+    assert route_class("/diagnostic/evaluate/chest_pain") == "evaluate"
+    assert route_class("/reference/_all") == "read"
+    assert route_class("/health") is None
+    assert route_class("/health/version") is None
+    assert route_class("/metrics") is None
+
+
+def test_limiter_queues_then_sheds():
+    async def run():
+        limiter = ConcurrencyLimiter("test", limit=1, queue=1, queue_timeout=5)
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        with pytest.raises(AdmissionRejected) as exc:
+            await limiter.acquire()
+        assert exc.value.reason == "queue_full"
+        limiter.release()
+        await waiter  # slot handed to the queued request
+        assert limiter.active == 1
+        limiter.release()
+        assert limiter.active == 0
+
+    asyncio.run(run())
+
+
+def test_limiter_queue_timeout():
+    async def run():
+        limiter = ConcurrencyLimiter("test", limit=1, queue=4, queue_timeout=0.01)
+        await limiter.acquire()
+        with pytest.raises(AdmissionRejected) as exc:
+            await limiter.acquire()
+        assert exc.value.reason == "queue_timeout"
+        limiter.release()
+        assert limiter.active == 0
+
+    asyncio.run(run())
+
+
+def test_overload_returns_503_and_health_stays_up():
+    app = FastAPI()
+    release = asyncio.Event()
+
+    @app.post("/search/by-symptoms")
+    async def search():
+        await release.wait()
+        return {"ok": True}
+
+    @app.get("/health")
+    async def health():
+        return {"ok": True}
+
+    limiters = {"search": ConcurrencyLimiter("search", limit=1, queue=0)}
+    app.add_middleware(AdmissionMiddleware, limiters=limiters)
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            busy = asyncio.create_task(client.post("/search/by-symptoms"))
+            await asyncio.sleep(0.05)
+            shed = await client.post("/search/by-symptoms")
+            assert shed.status_code == 503
+            assert shed.headers["retry-after"]
+            assert (await client.get("/health")).status_code == 200
+            release.set()
+            assert (await busy).status_code == 200
+
+    asyncio.run(run())
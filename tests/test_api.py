@@ -1,3 +1,6 @@
+import json
+import time
+
 import pytest
 from fastapi.testclient import TestClient
 
@@ -30,3 +33,239 @@ def test_version_endpoint():
     j = r.json()
     assert j["app"] == Config.APP_NAME
     assert j["version"] == Config.APP_VERSION
+
+
+def test_metrics_labels_requests_by_route_template():
+    client.post("/diagnostic/evaluate/CARD-SYNCOPE", json={})
+    r = client.get("/metrics")
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/plain")
+    assert 'realdiag_request_duration_seconds_count{method="POST",route="/diagnostic/evaluate/{tree_id}"}' in r.text
+    assert "CARD-SYNCOPE" not in r.text
+
+
+def test_metrics_fold_unknown_methods_into_other():
+    client.request("BREW", "/health")
+    client.request("X-RANDOM-1234", "/health")
+    r = client.get("/metrics")
+    assert 'method="other"' in r.text
+    assert "BREW" not in r.text and "X-RANDOM-1234" not in r.text
+
+
+def test_reference_bulk_matches_per_family_endpoint():
+    r = client.get("/reference?families=neurology,cardiology")
+    assert r.status_code == 200
+    families = r.json()["families"]
+    assert list(families) == ["neurology", "cardiology"]
+    assert families["cardiology"] == client.get("/reference/cardiology").json()
+    assert client.get("/reference?families=neurology,nope").status_code == 404
+
+
+def test_reference_stream_uses_snapshot_resolved_before_headers(monkeypatch):
+    from types import SimpleNamespace
+    from backend.services import knowledge_base, reference_router
+
+    kb = knowledge_base.get_knowledge_base()
+    response = reference_router._bulk_response(["neurology"], kb)
+    # A reload after the headers went out must not change or break the body.
+    reloaded = SimpleNamespace(version="reloaded", rules=SimpleNamespace(files={}))
+    monkeypatch.setattr(knowledge_base, "_kb", reloaded)
+    body = b"".join(reference_router._stream_families(kb, ["neurology"]))
+    assert response.status_code == 200
+    assert json.loads(body)["families"]["neurology"]["count"] == len(kb.rules.files["neurology"].rules)
+
+
+def test_reference_all_returns_every_family():
+    families = client.get("/reference/_all").json()["families"]
+    assert "endocrinology" in families and len(families) > 1
+
+
+def test_symptom_search_response_matches_schema():
+    from backend.services.symptom_search import SymptomSearchResponse
+
+    resp = client.post('/search/by-symptoms', json={"symptoms": ["chest pain", "fever"]})
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/json"
+    body = SymptomSearchResponse.model_validate(resp.json())
+    assert body.total_results == len(body.results) > 0
+    assert [r.match_score for r in body.results] == sorted((r.match_score for r in body.results), reverse=True)
+
+
+def test_readiness_waits_for_warmup():
+    import asyncio
+    from backend.readiness import Readiness, prepare
+
+    state = Readiness()
+    assert not state.ready
+    asyncio.run(prepare(state, warmup=True))
+    assert state.ready and state.warmup_seconds is not None
+
+    assert client.get('/health/live').json() == {"ok": True}
+    with TestClient(app) as started:
+        for _ in range(100):
+            resp = started.get('/health/ready')
+            if resp.status_code == 200:
+                break
+            time.sleep(0.05)
+        assert resp.status_code == 200
+        assert resp.json()["phase"] == "ready"
+
+
+def test_readiness_waits_for_every_live_worker(tmp_path):
+    import os
+    import subprocess
+    import sys
+    from backend.readiness import Readiness
+
+    state = Readiness(tmp_path, expected_workers=2)
+    state.phase = "ready"
+    assert (tmp_path / str(os.getpid())).read_text() == "ready"
+    # A cold sibling, and a ready one that has since died, do not count.
+    sibling = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+    dead = subprocess.Popen([sys.executable, "-c", "pass"])
+    dead.wait()
+    try:
+        (tmp_path / str(sibling.pid)).write_text("warming")
+        (tmp_path / str(dead.pid)).write_text("ready")
+        assert not state.host_ready()
+        assert state.to_dict()["workers_ready"] == 1
+
+        (tmp_path / str(sibling.pid)).write_text("ready")
+        assert state.host_ready() and state.to_dict()["ready"]
+    finally:
+        sibling.kill()
+        sibling.wait()
+
+
+def test_host_diagnostics_require_admin_token(monkeypatch):
+    monkeypatch.setenv("REALDIAG_ADMIN_TOKEN", "s3cret")
+    for path in ('/diagnostics/system', '/diagnostics/network', '/diagnostics/performance',
+                 '/diagnostics/stream'):
+        assert client.get(path).status_code == 401
+
+
+def test_host_diagnostics_served_from_shared_snapshot(monkeypatch, tmp_path):
+    from backend.services import host_router
+
+    # Keep the background thread out of the way so sample counts are deterministic.
+    monkeypatch.setattr(host_router, "HOST_SAMPLE_INTERVAL", 60.0)
+    monkeypatch.setattr(host_router, "HOST_STATE_DIR", tmp_path)
+    monkeypatch.setenv("REALDIAG_ADMIN_TOKEN", "s3cret")
+    client.headers["Authorization"] = "Bearer s3cret"
+    host_router.stop_sampler()
+    first = client.get('/diagnostics/system')
+    assert first.status_code == 200
+    body = first.json()
+    assert {"cpu", "memory", "disk", "mounts", "disk_io", "age_seconds"} <= body.keys()
+    assert body["cpu"]["status"] in ("OK", "WARNING")
+
+    # Tight loop: every call reads the same cached sample, no psutil work per request.
+    sampler = host_router._sampler
+    samples = sampler.samples
+    for path in ('/diagnostics/system', '/diagnostics/network', '/diagnostics/performance') * 20:
+        assert client.get(path).status_code == 200
+    assert sampler.samples == samples
+    assert "interface_counters" not in client.get('/diagnostics/network').json()
+    assert "top_processes" in client.get('/diagnostics/performance').json()
+
+    # Older than the max age: refreshed once, off the event loop.
+    monkeypatch.setattr(host_router, "HOST_MAX_AGE", 0.0)
+    refreshed = client.get('/diagnostics/system').json()
+    assert sampler.samples == samples + 1
+    assert refreshed["timestamp"] > body["timestamp"]
+    # Every sample is published for the host's other workers
+    assert json.loads((tmp_path / "snapshot.json").read_text())["timestamp"] == sampler.snapshot()["timestamp"]
+    del client.headers["Authorization"]
+    host_router.stop_sampler()
+
+
+def test_host_snapshot_is_sampled_by_one_process_per_host(monkeypatch, tmp_path):
+    import asyncio
+    import subprocess
+    import sys
+    from backend.services import host_router
+
+    monkeypatch.setattr(host_router, "HOST_STATE_DIR", tmp_path)
+    host_router.stop_sampler()
+    # Another worker holds the sampling lock and has published a snapshot.
+    holder = subprocess.Popen([sys.executable, "-c", (
+        "import fcntl, sys, time; f = open(sys.argv[1], 'a'); fcntl.flock(f, fcntl.LOCK_EX);"
+        "print('locked', flush=True); time.sleep(30)"), str(tmp_path / "sampler.lock")],
+        stdout=subprocess.PIPE, text=True)
+    try:
+        assert holder.stdout.readline().strip() == "locked"
+        published = {"timestamp": time.time(), "system": {"cpu": {"cpu_percent": 1.0}},
+                     "network": {}, "performance": {}}
+        (tmp_path / "snapshot.json").write_text(json.dumps(published))
+
+        assert asyncio.run(host_router.get_snapshot()) == published
+        assert host_router._sampler is None
+
+        # The sampling worker dies: its lock goes with it and this worker takes over.
+        holder.kill()
+        holder.wait()
+        published["timestamp"] -= 3600
+        (tmp_path / "snapshot.json").write_text(json.dumps(published))
+        monkeypatch.setattr(host_router, "HOST_SAMPLE_INTERVAL", 60.0)
+        taken_over = asyncio.run(host_router.get_snapshot())
+        assert host_router._sampler is not None
+        assert taken_over["timestamp"] > published["timestamp"]
+    finally:
+        holder.kill()
+        host_router.stop_sampler()
+
+
+def test_host_stream_does_not_outpace_background_sampler(monkeypatch):
+    import asyncio
+    from backend.services import host_router, host_stream
+
+    ages = []
+
+    async def snapshot(max_age=None):
+        ages.append(max_age)
+        return {"timestamp": 1.0, "system": {}, "network": {}, "performance": {}}
+
+    monkeypatch.setattr(host_router, "HOST_SAMPLE_INTERVAL", 5.0)
+    monkeypatch.setattr(host_stream, "get_snapshot", snapshot)
+
+    async def run():
+        mailbox = host_stream.LatestFrame()
+        task = asyncio.create_task(host_stream.produce(mailbox, 0.01, None))
+        await asyncio.sleep(0.1)
+        task.cancel()
+        return mailbox
+
+    mailbox = asyncio.run(run())
+    assert len(ages) > 2 and min(ages) >= 5.0
+    # The snapshot never changed: one frame, not one per poll.
+    assert mailbox.dropped == 0
+
+
+def test_host_stream_sends_deltas_and_drops_stale_frames():
+    import asyncio
+    from backend.admission import route_class
+    from backend.services.host_stream import LatestFrame, events
+
+    async def run():
+        mailbox = LatestFrame()
+        stream = events(mailbox, lambda _: asyncio.sleep(3600), heartbeat=0.05)
+        mailbox.put((1.0, {"cpu.percent": 10.0, "memory.percent": 50.0, "net.eth1.bytes_sent_per_s": 5.0}))
+        first = await stream.__anext__()
+
+        # A slow client: frame 2 is overwritten by frame 3 before it is read.
+        mailbox.put((2.0, {"cpu.percent": 90.0, "memory.percent": 50.0, "net.eth1.bytes_sent_per_s": 5.0}))
+        mailbox.put((3.0, {"cpu.percent": 20.0, "memory.percent": 50.0}))
+        second = await stream.__anext__()
+        heartbeat = await stream.__anext__()
+        await stream.aclose()
+        return first, second, heartbeat, mailbox.dropped
+
+    first, second, heartbeat, dropped = asyncio.run(run())
+    assert first.startswith(b"event: snapshot\nid: 1\n")
+    assert b'"memory.percent":50.0' in first
+    # Delta against what the client received: unchanged memory is not resent.
+    assert second == (b'event: delta\nid: 2\ndata: {"t":3.0,"set":{"cpu.percent":20.0},'
+                      b'"del":["net.eth1.bytes_sent_per_s"]}\n\n')
+    assert heartbeat == b": keep-alive\n\n"
+    assert dropped == 1
+    assert route_class("/diagnostics/stream") == "stream"
@@ -0,0 +1,63 @@
+"""
+Unit tests for the host sampler and Prometheus exporter
+"""
+
+import unittest
+from unittest import mock
+from prometheus_client import CollectorRegistry, generate_latest
+from diagnostics.exporter import HostCollector
+from diagnostics.host_sampler import HostSampler
+
+
+class TestHostExporter(unittest.TestCase):
+    """Test cases for HostSampler and HostCollector"""
+    
+    @classmethod
+    def setUpClass(cls):
+        """Start one sampler for all tests"""
+        cls.sampler = HostSampler(interval=60).start()
+        cls.registry = CollectorRegistry()
+        cls.registry.register(HostCollector(cls.sampler))
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Stop the sampler"""
+        cls.sampler.stop()
+    
+    def test_snapshot_is_available_after_start(self):
+        """Test that start() publishes a first snapshot"""
+        snapshot = self.sampler.snapshot()
+        
+        self.assertIsNotNone(snapshot)
+        self.assertIn('cpu', snapshot['system'])
+        self.assertIn('interface_rates', snapshot['network'])
+        self.assertIn('top_processes', snapshot['performance'])
+        self.assertLess(self.sampler.age(), 60)
+    
+    def test_scrape_reads_cache_without_sampling(self):
+        """Test that a scrape never calls into psutil"""
+        with mock.patch('psutil.cpu_times', side_effect=AssertionError('sampled on scrape')), \
+                mock.patch('psutil.pids', side_effect=AssertionError('process walk on scrape')), \
+                mock.patch('psutil.net_io_counters', side_effect=AssertionError('sampled on scrape')):
+            output = generate_latest(self.registry).decode()
+        
+        self.assertIn('realdiag_host_cpu_percent ', output)
+        self.assertIn('realdiag_host_memory_percent ', output)
+        self.assertIn('realdiag_host_filesystem_used_percent{', output)
+        self.assertIn('realdiag_host_network_bytes_total{direction="recv",interface="lo"}', output)
+        self.assertIn('realdiag_host_cpu_seconds_total{mode="user"}', output)
+        self.assertIn('realdiag_host_sample_age_seconds ', output)
+    
+    def test_failed_check_is_skipped(self):
+        """Test that a check that errored in the runner is left out, not raised"""
+        snapshot = dict(self.sampler.snapshot())
+        snapshot['system'] = dict(snapshot['system'], memory={'status': 'ERROR', 'error': 'boom'})
+        with mock.patch.object(self.sampler, 'snapshot', return_value=snapshot):
+            output = generate_latest(self.registry).decode()
+        
+        self.assertNotIn('realdiag_host_memory_percent ', output)
+        self.assertIn('realdiag_host_cpu_percent ', output)
+
+
+if __name__ == '__main__':
+    unittest.main()
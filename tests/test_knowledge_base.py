@@ -0,0 +1,101 @@
+"""
+Tests for the shared knowledge base used by the API routers
+"""
+import gc
+import threading
+
+import pytest
+
+from backend.services.knowledge_base import freeze_for_fork, get_knowledge_base
+
+
+def test_knowledge_base_is_shared():
+    kb = get_knowledge_base()
+    assert get_knowledge_base() is kb
+    assert kb.rules.files and kb.trees.trees
+
+
+def test_freeze_for_fork_moves_objects_to_permanent_generation():
+    try:
+        freeze_for_fork()
+        assert gc.get_freeze_count() > 0
+    finally:
+        gc.unfreeze()
+
+
+def test_admin_reload_requires_token(monkeypatch):
+    from fastapi.testclient import TestClient
+    from backend.main import app
+
+    client = TestClient(app)
+    monkeypatch.delenv("REALDIAG_ADMIN_TOKEN", raising=False)
+    assert client.post("/admin/reload").status_code == 403
+    monkeypatch.setenv("REALDIAG_ADMIN_TOKEN", "s3cret")
+    assert client.post("/admin/reload", headers={"Authorization": "Bearer wrong"}).status_code == 401
+
+
+def test_admin_reload_swaps_and_publishes(monkeypatch, tmp_path):
+    from fastapi.testclient import TestClient
+    from backend.main import app
+    from backend.services import knowledge_base
+
+    monkeypatch.setattr(knowledge_base, "KB_STATE_DIR", tmp_path)
+    monkeypatch.setenv("REALDIAG_ADMIN_TOKEN", "s3cret")
+    client = TestClient(app)
+    before = get_knowledge_base()
+
+    r = client.post("/admin/reload", headers={"Authorization": "Bearer s3cret"})
+    assert r.status_code == 200
+    assert r.json()["version"] == before.version
+    assert (tmp_path / "kb-version").read_text() == before.version
+    assert client.get("/health/version").json()["kb_version"] == before.version
+
+
+def test_rejected_reload_keeps_current_snapshot(monkeypatch, tmp_path):
+    from backend.services import knowledge_base
+
+    monkeypatch.setattr(knowledge_base, "KB_STATE_DIR", tmp_path)
+    before = get_knowledge_base()
+
+    def broken(self):
+        raise ValueError("bad tree")
+
+    monkeypatch.setattr(knowledge_base.KnowledgeBase, "validate", broken)
+    with pytest.raises(ValueError):
+        knowledge_base.reload_knowledge_base()
+    assert get_knowledge_base() is before
+
+
+def test_watcher_catches_up_with_version_published_before_start(monkeypatch, tmp_path):
+    from backend.services import knowledge_base
+
+    monkeypatch.setattr(knowledge_base, "KB_STATE_DIR", tmp_path)
+    knowledge_base._publish_version("newer-than-this-worker")
+    reloaded = threading.Event()
+    monkeypatch.setattr(knowledge_base, "reload_knowledge_base", lambda publish: reloaded.set())
+
+    watcher = knowledge_base.KnowledgeBaseWatcher(interval=0.01, watch_files=False)
+    watcher.start()
+    try:
+        assert reloaded.wait(2)
+    finally:
+        watcher.stop()
+        watcher.join()
+
+
+def test_gunicorn_master_freezes_once_then_collects(tmp_path):
+    import os
+    import subprocess
+    import sys
+
+    code = (
+        "import gc, runpy; conf = runpy.run_path('backend/gunicorn_conf.py');"
+        "assert not gc.isenabled(); conf['when_ready'](None);"
+        "assert gc.isenabled() and gc.get_freeze_count() > 0;"
+        "assert 'pre_fork' not in conf; print('ok')"
+    )
+    env = {**os.environ, "REALDIAG_PRELOAD": "1", "REALDIAG_WARMUP": "0",
+           "PROMETHEUS_MULTIPROC_DIR": str(tmp_path / "metrics"), "REALDIAG_READY_DIR": str(tmp_path / "ready")}
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=env,
+                         cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    assert out.stdout.strip() == "ok", out.stderr
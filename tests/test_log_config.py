@@ -0,0 +1,74 @@
+"""
+Tests for queue-based logging and access-log sampling
+"""
+import asyncio
+import io
+import json
+import logging
+import queue
+
+import httpx
+from fastapi import FastAPI
+
+from backend.log_config import AccessLogMiddleware, JSONFormatter, NonBlockingQueueHandler
+
+
+def test_json_formatter_includes_extra_fields():
+    record = logging.LogRecord("realdiag.test", logging.INFO, __file__, 1, "hello %s", ("world",), None)
+    record.status = 200
+    entry = json.loads(JSONFormatter().format(record))
+    assert entry["msg"] == "hello world"
+    assert entry["level"] == "INFO"
+    assert entry["status"] == 200
+
+
+def test_queue_handler_drops_when_full_instead_of_blocking():
+    handler = NonBlockingQueueHandler(queue.Queue(1))
+    logger = logging.getLogger("realdiag.test.queue")
+    logger.propagate = False
+    logger.addHandler(handler)
+    try:
+        logger.warning("first %d", 1)
+        logger.warning("second")
+    finally:
+        logger.removeHandler(handler)
+    record = handler.queue.get_nowait()
+    assert record.msg == "first 1" and record.args is None
+    assert handler.queue.empty()
+
+
+def test_access_log_samples_high_frequency_routes():
+    app = FastAPI()
+
+    @app.get("/health")
+    async def health():
+        return {"ok": True}
+
+    @app.get("/work")
+    async def work():
+        return {"ok": True}
+
+    app.add_middleware(AccessLogMiddleware, sample={"/health": 5})
+
+    stream = io.StringIO()
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(JSONFormatter())
+    access = logging.getLogger("realdiag.access")
+    access.addHandler(handler)
+    access.setLevel(logging.INFO)
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            for _ in range(10):
+                await client.get("/health")
+            await client.get("/work")
+
+    try:
+        asyncio.run(run())
+    finally:
+        access.removeHandler(handler)
+    entries = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [e["path"] for e in entries].count("/health") == 2
+    work = [e for e in entries if e["path"] == "/work"][0]
+    assert work["status"] == 200 and work["route"] == "/work" and "duration_ms" in work
@@ -0,0 +1,121 @@
+"""
+Tests for Prometheus multiprocess aggregation
+"""
+import os
+import subprocess
+import sys
+from pathlib import Path
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parents[1]
+
+WORKER = (
+    "from backend.metrics import REQUEST_COUNTER;"
+    "REQUEST_COUNTER.labels(path='/health', method='GET', status='200').inc()"
+)
+SCRAPE = "from backend.metrics import metrics_payload; print(metrics_payload()[0].decode())"
+
+
+def test_metrics_aggregate_across_worker_processes(tmp_path):
+    env = dict(os.environ, PROMETHEUS_MULTIPROC_DIR=str(tmp_path))
+    for _ in range(3):
+        subprocess.run([sys.executable, "-c", WORKER], cwd=ROOT, env=env, check=True)
+    out = subprocess.run([sys.executable, "-c", SCRAPE], cwd=ROOT, env=env, check=True,
+                         capture_output=True, text=True).stdout
+    assert 'realdiag_requests_total{method="GET",path="/health",status="200"} 3.0' in out
+
+
+def test_server_timing_header_reports_stages():
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from backend.stages import stage
+    from backend.timing import ServerTimingMiddleware
+
+    app = FastAPI()
+    app.add_middleware(ServerTimingMiddleware)
+
+    @app.get("/work")
+    def work():
+        with stage("score"):
+            pass
+        return {"ok": True}
+
+    header = TestClient(app).get("/work").headers["server-timing"]
+    assert header.startswith("score;dur=")
+    assert "total;dur=" in header
+
+
+def test_engines_do_not_import_the_web_stack():
+    import subprocess
+    import sys
+
+    code = ("import sys; import backend.services.rules_engine, backend.services.decision_tree_engine; "
+            "print(sorted(m for m in ('fastapi', 'starlette', 'prometheus_client') if m in sys.modules))")
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert out.strip() == "[]"
+
+
+def test_stage_is_noop_outside_a_timed_request():
+    from backend.stages import stage
+
+    assert stage("a") is stage("b")
+
+
+def test_saturation_metrics_sampled_by_loop_monitor():
+    import asyncio
+    import gc
+    from prometheus_client import generate_latest
+    from backend.runtime_metrics import install_gc_metrics, monitor_event_loop
+
+    async def run():
+        task = asyncio.create_task(monitor_event_loop(0.01))
+        await asyncio.sleep(0.05)
+        task.cancel()
+
+    install_gc_metrics()
+    gc.collect()
+    asyncio.run(run())
+    out = generate_latest().decode()
+    assert "realdiag_event_loop_lag_seconds_count" in out
+    assert "realdiag_worker_resident_memory_bytes" in out
+    assert "realdiag_threadpool_size 40.0" in out
+    assert 'realdiag_gc_collections_total{generation="2"}' in out
+
+
+def test_gc_callback_defers_metric_updates(monkeypatch):
+    from backend import runtime_metrics
+
+    def locked(*args):
+        raise AssertionError("metric touched inside gc callback")
+
+    before = runtime_metrics.GC_COLLECTIONS.labels("1")._value.get()
+    with monkeypatch.context() as m:
+        m.setattr(runtime_metrics.GC_COLLECTIONS, "labels", locked)
+        m.setattr(runtime_metrics.GC_PAUSE, "labels", locked)
+        runtime_metrics._gc_callback("start", {"generation": 1})
+        runtime_metrics._gc_callback("stop", {"generation": 1})
+    runtime_metrics.export_gc_metrics()
+    assert runtime_metrics.GC_COLLECTIONS.labels("1")._value.get() >= before + 1
+
+
+def test_host_network_metrics_exported():
+    import psutil
+    from prometheus_client import generate_latest
+    from backend.host_metrics import HOST_COLLECTOR
+    from backend.services import host_router
+
+    HOST_COLLECTOR.stop()
+    host_router.stop_sampler()
+    try:
+        with mock.patch("diagnostics.nic_rates.psutil.net_io_counters",
+                        wraps=psutil.net_io_counters) as counters:
+            out = generate_latest().decode()
+            generate_latest()
+        # One sample when the NIC timer starts; scrapes only read it
+        assert counters.call_count == 1
+    finally:
+        HOST_COLLECTOR.stop()
+    # Exporting NIC counters never starts the process/disk HostSampler
+    assert host_router._sampler is None
+    assert 'realdiag_host_network_bytes_total{direction="recv",interface="lo"}' in out
+    assert "# TYPE realdiag_host_network_utilization_percent gauge" in out
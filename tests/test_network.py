@@ -2,8 +2,12 @@
 Unit tests for network diagnostics module
 """
 
+import socket
 import unittest
+from types import SimpleNamespace
+from unittest import mock
 from diagnostics.network import NetworkDiagnostics
+from diagnostics.nic_rates import COUNTER_FIELDS, NicRateCollector
 
 
 class TestNetworkDiagnostics(unittest.TestCase):
@@ -31,6 +35,12 @@ class TestNetworkDiagnostics(unittest.TestCase):
             self.assertEqual(result['status'], 'Disconnected')
             self.assertIn('error', result)
     
+    def test_check_connectivity_keeps_default_timeout(self):
+        """Test that the connectivity check does not change the process-wide socket timeout"""
+        before = socket.getdefaulttimeout()
+        self.diag.check_connectivity()
+        self.assertEqual(socket.getdefaulttimeout(), before)
+    
     def test_get_network_interfaces(self):
         """Test getting network interfaces"""
         interfaces = self.diag.get_network_interfaces()
@@ -78,5 +88,61 @@ class TestNetworkDiagnostics(unittest.TestCase):
         self.assertIsNotNone(results['stats'])
 
 
+def _nic(**values):
+    return SimpleNamespace(**{field: values.get(field, 0) for field in COUNTER_FIELDS})
+
+
+class TestNicRateCollector(unittest.TestCase):
+    """Test cases for per-interface rates"""
+    
+    def _collect(self, samples, speed=1000):
+        """Feed (timestamp, {nic: counters}) samples through the collector"""
+        collector = NicRateCollector(windows=(10, 60), history=10)
+        stats = {'eth0': SimpleNamespace(isup=True, speed=speed)}
+        with mock.patch('psutil.net_if_stats', return_value=stats):
+            for timestamp, counters in samples:
+                with mock.patch('psutil.net_io_counters', return_value=counters):
+                    collector.sample(now=timestamp)
+        return collector.rates()
+    
+    def test_rates_over_sliding_windows(self):
+        """Test that each window uses the oldest sample inside it"""
+        rates = self._collect([
+            (0, {'eth0': _nic(bytes_recv=0)}),
+            (50, {'eth0': _nic(bytes_recv=50_000, errin=5)}),
+            (60, {'eth0': _nic(bytes_recv=60_000, errin=5, dropin=20)}),
+        ])
+        
+        eth0 = rates['eth0']
+        self.assertEqual(eth0['windows']['10s']['bytes_recv_per_s'], 1000.0)
+        self.assertEqual(eth0['windows']['10s']['drops_per_s'], 2.0)
+        self.assertEqual(eth0['windows']['10s']['errors_per_s'], 0.0)
+        self.assertEqual(eth0['windows']['60s']['seconds'], 60)
+        self.assertEqual(eth0['windows']['60s']['errors_per_s'], round(5 / 60, 3))
+        self.assertEqual(eth0['status'], 'OK')
+    
+    def test_saturation_against_link_speed(self):
+        """Test that an interface near its link speed is flagged"""
+        # 10 Mb/s link receiving 1.2 MB/s = 9.6 Mb/s
+        rates = self._collect([
+            (0, {'eth0': _nic()}),
+            (1, {'eth0': _nic(bytes_recv=1_200_000)}),
+        ], speed=10)
+        
+        self.assertEqual(rates['eth0']['utilization_percent'], 96.0)
+        self.assertTrue(rates['eth0']['saturated'])
+        self.assertEqual(rates['eth0']['status'], 'WARNING')
+    
+    def test_counter_reset_is_not_negative(self):
+        """Test that a counter reset does not produce a negative rate"""
+        rates = self._collect([
+            (0, {'eth0': _nic(bytes_sent=10_000)}),
+            (1, {'eth0': _nic(bytes_sent=500)}),
+        ], speed=0)
+        
+        self.assertEqual(rates['eth0']['windows']['10s']['bytes_sent_per_s'], 500.0)
+        self.assertIsNone(rates['eth0']['utilization_percent'])
+
+
 if __name__ == '__main__':
     unittest.main()
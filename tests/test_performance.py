@@ -2,8 +2,13 @@
 Unit tests for performance monitoring module
 """
 
+import os
+import subprocess
+import sys
+import time
 import unittest
 from diagnostics.performance import PerformanceMonitor
+from diagnostics.process_sampler import ProcessSampler
 
 
 class TestPerformanceMonitor(unittest.TestCase):
@@ -103,5 +108,44 @@ class TestPerformanceMonitor(unittest.TestCase):
         self.assertIsNotNone(results['load_average'])
 
 
+class TestProcessSampler(unittest.TestCase):
+    """Test cases for the incremental process sampler"""
+    
+    def test_cpu_percent_is_measured_after_priming(self):
+        """A busy process shows real CPU usage instead of psutil's first-call 0.0"""
+        sampler = ProcessSampler().prime(warmup=0)
+        deadline = time.perf_counter() + 0.3
+        while time.perf_counter() < deadline:
+            pass
+        
+        top = sampler.sample(limit=len(sampler) + 10)
+        own = next(p for p in top if p['pid'] == os.getpid())
+        self.assertGreater(own['cpu_percent'], 30)
+        self.assertEqual(top, sorted(top, key=lambda p: p['cpu_percent'], reverse=True))
+    
+    def test_process_objects_are_reused_and_pruned(self):
+        """Process objects survive between samples; exited PIDs are dropped"""
+        child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)'])
+        try:
+            sampler = ProcessSampler()
+            sampler.sample()
+            own = sampler._processes[os.getpid()]
+            self.assertIn(child.pid, sampler._processes)
+        finally:
+            child.kill()
+            child.wait()
+        
+        sampler.sample()
+        self.assertIs(sampler._processes[os.getpid()], own)
+        self.assertNotIn(child.pid, sampler._processes)
+    
+    def test_top_by_memory(self):
+        """Ranking by memory returns the largest resident processes first"""
+        top = ProcessSampler().sample(limit=3, by='memory_percent')
+        
+        self.assertLessEqual(len(top), 3)
+        self.assertEqual(top, sorted(top, key=lambda p: p['memory_percent'], reverse=True))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,117 @@
+"""
+Unit tests for the concurrent connectivity prober
+"""
+
+import asyncio
+import socket
+import time
+import unittest
+from unittest import mock
+from diagnostics.prober import parse_target, percentile, probe_targets, summarize
+
+
+def _listener():
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.bind(('127.0.0.1', 0))
+    sock.listen(64)
+    return sock
+
+
+def _closed_port():
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.bind(('127.0.0.1', 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+class TestProberHelpers(unittest.TestCase):
+    """Test cases for target parsing and statistics"""
+    
+    def test_parse_target(self):
+        """Test host:port parsing including bracketed IPv6"""
+        self.assertEqual(parse_target('example.com:443'), ('example.com', 443))
+        self.assertEqual(parse_target('[::1]:53'), ('::1', 53))
+        with self.assertRaises(ValueError):
+            parse_target('example.com')
+    
+    def test_percentile(self):
+        """Test nearest-rank percentiles"""
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile([7], 99), 7)
+        self.assertIsNone(percentile([], 50))
+    
+    def test_summarize_loss_and_jitter(self):
+        """Test loss, jitter and status from raw latencies"""
+        result = summarize('h:1', [0.010, 0.030, 0.020], attempts=4, error='refused')
+        
+        self.assertEqual(result['received'], 3)
+        self.assertEqual(result['loss_percent'], 25.0)
+        self.assertEqual(result['latency_ms']['min'], 10.0)
+        self.assertEqual(result['latency_ms']['max'], 30.0)
+        self.assertEqual(result['jitter_ms'], 15.0)
+        self.assertEqual(result['status'], 'WARNING')
+        self.assertEqual(result['error'], 'refused')
+        
+        self.assertEqual(summarize('h:1', [], attempts=3)['status'], 'FAIL')
+
+
+class TestProbeTargets(unittest.TestCase):
+    """Test cases for probing against local listeners"""
+    
+    def setUp(self):
+        """Open local stand-in listeners"""
+        self.listeners = [_listener() for _ in range(300)]
+        self.targets = [f"127.0.0.1:{s.getsockname()[1]}" for s in self.listeners]
+    
+    def tearDown(self):
+        """Close the listeners"""
+        for sock in self.listeners:
+            sock.close()
+    
+    def test_hundreds_of_targets_within_one_timeout(self):
+        """Test that targets are probed concurrently, not one after another"""
+        refused = f"127.0.0.1:{_closed_port()}"
+        timeout = 2.0
+        
+        start = time.perf_counter()
+        results = probe_targets(self.targets + [refused], attempts=3, timeout=timeout)
+        elapsed = time.perf_counter() - start
+        
+        self.assertLess(elapsed, timeout)
+        self.assertEqual([r['target'] for r in results], self.targets + [refused])
+        for result in results[:-1]:
+            self.assertTrue(result['reachable'])
+            self.assertEqual(result['received'], 3)
+            self.assertEqual(result['loss_percent'], 0.0)
+            self.assertIsNotNone(result['latency_ms']['p99'])
+        self.assertEqual(results[-1]['status'], 'FAIL')
+        self.assertEqual(results[-1]['loss_percent'], 100.0)
+        self.assertIn('error', results[-1])
+    
+    def test_blackholed_target_bounded_by_one_timeout(self):
+        """Test that all attempts at an unresponsive target fit in a single timeout"""
+        async def hang(host, port, timeout):
+            await asyncio.sleep(timeout)
+            raise asyncio.TimeoutError
+        
+        start = time.perf_counter()
+        with mock.patch('diagnostics.prober._connect', hang):
+            results = probe_targets(['192.0.2.1:53'], attempts=3, timeout=0.3)
+        
+        self.assertLess(time.perf_counter() - start, 0.6)
+        self.assertEqual(results[0]['status'], 'FAIL')
+        self.assertEqual(results[0]['loss_percent'], 100.0)
+    
+    def test_invalid_target_does_not_abort_run(self):
+        """Test that a malformed target is reported, not raised"""
+        results = probe_targets(['not-a-target', self.targets[0]], attempts=1, timeout=1)
+        
+        self.assertEqual(results[0]['status'], 'FAIL')
+        self.assertTrue(results[1]['reachable'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+"""
+Tests for the on-demand profiling helpers and /debug endpoints
+"""
+import threading
+import time
+
+from fastapi.testclient import TestClient
+
+from backend.main import app
+from backend.profiling import heap_diff, profile
+
+
+def _spin(stop):
+    while not stop.is_set():
+        sum(range(100))
+
+
+def test_profile_collects_collapsed_stacks_from_other_threads():
+    stop = threading.Event()
+    worker = threading.Thread(target=_spin, args=(stop,), name="spinner")
+    worker.start()
+    try:
+        sampler = profile(0.2, interval=0.002)
+    finally:
+        stop.set()
+        worker.join()
+    text = sampler.collapsed()
+    assert sampler.samples > 0
+    assert any(line.startswith("spinner;") and "_spin@test_profiling.py" in line for line in text.splitlines())
+
+
+def test_heap_diff_reports_allocation_growth():
+    held = []
+
+    def allocate():
+        time.sleep(0.05)
+        held.append([bytearray(1024) for _ in range(200)])
+
+    t = threading.Thread(target=allocate)
+    t.start()
+    result = heap_diff(0.2, top=5)
+    t.join()
+    assert result["top"] and result["top"][0]["size_diff"] > 0
+
+
+def test_debug_endpoints_require_admin_token(monkeypatch):
+    client = TestClient(app)
+    monkeypatch.setenv("REALDIAG_ADMIN_TOKEN", "s3cret")
+    assert client.get("/debug/profile?seconds=0.1").status_code == 401
+    r = client.get("/debug/profile?seconds=0.1", headers={"Authorization": "Bearer s3cret"})
+    assert r.status_code == 200
+    assert int(r.headers["x-profile-samples"]) > 0
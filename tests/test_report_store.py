@@ -0,0 +1,96 @@
+"""
+Unit tests for the append-only report store
+"""
+
+import gzip
+import json
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from diagnostics import report_store
+from diagnostics.report_store import ReportStore, metric_value, parse_since
+
+DAY = 86400
+
+
+class TestReportStore(unittest.TestCase):
+    """Test cases for ReportStore"""
+    
+    def setUp(self):
+        """Create an empty report directory"""
+        self.directory = tempfile.mkdtemp()
+        self.store = ReportStore(self.directory, segment_seconds=DAY, retention_days=30)
+    
+    def tearDown(self):
+        """Remove the report directory"""
+        shutil.rmtree(self.directory)
+    
+    def test_append_and_query_round_trip(self):
+        """Test that appended reports come back in order, filtered by time and type"""
+        for i in range(5):
+            self.store.append('system' if i % 2 else 'full', {'system': {'cpu': {'cpu_percent': i * 10}}},
+                              timestamp=1000 + i)
+        
+        records = list(self.store.query())
+        self.assertEqual([r['ts'] for r in records], [1000, 1001, 1002, 1003, 1004])
+        self.assertEqual(len(self.store.segments()), 1)
+        
+        self.assertEqual([r['ts'] for r in self.store.query(since=1002, until=1003)], [1002, 1003])
+        self.assertEqual([r['ts'] for r in self.store.query(record_type='system')], [1001, 1003])
+        self.assertEqual([metric_value(r, 'system.cpu.cpu_percent') for r in records], [0, 10, 20, 30, 40])
+    
+    def test_rollover_seals_segments_with_gzip(self):
+        """Test that an old active segment is gzipped and a new one started"""
+        self.store.append('full', {'n': 1}, timestamp=DAY)
+        self.store.append('full', {'n': 2}, timestamp=2.5 * DAY)
+        
+        first, second = [path for _, path in self.store.segments()]
+        self.assertTrue(first.name.endswith('.jsonl.gz'))
+        self.assertTrue(second.name.endswith('.jsonl'))
+        with gzip.open(first, 'rt') as f:
+            self.assertEqual(json.loads(f.readline())['data'], {'n': 1})
+        self.assertEqual([r['data']['n'] for r in self.store.query()], [1, 2])
+    
+    def test_rollover_on_size(self):
+        """Test that a segment past the size limit is sealed"""
+        store = ReportStore(self.directory, segment_bytes=200, segment_seconds=DAY)
+        for i in range(10):
+            store.append('full', {'padding': 'x' * 50}, timestamp=1000 + i)
+        
+        self.assertGreater(len(store.segments()), 1)
+        self.assertEqual(len(list(store.query())), 10)
+    
+    def test_retention_drops_old_sealed_segments(self):
+        """Test that segments entirely older than the retention period are deleted"""
+        for day in range(0, 60, 2):
+            self.store.append('full', {'day': day}, timestamp=day * DAY)
+        
+        days = [r['data']['day'] for r in self.store.query()]
+        self.assertGreaterEqual(min(days), 58 - 30 - 2)
+        self.assertEqual(days[-1], 58)
+    
+    def test_query_reads_only_needed_segments(self):
+        """Test that segments outside --since/--until are not opened"""
+        for day in range(10):
+            self.store.append('full', {'day': day}, timestamp=day * DAY + 1)
+        
+        self.assertEqual(len(self.store.segments_for(since=8 * DAY + 1)), 2)
+        opened = []
+        original = report_store._open_segment
+        with mock.patch.object(report_store, '_open_segment', side_effect=lambda p: opened.append(p) or original(p)):
+            days = [r['data']['day'] for r in self.store.query(since=7 * DAY + 1, until=8 * DAY)]
+        self.assertEqual(days, [7])
+        self.assertEqual(len(opened), 1)
+    
+    def test_parse_since(self):
+        """Test relative durations and ISO times"""
+        self.assertEqual(parse_since('30m', now=10_000), 10_000 - 1800)
+        self.assertEqual(parse_since('2d', now=DAY * 3), DAY)
+        self.assertIsInstance(parse_since('2024-11-03T16:00'), float)
+        with self.assertRaises(ValueError):
+            parse_since('yesterday')
+
+
+if __name__ == '__main__':
+    unittest.main()
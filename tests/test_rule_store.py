@@ -0,0 +1,34 @@
+"""
+Tests for the compact rule store backing RulesEngine
+"""
+import yaml
+
+from backend.services.rule_store import CodeTable, RuleFamily
+from backend.services.rules_engine import RULES_PATH, RulesEngine
+
+
+def test_family_round_trips_yaml_document():
+    engine = RulesEngine()
+    doc = yaml.safe_load((RULES_PATH / "cardiology.yml").read_text(encoding="utf-8"))
+    assert engine.get_family("cardiology") == doc
+
+
+def test_code_table_shares_repeated_values():
+    table = CodeTable()
+    doc = {"family": "x", "rules": [
+        {"id": "A", "label": "a", "presentations": ["fever"], "icd10": ["R50.9"]},
+        {"id": "B", "label": "b", "presentations": ["fever"], "icd10": ["R50.9"]},
+    ]}
+    fam = RuleFamily("x", doc, table)
+    a, b = fam.rules
+    assert a.icd10 is b.icd10
+    assert a.keys is b.keys
+    assert a.get("snomed") is None
+
+
+def test_search_and_get_rule():
+    engine = RulesEngine()
+    results = engine.search("chest", family="cardiology")
+    assert results and all(r["family"] == "cardiology" for r in results)
+    assert engine.get_rule(results[0]["id"])["label"] == results[0]["label"]
+    assert "error" in engine.get_rule("NO-SUCH-RULE")
@@ -0,0 +1,68 @@
+"""
+Unit tests for concurrent check execution
+"""
+
+import threading
+import time
+import unittest
+from diagnostics.runner import run_checks
+
+
+class TestRunChecks(unittest.TestCase):
+    """Test cases for run_checks"""
+    
+    def test_checks_run_concurrently(self):
+        """Wall time approaches the slowest check, not the sum"""
+        checks = {name: (lambda: time.sleep(0.2) or {'status': 'OK'}) for name in ('a', 'b', 'c', 'd')}
+        start = time.perf_counter()
+        results, durations = run_checks(checks, timeouts={}, default_timeout=5)
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertEqual(list(results), ['a', 'b', 'c', 'd'])
+        for name in checks:
+            self.assertGreaterEqual(durations[name], 0.2)
+    
+    def test_timeout_and_error_are_isolated(self):
+        """A slow or failing check does not hold up or break the others"""
+        def boom():
+            raise RuntimeError("sensor unavailable")
+        
+        checks = {
+            'slow': lambda: time.sleep(2),
+            'broken': boom,
+            'fast': lambda: {'value': 1},
+        }
+        start = time.perf_counter()
+        results, durations = run_checks(checks, timeouts={'slow': 0.1}, default_timeout=5)
+        self.assertLess(time.perf_counter() - start, 1.0)
+        self.assertEqual(results['slow']['status'], 'TIMEOUT')
+        self.assertEqual(results['broken'], {'status': 'ERROR', 'error': 'sensor unavailable'})
+        self.assertEqual(results['fast'], {'value': 1})
+        self.assertIn('slow', durations)
+    
+    def test_timed_out_check_is_not_restarted_while_running(self):
+        """A check stuck from an earlier run is reported, not run twice"""
+        release = threading.Event()
+        calls = []
+        
+        def stuck():
+            calls.append(1)
+            release.wait(5)
+            return {'status': 'OK'}
+        
+        in_flight = {}
+        first, _ = run_checks({'stuck': stuck, 'fast': dict}, timeouts={'stuck': 0.05}, in_flight=in_flight)
+        second, _ = run_checks({'stuck': stuck, 'fast': dict}, timeouts={'stuck': 0.05}, in_flight=in_flight)
+        self.assertEqual(first['stuck']['status'], 'TIMEOUT')
+        self.assertEqual(second['stuck']['status'], 'TIMEOUT')
+        self.assertEqual(list(second), ['stuck', 'fast'])
+        self.assertEqual(len(calls), 1)
+        
+        release.set()
+        in_flight['stuck'].result(timeout=5)
+        third, _ = run_checks({'stuck': stuck}, timeouts={'stuck': 1}, in_flight=in_flight)
+        self.assertEqual(third['stuck'], {'status': 'OK'})
+        self.assertEqual(len(calls), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
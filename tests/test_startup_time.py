@@ -0,0 +1,56 @@
+"""
+Startup-time budgets for the API and the CLI
+
+Each check runs in a fresh interpreter. Budgets are deliberately generous so
+they only trip on real regressions (an eager heavy import, building the
+knowledge base at import time) and can be tightened or relaxed per machine
+with REALDIAG_API_IMPORT_BUDGET / REALDIAG_CLI_STARTUP_BUDGET (seconds).
+"""
+import os
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+API_IMPORT_BUDGET = float(os.getenv("REALDIAG_API_IMPORT_BUDGET", "1.5"))
+CLI_STARTUP_BUDGET = float(os.getenv("REALDIAG_CLI_STARTUP_BUDGET", "0.75"))
+
+
+def importtime(*args):
+    """Run python -X importtime and return {module: cumulative seconds}."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", *args], cwd=ROOT,
+                          capture_output=True, text=True, check=True)
+    modules = {}
+    for line in proc.stderr.splitlines():
+        match = re.match(r"import time:\s+\d+ \|\s+(\d+) \|\s*(\S+)", line)
+        if match:
+            modules[match.group(2)] = int(match.group(1)) / 1e6
+    return modules
+
+
+def test_api_import_is_lazy_and_within_budget():
+    modules = importtime("-c", "import backend.main")
+    assert modules["backend.main"] < API_IMPORT_BUDGET
+    # Loaded on first use, not at import.
+    assert "jinja2" not in modules
+    assert "psutil" not in modules
+
+
+def test_api_import_does_not_build_knowledge_base():
+    code = ("import backend.main, backend.services.knowledge_base as kb;"
+            "print(kb._kb is None)")
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "True"
+
+
+def test_cli_version_skips_collectors_and_within_budget():
+    modules = importtime("main.py", "--version")
+    assert "psutil" not in modules
+    assert "diagnostics" not in modules
+
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "main.py", "--version"], cwd=ROOT, capture_output=True, check=True)
+    assert time.perf_counter() - start < CLI_STARTUP_BUDGET
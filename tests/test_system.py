@@ -2,7 +2,12 @@
 Unit tests for system diagnostics module
 """
 
+import time
 import unittest
+from types import SimpleNamespace
+from unittest import mock
+from diagnostics.cpu_sampler import CpuSampler
+from diagnostics.disk_io import DiskIOCollector
 from diagnostics.system import SystemDiagnostics
 
 
@@ -96,5 +101,101 @@ class TestSystemDiagnostics(unittest.TestCase):
         self.assertIsNotNone(results['disk'])
 
 
+class TestCpuSampler(unittest.TestCase):
+    """Test cases for the background CPU sampler"""
+    
+    def test_ring_buffer_is_bounded(self):
+        """Samples beyond the history size are discarded"""
+        sampler = CpuSampler(interval=60, history=3)
+        for _ in range(6):
+            sampler.sample()
+        self.assertEqual(len(sampler.samples), 3)
+        
+        timestamp, total, per_cpu = sampler.latest()
+        self.assertGreaterEqual(total, 0)
+        self.assertLessEqual(total, 100)
+        self.assertTrue(per_cpu)
+        self.assertIsNotNone(sampler.average(60))
+    
+    def test_check_cpu_does_not_block(self):
+        """check_cpu reads the latest sample instead of sampling for a second"""
+        sampler = CpuSampler(interval=60).start(warmup=0.05)
+        try:
+            diag = SystemDiagnostics(cpu_sampler=sampler)
+            start = time.perf_counter()
+            cpu = diag.check_cpu()
+            self.assertLess(time.perf_counter() - start, 0.2)
+        finally:
+            sampler.stop()
+        
+        self.assertEqual(len(cpu['per_cpu_percent']), cpu['cpu_count'])
+        self.assertIn('60s', cpu['averages'])
+    
+    def test_check_cpu_primes_an_empty_sampler(self):
+        """check_cpu takes a first sample instead of failing on an unstarted sampler"""
+        sampler = CpuSampler(interval=60)
+        self.assertIsNone(sampler.latest())
+        
+        cpu = SystemDiagnostics(cpu_sampler=sampler).check_cpu()
+        self.assertGreaterEqual(cpu['cpu_percent'], 0)
+        self.assertEqual(len(sampler.samples), 1)
+
+
+def _io(**values):
+    fields = ('read_count', 'write_count', 'read_bytes', 'write_bytes', 'read_time', 'write_time', 'busy_time')
+    return SimpleNamespace(**{field: values.get(field, 0) for field in fields})
+
+
+class TestDiskIO(unittest.TestCase):
+    """Test cases for per-device disk I/O and per-mount usage"""
+    
+    def _rates(self, samples):
+        """Feed (timestamp, {device: counters}) samples through a collector"""
+        collector = DiskIOCollector(window=10, history=10)
+        for timestamp, counters in samples:
+            with mock.patch('psutil.disk_io_counters', return_value=counters):
+                collector.sample(now=timestamp)
+        return collector.rates()
+    
+    def test_iops_throughput_await_and_busy(self):
+        """Test rates derived from counter deltas"""
+        rates = self._rates([
+            (0, {'sda': _io(), 'loop0': _io()}),
+            (2, {'sda': _io(read_count=200, write_count=100, read_bytes=4_096_000,
+                            read_time=300, write_time=300, busy_time=500), 'loop0': _io()}),
+        ])
+        
+        self.assertNotIn('loop0', rates)
+        sda = rates['sda']
+        self.assertEqual(sda['read_iops'], 100.0)
+        self.assertEqual(sda['write_iops'], 50.0)
+        self.assertEqual(sda['read_bytes_per_s'], 2_048_000.0)
+        self.assertEqual(sda['await_ms'], 2.0)
+        self.assertEqual(sda['busy_percent'], 25.0)
+        self.assertEqual(sda['status'], 'OK')
+        self.assertIn('threshold', sda)
+    
+    def test_saturated_device_warns(self):
+        """Test that a device busy most of the window is flagged"""
+        rates = self._rates([
+            (0, {'sda': _io()}),
+            (1, {'sda': _io(read_count=10, read_time=1500, busy_time=990)}),
+        ])
+        
+        self.assertEqual(rates['sda']['busy_percent'], 99.0)
+        self.assertEqual(rates['sda']['await_ms'], 150.0)
+        self.assertEqual(rates['sda']['status'], 'WARNING')
+    
+    def test_check_mounts_covers_every_partition(self):
+        """Test that every mounted filesystem is reported with status and threshold"""
+        diag = SystemDiagnostics()
+        mounts = diag.check_mounts()
+        
+        self.assertIn('/', [m['mountpoint'] for m in mounts])
+        for mount in mounts:
+            self.assertIn(mount['status'], ('OK', 'WARNING', 'ERROR'))
+            self.assertEqual(mount['threshold'], diag.config.DISK_WARNING_THRESHOLD)
+
+
 if __name__ == '__main__':
     unittest.main()
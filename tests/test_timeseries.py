@@ -0,0 +1,91 @@
+"""
+Unit tests for ring-buffered time series and watch mode
+"""
+
+import unittest
+from diagnostics.timeseries import RateTracker, RingBuffer, TimeSeries
+from diagnostics.watch import DiagnosticsWatcher
+
+
+class TestRingBuffer(unittest.TestCase):
+    """Test cases for RingBuffer"""
+    
+    def test_wraps_and_keeps_order(self):
+        """Oldest values are overwritten once the buffer is full"""
+        buffer = RingBuffer(3)
+        for value in range(1, 6):
+            buffer.append(value)
+        self.assertEqual(buffer.values(), [3.0, 4.0, 5.0])
+        self.assertEqual(buffer.latest(), 5.0)
+        self.assertEqual(len(buffer), 3)
+    
+    def test_running_mean_matches_window(self):
+        """The incremental mean equals the mean of the values held"""
+        buffer = RingBuffer(7)
+        for value in range(1000):
+            buffer.append(value * 0.1)
+            values = buffer.values()
+            self.assertAlmostEqual(buffer.mean(), sum(values) / len(values), places=6)
+    
+    def test_storage_is_fixed(self):
+        """Appending never grows the underlying array"""
+        buffer = RingBuffer(10)
+        size = buffer._data.buffer_info()[1]
+        for value in range(10000):
+            buffer.append(value)
+        self.assertEqual(buffer._data.buffer_info()[1], size)
+
+
+class TestRateTracker(unittest.TestCase):
+    """Test cases for RateTracker"""
+    
+    def test_rate_between_updates(self):
+        """Rates are counter deltas per second; resets do not go negative"""
+        rate = RateTracker()
+        self.assertIsNone(rate.update(100, now=10.0))
+        self.assertEqual(rate.update(600, now=15.0), 100.0)
+        self.assertEqual(rate.update(50, now=16.0), 0.0)
+
+
+class TestTimeSeries(unittest.TestCase):
+    """Test cases for TimeSeries"""
+    
+    def test_skips_missing_values_and_creates_series_lazily(self):
+        """None and NaN are not recorded; a series appears with its first value"""
+        series = TimeSeries(3)
+        series.record({'cpu': 10.0, 'load': None, 'rate': float('nan')}, timestamp=1.0)
+        self.assertEqual(list(series.series), ['cpu'])
+        
+        series.record({'cpu': 20.0, 'rate': 5.0}, timestamp=2.0)
+        self.assertEqual(sorted(series.series), ['cpu', 'rate'])
+        self.assertEqual(series.series['rate'].values(), [5.0])
+        self.assertEqual(series.timestamps.values(), [1.0, 2.0])
+    
+    def test_summary_over_window(self):
+        """Summary reports current, mean, min and max of the buffered values"""
+        series = TimeSeries(3)
+        for value in (100, 1, 2, 3):
+            series.record({'cpu': value})
+        self.assertEqual(series.summary(), {'cpu': {'current': 3.0, 'mean': 2.0, 'min': 1.0, 'max': 3.0}})
+        self.assertEqual(len(series.timestamps), 3)
+
+
+class TestDiagnosticsWatcher(unittest.TestCase):
+    """Test cases for watch mode sampling"""
+    
+    def test_samples_all_collectors(self):
+        """Each sample feeds every metric series; rates start on the second sample"""
+        watcher = DiagnosticsWatcher(interval=0.01, history=5)
+        try:
+            watcher.run(iterations=3)
+        finally:
+            watcher.cpu_sampler.stop()
+        summary = watcher.series.summary()
+        for name in ('cpu_percent', 'memory_percent', 'disk_percent', 'process_count', 'net_recv_bps'):
+            self.assertIn(name, summary)
+        self.assertEqual(len(watcher.series.series['memory_percent']), 3)
+        self.assertEqual(len(watcher.series.series['net_recv_bps']), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()